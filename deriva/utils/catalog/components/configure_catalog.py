@@ -28,8 +28,8 @@ class DerivaCatalogConfigure(DerivaCatalog):
     The only method of interest in this class is configure_baseline_catalog.
 
     """
-    def __init__(self, host, scheme='https', catalog_id=1, validate=True):
-        super().__init__(host, scheme=scheme, catalog_id=catalog_id, validate=validate)
+    def __init__(self, host, scheme='https', catalog_id=1, model_cache=None):
+        super().__init__(host, scheme=scheme, catalog_id=catalog_id, model_cache=model_cache)
 
     def _make_schema_instance(self, schema_name):
         return DerivaSchemaConfigure(self, schema_name)
@@ -469,6 +469,7 @@ class DerivaTableConfigure(DerivaTable):
         if chaise_tags.display not in self.schema.annotations:
             self.schema.annotations[chaise_tags.display] = {}
         if 'name_style' not in self.schema.annotations[chaise_tags.display]:
+            self.schema.annotations.touch()
             self.schema.annotations[chaise_tags.display].update({'name_style': {'underline_space': True}})
 
         # Set up foreign key to ermrest_client on RCB, RMB and Owner. If ermrest_client is configured, the
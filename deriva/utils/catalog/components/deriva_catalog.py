@@ -60,6 +60,8 @@ class DerivaConfigureCatalogCLI(BaseCLI):
         parser.add_argument('--visible-columns', action='store_true',
                             help='Create a default visible columns annotation')
         parser.add_argument('--replace', action='store_true', help='Overwrite existing value')
+        parser.add_argument('--model-cache', default=None, metavar='DIR',
+                            help='Directory in which to cache the catalog model between runs')
 
     @staticmethod
     def _get_credential(host_name, token=None):
@@ -74,7 +76,7 @@ class DerivaConfigureCatalogCLI(BaseCLI):
 
         try:
             logging.info('Configuring catalog {}:{}'.format(args.host, args.catalog))
-            catalog = DerivaCatalogConfigure(args.host, catalog_id=args.catalog)
+            catalog = DerivaCatalogConfigure(args.host, catalog_id=args.catalog, model_cache=args.model_cache)
             if args.configure == 'catalog':
                 catalog.configure_baseline_catalog(
                     catalog_name=args.catalog_name,
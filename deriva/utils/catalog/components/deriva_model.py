@@ -1,9 +1,12 @@
 import logging
 import logging.config
 import pprint
+import threading
 import time
 from collections import namedtuple, OrderedDict
-from collections.abc import MutableMapping
+from collections.abc import Mapping, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import copy
 from enum import Enum
 from urllib.parse import urlparse
@@ -15,6 +18,7 @@ import tabulate
 from deriva.core import ErmrestCatalog, get_credential
 from deriva.core import tag as chaise_tags
 from deriva.core.ermrest_model import KeyedList
+from deriva.utils.catalog.manage.utils import catalog_snaptime, get_catalog_model
 
 chaise_tags['catalog_config'] = 'tag:isrd.isi.edu,2019:catalog-config'
 
@@ -41,6 +45,73 @@ def timeit(method):
     return timed
 
 
+# A problem found by validation.  Path is a tuple of the schema, table and column or constraint names of the object.
+DerivaValidationError = namedtuple('DerivaValidationError', ['path', 'tag', 'error'])
+
+_validation_state = threading.local()
+
+
+@contextmanager
+def validation_errors():
+    """
+    Collect the errors reported by validate methods called in this thread within the context.
+
+    ```
+    with validation_errors() as errors:
+        table.validate()
+    ```
+    :return: List of DerivaValidationError
+    """
+    errors, previous = [], getattr(_validation_state, 'errors', None)
+    _validation_state.errors = errors
+    try:
+        yield errors
+    finally:
+        _validation_state.errors = previous
+
+
+def _validation_path(obj):
+    element = DerivaModel(obj.catalog).model_element(obj)
+    if isinstance(element, em.Model):
+        return ()
+    elif isinstance(element, em.Schema):
+        return element.name,
+    elif isinstance(element, em.Table):
+        return element.schema.name, element.name
+    elif isinstance(element, em.Column):
+        return element.table.schema.name, element.table.name, element.name
+    else:
+        return element.table.schema.name, element.table.name, element.name[1]
+
+
+def _model_element_exists(element):
+    """
+    Check to see if an ermrest model element is still part of its model, i.e. it has not been dropped.
+    """
+    if isinstance(element, em.Model):
+        return True
+    elif isinstance(element, em.Schema):
+        return element.model.schemas.get(element.name) is element
+    elif isinstance(element, em.Table):
+        return element.schema.tables.get(element.name) is element and _model_element_exists(element.schema)
+    elif isinstance(element, em.Column):
+        return any(c is element for c in element.table.column_definitions) and _model_element_exists(element.table)
+    elif isinstance(element, em.Key):
+        return any(k is element for k in element.table.keys) and _model_element_exists(element.table)
+    else:
+        return any(fk is element for fk in element.table.foreign_keys) and _model_element_exists(element.table)
+
+
+def _report_invalid(obj, tag, msg, *args):
+    """
+    Log a validation error and add it to the errors being collected in this thread.
+    """
+    logger.info(msg, *args)
+    errors = getattr(_validation_state, 'errors', None)
+    if errors is not None:
+        errors.append(DerivaValidationError(_validation_path(obj), tag, msg % args))
+
+
 class DerivaMethodFilter:
     def __init__(self, include=True, exclude=[]):
         self.include = include
@@ -219,16 +290,18 @@ class DerivaModel(DerivaLogging):
         self.catalog = catalog
 
     def __enter__(self):
-        if self.catalog.nesting == 0:
-            self.logger.debug('entering model changes %s', self.catalog_model())
-        self.catalog.nesting += 1
+        with self.catalog.lock:
+            if self.catalog.nesting == 0:
+                self.logger.debug('entering model changes %s', self.catalog_model())
+            self.catalog.nesting += 1
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.catalog.nesting -= 1
-        if self.catalog.nesting == 0:
-            self.logger.debug('applying changes to model %s', self.catalog_model())
-            self.catalog._apply()
+        with self.catalog.lock:
+            self.catalog.nesting -= 1
+            if self.catalog.nesting == 0:
+                self.logger.debug('applying changes to model %s', self.catalog_model())
+                self.catalog._apply()
 
 
     def model_element(self, obj):
@@ -268,7 +341,8 @@ class DerivaACL(MutableMapping):
 
     def __init__(self, obj):
         self._catalog = obj.catalog
-        self._acls = obj.get_acls()
+        self._element = DerivaModel(obj.catalog).model_element(obj)
+        self._acls = self._element.acls
         self._obj_type = obj.object_type()
 
     def __setitem__(self, key, value):
@@ -277,10 +351,12 @@ class DerivaACL(MutableMapping):
             raise DerivaCatalogError(self, msg='Invalid ACL: {}'.format(key))
 
         with DerivaModel(self._catalog) as m:
+            self._catalog._track_changes(self._element, 'acls')
             self._acls[key] = value
 
     def __delitem__(self, key):
         with DerivaModel(self._catalog):
+            self._catalog._track_changes(self._element, 'acls')
             self._acls.pop(key)
 
     def __getitem__(self, key):
@@ -307,7 +383,7 @@ class DerivaACL(MutableMapping):
         if keys <= DerivaACL.acl_matrix[self._obj_type]:
             return True
         else:
-            logger.info('Invalid ACL: %s %s', obj.name, self)
+            _report_invalid(obj, None, 'Invalid ACL: %s %s', obj.name, self)
             return False
 
 
@@ -320,14 +396,17 @@ class DerivaACLBinding(MutableMapping):
 
     def __init__(self, obj):
         self._catalog = obj.catalog
-        self._acl_bindings = obj.get_acl_bindings()
+        self._element = DerivaModel(obj.catalog).model_element(obj)
+        self._acl_bindings = self._element.acl_bindings
 
     def __setitem__(self, key, value):
         with DerivaModel(self._catalog) as m:
+            self._catalog._track_changes(self._element, 'acl_bindings')
             self._acl_bindings[key] = value
 
     def __delitem__(self, key):
         with DerivaModel(self._catalog):
+            self._catalog._track_changes(self._element, 'acl_bindings')
             self._acl_bindings.pop(key)
 
     def __getitem__(self, key):
@@ -353,7 +432,7 @@ class DerivaACLBinding(MutableMapping):
         if isinstance(self._acl_bindings, dict):
             return True
         else:
-            logger.info('Invalid acl_binding %s %s', obj.name, self)
+            _report_invalid(obj, None, 'Invalid acl_binding %s %s', obj.name, self)
             return False
 
 
@@ -366,23 +445,32 @@ class DerivaAnnotations(MutableMapping):
 
     def __init__(self, obj):
         self.catalog = obj.catalog
-        m = DerivaModel(self.catalog)
-        self.annotations = m.model_element(obj).annotations
+        self._element = DerivaModel(self.catalog).model_element(obj)
+        self.annotations = self._element.annotations
 
     def __setitem__(self, key, value):
         if key not in DerivaAnnotations.annotation_tags:
             raise DerivaCatalogError(self, msg='Unknow annotation tag: {}'.format(key))
 
         with DerivaModel(self.catalog):
+            self.catalog._track_changes(self._element, 'annotations')
             self.annotations[key] = value
 
     def __delitem__(self, key):
         with DerivaModel(self.catalog):
+            self.catalog._track_changes(self._element, 'annotations')
             self.annotations.pop(key)
 
     def __getitem__(self, key):
         return self.annotations[key]
 
+    def touch(self):
+        """
+        Note that an annotation value is about to be changed in place, e.g. annotations[tag].update(...), so that the
+        change is sent to the server when the model is applied.
+        """
+        self.catalog._track_changes(self._element, 'annotations')
+
     def __iter__(self):
         return iter(self.annotations)
 
@@ -399,7 +487,7 @@ class DerivaAnnotations(MutableMapping):
         rval = True
         for t, a in self.annotations.items():
             if t not in chaise_tags.values():
-                logger.info('Invalid annotation tag %s', t)
+                _report_invalid(obj, t, 'Invalid annotation tag %s', t)
                 rval = False
             if t == chaise_tags.display:
                 rval = obj.validate_display() and rval
@@ -407,20 +495,20 @@ class DerivaAnnotations(MutableMapping):
                 if isinstance(obj, DerivaTable):
                     rval = obj.visible_columns.validate() and rval
                 else:
-                    logger.info('visible_columns annotation on non-table element %s', obj.name)
+                    _report_invalid(obj, t, 'visible_columns annotation on non-table element %s', obj.name)
                     rval = False
             if t == chaise_tags.visible_foreign_keys:
                 if isinstance(obj, DerivaTable):
                     rval = obj.visible_foreign_keys.validate() and rval
                 else:
-                    logger.info('visible_foreign_keys annotation on non-table element %s', obj.name)
+                    _report_invalid(obj, t, 'visible_foreign_keys annotation on non-table element %s', obj.name)
             if t == chaise_tags.foreign_key:
                 pass
             if t == chaise_tags.table_display:
                 if isinstance(obj, DerivaTable):
                     rval = obj.validate_table_display() and rval
                 else:
-                    logger.info('table_display annotation on non-table element %s', obj.name)
+                    _report_invalid(obj, t, 'table_display annotation on non-table element %s', obj.name)
                     rval = False
             if t == chaise_tags.column_display:
                 pass
@@ -450,7 +538,8 @@ class DerivaCore(DerivaLogging):
 
     @annotations.setter
     def annotations(self, value):
-        with DerivaModel(self.catalog):
+        with DerivaModel(self.catalog) as m:
+            self.catalog._track_changes(m.model_element(self), 'annotations')
             m.model_element(self).annotations.clear()
             m.model_element(self).annotations.update(value)
 
@@ -465,6 +554,7 @@ class DerivaCore(DerivaLogging):
     @acls.setter
     def acls(self, value):
         with DerivaModel(self.catalog) as m:
+            self.catalog._track_changes(m.model_element(self), 'acls')
             m.model_element(self).acls.clear()
             m.model_element(self).acls.update(value)
 
@@ -483,6 +573,7 @@ class DerivaCore(DerivaLogging):
         if self.object_type() not in DerivaACLBinding.acl_binding_matrix:
             raise DerivaCatalogError(self, msg='ACL Bindings not defined for {}'.format(type(self).__name__))
         with DerivaModel(self.catalog) as m:
+            self.catalog._track_changes(m.model_element(self), 'acl_bindings')
             m.model_element(self).acl_bindings.clear()
             m.model_element(self).acl_bindings.update(value)
 
@@ -491,16 +582,14 @@ class DerivaCore(DerivaLogging):
         Get dictionary form of ACL
         :return:
         """
-        with DerivaModel(self.catalog) as m:
-            return m.model_element(self).acls
+        return DerivaModel(self.catalog).model_element(self).acls
 
     def get_acl_bindings(self):
         """
         Get dictionary from of acl_bindings
         :return:
         """
-        with DerivaModel(self.catalog) as m:
-            return m.model_element(self).acl_bindings
+        return DerivaModel(self.catalog).model_element(self).acl_bindings
 
     def object_type(self):
 
@@ -522,22 +611,88 @@ class DerivaCore(DerivaLogging):
         return obj_type
 
 
+class DerivaModelMap(dict):
+    """
+    Map from ermrest_model elements to the Deriva objects that wrap them.  A wrapper is created the first time its
+    element is looked up, so only the parts of the model that are actually used get mapped.
+    """
+    def __init__(self, catalog):
+        super().__init__()
+        self.catalog = catalog
+
+    def __missing__(self, element):
+        # Wrappers can be looked up from several threads, so make sure that only one is ever created for an element.
+        with self.catalog.lock:
+            if element in self:
+                return dict.__getitem__(self, element)
+            return self._map(element)
+
+    def _map(self, element):
+        if isinstance(element, em.Schema):
+            wrapper = DerivaSchema(self.catalog, element)
+        elif isinstance(element, em.Table):
+            wrapper = DerivaTable(self.catalog, element)
+        elif isinstance(element, em.Column):
+            wrapper = DerivaColumn(self.catalog, element)
+        elif isinstance(element, em.Key):
+            wrapper = DerivaKey(self.catalog, element)
+        elif isinstance(element, em.ForeignKey):
+            wrapper = DerivaForeignKey(self.catalog, element)
+        else:
+            raise KeyError(element)
+        self[element] = wrapper
+        return wrapper
+
+
+class DerivaModelView(Mapping):
+    """
+    Read only view of a collection of ermrest_model elements, such as the tables in a schema, that returns the Deriva
+    object for an element when it is accessed.
+    """
+    def __init__(self, model_map, elements):
+        self.model_map = model_map
+        self.elements = elements
+
+    def __getitem__(self, name):
+        return self.model_map[self.elements[name]]
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __contains__(self, name):
+        return name in self.elements
+
+
 class DerivaCatalog(DerivaCore):
     """
     A Dervia catalog.  Operations on the catalog will alter both the ERMrest service as well as the annotations used
     by Chaise.
     """
 
-    def __init__(self, host, scheme='https', catalog_id=1, ermrest_catalog=None):
+    def __init__(self, host, scheme='https', catalog_id=1, ermrest_catalog=None, model_cache=None,
+                 max_apply_workers=8):
         """
         Initialize a DerivaCatalog.
 
         :param host: Name of the server hosting the deriva catalog service
         :param scheme: Scheme to be used for connecting to the host, defaults to https
         :param catalog_id: The identifer for the catalog in the server.  Is an integer
+        :param model_cache: Directory used to cache the catalog model between runs.  Defaults to no caching.
+        :param max_apply_workers: Maximum number of model updates sent to the server at the same time.  The updates
+                                  share the catalog's session, so this should not be larger than its connection pool.
         """
 
         self.nesting = 0
+        # Guards nesting and the tracked changes, which are shared by all threads using the catalog.
+        self.lock = threading.RLock()
+        self.model_cache = model_cache
+        self.max_apply_workers = max_apply_workers
+        self.model_generation = 0  # Incremented whenever columns, keys or foreign keys are added or removed.
+        self.source_spec_cache = {}
+        self._changes = {}  # Values of model element attributes as of when they were first accessed.
 
         super().__init__(self)
 
@@ -546,9 +701,11 @@ class DerivaCatalog(DerivaCore):
             ErmrestCatalog(scheme, host, catalog_id, credentials=get_credential(host))
         )
 
-        self.model_instance = self.ermrest_catalog.getCatalogModel()
-        self.model_map = {}
-        self._map_model()
+        # Get the snapshot before the model so that a concurrent change will cause the next refresh to fetch it.  The
+        # snapshot keys the model cache and lets an incremental refresh skip fetching an unchanged model.
+        self._snaptime = catalog_snaptime(self.ermrest_catalog)
+        self.model_instance = get_catalog_model(self.ermrest_catalog, self.model_cache, self._snaptime)
+        self.model_map = DerivaModelMap(self)
 
     def __str__(self):
         return '\n'.join([i for i in self.schemas])
@@ -605,7 +762,7 @@ class DerivaCatalog(DerivaCore):
 
         :return:
         """
-        return {k: self.model_map[v] for k, v in self.model_instance.schemas.items()}
+        return DerivaModelView(self.model_map, self.model_instance.schemas)
 
     @property
     def navbar_menu(self):
@@ -620,10 +777,12 @@ class DerivaCatalog(DerivaCore):
     def navbar_menu(self, value):
         if not isinstance(value, dict):
             raise ValueError('Menu must be a dictionary')
-        if chaise_tags.chaise_config not in self.annotations:
-            self.annotations[chaise_tags.chaise_config] = {'navbarMenu': value}
-        else:
-            self.annotations[chaise_tags.chaise_config]['navbarMenu'] = value
+        with DerivaModel(self):
+            if chaise_tags.chaise_config not in self.annotations:
+                self.annotations[chaise_tags.chaise_config] = {'navbarMenu': value}
+            else:
+                self.annotations.touch()
+                self.annotations[chaise_tags.chaise_config]['navbarMenu'] = value
 
     @property
     def bulk_upload(self):
@@ -644,35 +803,148 @@ class DerivaCatalog(DerivaCore):
     def name(self):
         return self.model_instance.annotations.get(chaise_tags.catalog_config, {'name':'unknown'})['name']
 
+    def _track_changes(self, element, attribute):
+        """
+        Remember the current value of an attribute of an ermrest model element so that _apply can tell if it has been
+        changed.
+
+        :param element: ermrest_model Model, Schema, Table, Column, Key or ForeignKey
+        :param attribute: One of 'annotations', 'acls', 'acl_bindings' or 'comment'
+        :return:
+        """
+        with self.lock:
+            attributes = self._changes.setdefault(element, {})
+            if attribute not in attributes:
+                attributes[attribute] = copy.deepcopy(getattr(element, attribute))
+
+    def _pending_changes(self):
+        """
+        Get the model elements that have been changed since the last apply, and clear the list of tracked elements.
+
+        :return: List of (element, {attribute: value}) for the elements with changed values.
+        """
+        with self.lock:
+            changes, self._changes = self._changes, {}
+            pending = []
+            for element, attributes in changes.items():
+                # Copy the values so that they can be sent while other threads go on using the model.
+                updates = {k: copy.deepcopy(getattr(element, k)) for k, v in attributes.items()
+                           if getattr(element, k) != v}
+                if updates and _model_element_exists(element):
+                    pending.append((element, updates))
+        return pending
+
+    def _apply_changes(self, element, updates):
+        """
+        Send the changed attributes of a single model element to the server.  The model element itself is not touched,
+        so this can be run in a worker thread.
+
+        :return: Dictionary of the updated attributes as returned by the server, or None for the catalog itself.
+        """
+        self.logger.debug('updating %s %s', element.uri_path, list(updates))
+        if isinstance(element, em.Model):
+            for k, v in updates.items():
+                self.ermrest_catalog.put({'annotations': '/annotation', 'acls': '/acl'}[k], json=v).raise_for_status()
+            return None
+        r = self.ermrest_catalog.put(element.uri_path, json=updates)
+        r.raise_for_status()
+        return r.json()
+
+    @staticmethod
+    def _update_element(element, changed):
+        """
+        Bring a model element up to date with the values returned by the server, as ermrest_model alter does.
+        """
+        for k, v in (changed or {}).items():
+            current = getattr(element, k, None)
+            if current == v:
+                continue
+            if isinstance(current, dict):
+                current.clear()
+                current.update(v)
+            elif k == 'comment':
+                element.comment = v
+
     def _apply(self):
         """
-        Push any pending annotation updates to the server. Should not be need to be called except when things get
-        messed up.
+        Push any pending annotation, ACL and comment updates to the server. Only the elements whose values were changed
+        are sent. Should not be need to be called except when things get messed up.
 
         :return:
         """
-        self.logger.debug('%s', self.model_instance)
-        self.model_instance.apply()
+        with self.lock:
+            pending = self._pending_changes()
+            if len(pending) <= 1 or self.max_apply_workers <= 1:
+                for element, updates in pending:
+                    self._update_element(element, self._apply_changes(element, updates))
+                return
+
+            # Updates to independent elements are sent concurrently, but a level of the model is finished before
+            # starting on the elements it contains.  The workers only talk to the server; the model elements are
+            # updated from this thread, which holds the catalog lock.
+            levels = [em.Model, em.Schema, em.Table, (em.Column, em.Key, em.ForeignKey)]
+            with ThreadPoolExecutor(max_workers=self.max_apply_workers) as executor:
+                for level in levels:
+                    changes = [(e, u) for e, u in pending if isinstance(e, level)]
+                    # Consume the results so that any exception is raised here.
+                    for (element, _), changed in zip(changes, executor.map(lambda c: self._apply_changes(*c),
+                                                                             changes)):
+                        self._update_element(element, changed)
+
+    def apply(self, full=False):
+        """
+        Send any pending model changes to the server.
+
+        :param full: If True, also apply the complete ermrest model, so that changes made directly to the ermrest_model
+                     objects, rather than through this API, are sent as well.
+        :return:
+        """
+        with self.lock:
+            assert (self.nesting == 0)
+            self._apply()
+            if full:
+                self.model_instance.apply()
 
     def describe(self):
         print(self)
 
-    def refresh(self):
+    def refresh(self, incremental=False):
         """
         Refresh the any cached model values from the server.
+
+        :param incremental: If True, compare the catalog snapshot with the one the model was fetched from and do
+                            nothing if it is unchanged.  Otherwise only re-map the tables whose definition changed,
+                            keeping the existing DerivaSchema and DerivaTable objects for everything else.
         :return:
         """
         assert (self.nesting == 0)
         logger.debug('Refreshing model')
+        if incremental:
+            snaptime = catalog_snaptime(self.ermrest_catalog)
+            if snaptime is not None and snaptime == self._snaptime:
+                logger.debug('Model unchanged since snapshot %s', snaptime)
+                return
+            old_model, old_map = self.model_instance, self.model_map
+            self._snaptime = snaptime
+            self.model_instance = get_catalog_model(self.ermrest_catalog, self.model_cache, snaptime)
+            self.model_map = DerivaModelMap(self)
+            self._changes = {}
+            self._model_changed()
+            changed = self._remap_model(old_model, old_map)
+            logger.debug('Re-mapped tables: %s', changed)
+            return
+
         server_url = urlparse(self.ermrest_catalog.get_server_uri())
         catalog_id = server_url.path.split('/')[-1]
         self.ermrest_catalog = ErmrestCatalog(server_url.scheme,
                                               server_url.hostname,
                                               catalog_id,
                                               credentials=get_credential(server_url.hostname))
-        self.model_instance = self.ermrest_catalog.getCatalogModel()
-        self.model_map = {}
-        self._map_model()
+        self._snaptime = catalog_snaptime(self.ermrest_catalog)
+        self.model_instance = get_catalog_model(self.ermrest_catalog, self.model_cache, self._snaptime)
+        self.model_map = DerivaModelMap(self)
+        self._changes = {}
+        self._model_changed()
 
     def getPathBuilder(self):
         return self.ermrest_catalog.getPathBuilder()
@@ -701,37 +973,81 @@ class DerivaCatalog(DerivaCore):
             )
         except ValueError:
             raise DerivaCatalogError(self, 'Schema %s already exists'.format(schema_name))
-        self.model_map[s] = DerivaSchema(self, s)
         return self.schema(schema_name)
 
+    def _model_changed(self):
+        """
+        Record that columns, keys or foreign keys have been created or dropped so that tables will recompute their
+        cached lists of them.
+
+        :return:
+        """
+        self.model_generation += 1
+        self.source_spec_cache.clear()
+
     def get_groups(self):
         if chaise_tags.catalog_config in self.annotations:
             return self.annotations[chaise_tags.catalog_config]['groups']
         else:
             raise DerivaCatalogError(self, msg='Attempting to configure table before catalog is configured')
 
-    def _map_model(self):
+    def _remap_model(self, old_model, old_map):
         """
-        :return:
+        Map a newly fetched model, reusing the wrappers from old_map for schemas and tables that still exist.  Elements
+        that were never accessed have no wrappers, and will be mapped when they are first used.
+
+        :param old_model: ermrest_model Model from before the refresh
+        :param old_map: model_map from before the refresh
+        :return: List of (schema_name, table_name) for tables that were re-mapped.
         """
-        for s in self.model_instance.schemas.values():
-            self.model_map[s] = DerivaSchema(self, s)
+        changed = []
+        for schema_name, s in self.model_instance.schemas.items():
+            old_schema = old_model.schemas.get(schema_name)
+            schema = old_map.get(old_schema) if old_schema is not None else None
+            if schema is not None:
+                changed.extend((schema_name, t) for t in schema._rebind(s, old_map))
+        return changed
 
-    def validate(self):
+    def validate(self, max_workers=None):
         """
         Validate all of the objects in the catalog.
 
-        :return:
+        :param max_workers: Number of threads used to validate tables.
+        :return: True if all values are valid.
         """
+        return not self.validation_report(max_workers=max_workers)
 
-        rval = self.annotations.validate(self)
-        rval = self.acls.validate(self) and rval
-        for s in self.schemas:
+    def validation_report(self, max_workers=None):
+        """
+        Validate all of the objects in the catalog, returning the problems that were found.  Tables are checked in
+        parallel, so the catalog must not be modified by other threads until this returns.
+
+        :param max_workers: Number of threads used to validate tables.
+        :return: List of DerivaValidationError
+        """
+
+        def validate_object(obj, validate):
+            with validation_errors() as errors:
+                if not validate() and not errors:
+                    errors.append(DerivaValidationError(_validation_path(obj), None, 'Invalid {}'.format(obj.name)))
+            return errors
+
+        report = validate_object(self, lambda: self.annotations.validate(self) and self.acls.validate(self))
+        tables = []
+        for s in self.schemas.values():
             logger.info('Validating %s', s.name)
-            # TODO Validate schema attributes.
-            rval = s.validate() and rval
+            report.extend(validate_object(s, s._validate_schema))
+            tables.extend(s.tables.values())
 
-        return rval
+        # Wrap all of the model elements up front so that the worker threads don't build the cached views.  Anything
+        # else they share, such as the model nesting count and tracked changes, is guarded by the catalog lock.
+        for t in tables:
+            t._model_views()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for errors in executor.map(lambda t: validate_object(t, t.validate), tables):
+                report.extend(errors)
+        return report
 
     def validate_display(self):
         # TODO impliment
@@ -750,7 +1066,6 @@ class DerivaSchema(DerivaCore):
         super().__init__(catalog)
         self.schema_name = schema.name
         self.schema = schema
-        self._map_model()
 
     def __str__(self):
         return '\n'.join([t for t in self.tables])
@@ -784,11 +1099,12 @@ class DerivaSchema(DerivaCore):
     @comment.setter
     def comment(self, value):
         with DerivaModel(self.catalog):
+            self.catalog._track_changes(self.schema, 'comment')
             self.schema.comment = value
 
     @property
     def tables(self):
-        return { k: self.catalog.model_map[v] for k, v in self.schema.tables.items()}
+        return DerivaModelView(self.catalog.model_map, self.schema.tables)
 
     @property
     def display(self):
@@ -798,17 +1114,32 @@ class DerivaSchema(DerivaCore):
     def display(self, value):
         self.annotations[chaise_tags.display] = value
 
-    def _map_model(self):
+    def _rebind(self, schema, old_map):
         """
-        :return: True if all values are valid.
+        Point this schema at a newly fetched ermrest schema, keeping the DerivaTable objects of existing tables.
+
+        :param schema: ermrest_model Schema from the refreshed model
+        :param old_map: model_map from before the refresh
+        :return: Names of the tables that were re-mapped.
         """
-        for t in self.schema.tables.values():
-            self.catalog.model_map[t] = DerivaTable(self.catalog, t)
+        old_tables = self.schema.tables
+        self.schema = schema
+        self.schema_name = schema.name
+        self.catalog.model_map[schema] = self
+
+        changed = []
+        for table_name, t in schema.tables.items():
+            old_table = old_tables.get(table_name)
+            table = old_map.get(old_table) if old_table is not None else None
+            if table is not None and not table._rebind(t, old_map):
+                changed.append(table_name)
+        return changed
 
     def _create_table(self, table_def):
         with DerivaModel(self.catalog):
             t = self.schema.create_table(table_def)
-        table = self.catalog.model_map[t] = DerivaTable(self.catalog, t)
+        self.catalog._model_changed()
+        table = self.catalog.model_map[t]
         table.deleted = False  # Table may have been previously been deleted.
         return table
 
@@ -817,7 +1148,8 @@ class DerivaSchema(DerivaCore):
 
     def drop(self):
         self.schema.drop()
-        del self.catalog.model_map[self.schema]
+        self.catalog.model_map.pop(self.schema, None)
+        self.catalog._model_changed()
 
     def table(self, table_name):
         """
@@ -990,12 +1322,16 @@ class DerivaSchema(DerivaCore):
         :return: True if all values are valid.
         """
 
+        rval = self._validate_schema()
+        for t in self.tables.values():
+            logger.info('Validating table %s', t.name)
+            rval = t.validate() and rval
+        return rval
+
+    def _validate_schema(self):
         rval = self.validate_display()
         rval = self.acls.validate(self) and rval
         rval = self.annotations.validate(self) and rval
-        for t in self.tables:
-            logger.info('Validating table %s', t.name)
-            rval = t.validate() and rval
         return rval
 
     def validate_display(self):
@@ -1172,10 +1508,13 @@ class DerivaVisibleSources(DerivaLogging):
 
     def __setitem__(self, instance, value):
         with DerivaModel(self.table.catalog):
+            self.table.annotations.touch()
             self.table.annotations[self.tag].update({instance: value})
 
     def __delitem__(self, item):
-        del self.table.annotations[self.tag][item]
+        with DerivaModel(self.table.catalog):
+            self.table.annotations.touch()
+            del self.table.annotations[self.tag][item]
 
     def __iter__(self):
         return self.table.annotations[self.tag].__iter__()
@@ -1192,24 +1531,24 @@ class DerivaVisibleSources(DerivaLogging):
                 DerivaContext(c)  # Make sure that we have a valid context value.
             except ValueError:
                 rval = False
-                logger.info('Invalid context name %s', c)
+                _report_invalid(self.table, self.tag, 'Invalid context name %s', c)
             if c == 'filter':
                 if self.tag == chaise_tags.visible_foreign_keys:
                     rval = False
-                    logger.info('Filter context not allowed in visible_foreign_key annotation.')
+                    _report_invalid(self.table, self.tag, 'Filter context not allowed in visible_foreign_key annotation.')
                     continue
                 else:
                     try:
                         l = l['and']
                     except TypeError:
-                        logger.info('Invalid filter specification %s', l)
+                        _report_invalid(self.table, self.tag, 'Invalid filter specification %s', l)
                         rval = False
                         continue
             for j in l:
                 try:
                     DerivaSourceSpec(self.table, j)
                 except DerivaCatalogError as e:
-                    logger.info('Invalid source specification %s %s', self.tag, e.msg)
+                    _report_invalid(self.table, self.tag, 'Invalid source specification %s %s', self.tag, e.msg)
                     rval = False
         return rval
 
@@ -1278,10 +1617,12 @@ class DerivaVisibleSources(DerivaLogging):
         # check for valid context.
 
         context = DerivaContext(context)
-        if self.tag not in self.table.annotations:
-            self.table.annotations[self.tag] = {context.value: sources}
-        elif context.value not in self.table.annotations[self.tag] or replace:
-            self.table.annotations[self.tag][context.value] = sources
+        with DerivaModel(self.table.catalog):
+            if self.tag not in self.table.annotations:
+                self.table.annotations[self.tag] = {context.value: sources}
+            elif context.value not in self.table.annotations[self.tag] or replace:
+                self.table.annotations.touch()
+                self.table.annotations[self.tag][context.value] = sources
         return
 
     def insert_sources(self, source_list, positions={}):
@@ -1389,6 +1730,7 @@ class DerivaVisibleSources(DerivaLogging):
 
         self.logger.debug('tag: %s columns: %s vc before %s', self.tag, column, self.table.annotations[self.tag])
 
+        self.table.annotations.touch()
         context_names = [i.value for i in (DerivaContext if contexts == [] else contexts)]
         for context, vc_list in self.table.annotations[self.tag].items():
             # Get list of column names that are in the spec, mapping back simple FK references.
@@ -1414,6 +1756,7 @@ class DerivaVisibleSources(DerivaLogging):
 
     def make_column(self, column, contexts=[], validate=True):
         self.logger.debug('tag: %s columns: %s vc before %s', self.tag, column, self.table.annotations[self.tag])
+        self.table.annotations.touch()
         context_names = [i.value for i in (DerivaContext if contexts == [] else contexts)]
         for context, vc_list in self.table.annotations[self.tag].items():
             if context == 'filter':
@@ -1507,6 +1850,7 @@ class DerivaVisibleSources(DerivaLogging):
 
         self.logger.debug('tag: %s columns: %s vc before %s', self.tag, columns,
                           self.table.annotations.get(self.tag, None))
+        self.table.annotations.touch()
         context_names = [i.value for i in (DerivaContext if contexts == [] else contexts)]
         self.logger.debug('context names %s', context_names)
         columns = [columns] if isinstance(columns, str) else columns
@@ -1529,7 +1873,9 @@ class DerivaVisibleSources(DerivaLogging):
 
     def reorder_visible_source(self, positions):
         vc = self._reorder_sources(self.table.annotations[self.tag], positions)
-        self.table.annotations[self.tag].update({**self.table.annotations[self.tag], **vc})
+        with DerivaModel(self.table.catalog):
+            self.table.annotations.touch()
+            self.table.annotations[self.tag].update({**self.table.annotations[self.tag], **vc})
 
 
 class DerivaVisibleColumns(DerivaVisibleSources):
@@ -1543,31 +1889,72 @@ class DerivaVisibleForeignKeys(DerivaVisibleSources):
         super().__init__(table, chaise_tags.visible_foreign_keys)
 
 
-class DerivaSourceSpec:
+class DerivaSourceSpec(DerivaLogging):
     def __init__(self, table, spec, validate=True, src_tag=chaise_tags.visible_columns):
         super().__init__()
         self.logger.debug('table: %s spec: %s', table.name, spec)
         self.table = table
-        self.tag = src_tag
+        self.tag = spec.tag if isinstance(spec, DerivaSourceSpec) else src_tag
+
+        # Normalizing and validating a spec is expensive, so remember the result until the model changes.
+        cache = table.catalog.source_spec_cache
+        key = self._cache_key(spec, validate)
+        result = cache.get(key) if key is not None else None
+        if result is None:
+            try:
+                result = self._initialize(spec, validate)
+            except DerivaSourceError as e:
+                result = e
+            if key is not None:
+                cache[key] = result
+
+        if isinstance(result, DerivaSourceError):
+            raise DerivaSourceError(self, result.msg)
+        self.spec, self.column_name = copy.deepcopy(result[0]), result[1]
+        self.logger.debug('initialized: table %s spec: %s', table.name, self.spec)
+
+    def _initialize(self, spec, validate):
+        """
+        Normalize and optionally validate a spec.
 
+        :return: Tuple with a copy of the normalized spec and the name of the column it references.
+        """
         if isinstance(spec, DerivaSourceSpec):
             self.spec = copy.deepcopy(spec.spec)
-            self.tag = spec.tag
         else:
-            self.spec = self._normalize_source_spec(spec, src_tag)
-
+            self.spec = self._normalize_source_spec(spec, self.tag)
 
         self.logger.debug('normalized: %s', self.spec)
         if validate:
             self.validate()
         try:
-            self.column_name = self._referenced_columns()
+            column_name = self._referenced_columns()
         except DerivaSourceError:
             if validate:
                 raise
             else:
-                self.column_name = 'pseudo_column'
-        self.logger.debug('initialized: table %s spec: %s', table.name, self.spec)
+                column_name = 'pseudo_column'
+        return copy.deepcopy(self.spec), column_name
+
+    def _cache_key(self, spec, validate):
+        """
+        Key used to look up a spec in the catalog source spec cache.
+
+        :return: Hashable key, or None if the spec cannot be cached.
+        """
+        def freeze(v):
+            if isinstance(v, dict):
+                return dict, tuple((k, freeze(i)) for k, i in v.items())
+            elif isinstance(v, (list, tuple)):
+                return type(v), tuple(freeze(i) for i in v)
+            hash(v)
+            return v
+
+        try:
+            return (self.table, self.table.catalog.model_generation, self.tag, validate,
+                    freeze(spec.spec if isinstance(spec, DerivaSourceSpec) else spec))
+        except TypeError:
+            return None
 
     def __str__(self):
         return pprint.pformat(self.spec)
@@ -1622,7 +2009,7 @@ class DerivaSourceSpec:
 
         source_entry = spec['source']
         if type(spec['source']) is str:
-            if spec['source'] not in [i.name for i in self.table.columns]:
+            if self.table._lookup('columns', spec['source']) is None:
                 raise DerivaSourceError(self, 'Invalid source entry {}'.format(spec))
         else:
             # We have a path of FKs so follow the path to make sure that all of the constraints line up.
@@ -1654,21 +2041,22 @@ class DerivaSourceSpec:
         """
         self.logger.debug('%s %s', self.table.name, spec)
         if type(spec) is str:
-            if spec in [c.name for c in self.table.columns]:
+            if self.table._lookup('columns', spec) is not None:
                 spec = {'source': spec}
-            elif spec in self.table.foreign_keys: # TODO this is not right
+            elif self.table._lookup('foreign_keys', spec) is not None:
                 spec = {'source': [{'outbound': (self.table.schema_name, spec)}, 'RID']}
-            elif spec in self.table.referenced_by:
+            elif self.table._lookup('referenced_by', spec) is not None:
                 spec = {'source': [{'inbound': (self.table.schema_name, spec)}, 'RID']}
             else:
                 raise DerivaSourceError(self, 'Invalid source entry {}'.format(spec))
         # Check for old style foreign key notation and turn into inbound or outbound source.
         elif isinstance(spec, (tuple, list)) and len(spec) == 2:
-            if spec[1] in self.table.keys:
-                return {'source': next(iter(self.table.keys[spec[1]].columns)).name}
-            elif spec[1] in self.table.foreign_keys:
+            key = self.table._lookup('keys', spec)
+            if key is not None:
+                return {'source': next(iter(key.columns)).name}
+            elif self.table._lookup('foreign_keys', spec) is not None:
                 return {'source': [{'outbound': tuple(spec)}, 'RID']}
-            elif spec[1] in self.table.referenced_by:
+            elif self.table._lookup('referenced_by', spec) is not None:
                 return {'source': [{'inbound': tuple(spec)}, 'RID']}
             else:
                 default_direction = 'inbound' if src_tag == chaise_tags.visible_foreign_keys else 'outbound'
@@ -1830,7 +2218,9 @@ class DerivaColumn(DerivaCore):
 
     @comment.setter
     def comment(self, comment):
-        self.column.comment = comment
+        with DerivaModel(self.catalog):
+            self.catalog._track_changes(self.column, 'comment')
+            self.column.comment = comment
 
     @property
     def display(self):
@@ -1959,9 +2349,10 @@ class DerivaKey(DerivaCore):
     def drop(self):
         try:
             with DerivaModel(self.table.catalog):
-                key.drop()
+                self.key.drop()
         except HTTPError as e:
             raise DerivaKeyError(self, msg=str(e))
+        self.catalog._model_changed()
         self.key = None
 
     def get_acls(self):
@@ -1987,7 +2378,7 @@ class DerivaForeignKey(DerivaCore):
         """
         super().__init__(catalog)
         self.fkey = fkey
-        self.catalog.model_map[fkey] = fkey
+        self.catalog.model_map[fkey] = self
 
     def __str__(self):
         return '\n'.join([
@@ -2088,13 +2479,16 @@ class DerivaForeignKey(DerivaCore):
         self.logger.debug('demoting visible column %s', column)
 
         referenced_table.visible_foreign_keys.delete_visible_source(self.name)
-        del (referenced_table.referenced_by[self.name])
 
         if column:
             self.table.visible_columns.make_column(column.name, validate=False)
 
-        with DerivaModel(self.table.catalog) as m:
-            self.fkey.drop()
+        try:
+            with DerivaModel(self.table.catalog) as m:
+                self.fkey.drop()
+        finally:
+            # The ermrest model removes the foreign key from both tables, so the cached lists need to be recomputed.
+            self.catalog._model_changed()
 
         self.fkey = None
 
@@ -2129,7 +2523,7 @@ class DerivaTable(DerivaCore):
         DerivaCore.__init__(self, catalog)
         self.table = table
         self.deleted = False
-        self._map_model()
+        self._views = None
 
     def __getitem__(self, column_name):
         return self.column(column_name)
@@ -2229,6 +2623,7 @@ class DerivaTable(DerivaCore):
     @comment.setter
     def comment(self, value):
         with DerivaModel(self.catalog):
+            self.catalog._track_changes(self.table, 'comment')
             self.table.comment = value
 
     @property
@@ -2272,13 +2667,17 @@ class DerivaTable(DerivaCore):
     def schema(self):
         return self.catalog.model_map[self.table.schema]
 
+    @property
+    def schema_name(self):
+        return self.table.schema.name
+
     @property
     def columns(self):
-        return KeyedList([self.catalog.model_map[c] for c in self.table.column_definitions])
+        return self._model_view('columns')
 
     @property
     def keys(self):
-        return KeyedList([ self.catalog.model_map[k] for k in self.table.keys])
+        return self._model_view('keys')
 
     @property
     def foreign_key(self):
@@ -2286,11 +2685,72 @@ class DerivaTable(DerivaCore):
 
     @property
     def foreign_keys(self):
-        return KeyedList([self.catalog.model_map[k] for k in self.table.foreign_keys])
+        return self._model_view('foreign_keys')
 
     @property
     def referenced_by(self):
-        return KeyedList([self.catalog.model_map[fk] for fk in self.table.referenced_by])
+        return self._model_view('referenced_by')
+
+    def _model_view(self, kind):
+        # Return a copy so that changes made by the caller don't end up in the cached list.
+        return KeyedList(list(self._model_views()[kind]))
+
+    def _model_views(self):
+        """
+        Return the lists of columns, keys, foreign keys and referencing foreign keys for this table.  The lists are
+        cached until columns, keys or foreign keys are created or dropped somewhere in the catalog.
+
+        :return: Dictionary of KeyedLists
+        """
+        def name_index(elements, element_name):
+            # Index by name, and for constraints, by (schema_name, name) as well.
+            index = {}
+            for e in elements:
+                name = element_name(e)
+                if isinstance(name, (tuple, list)):
+                    schema, name = name
+                    index[(getattr(schema, 'name', schema), name)] = e
+                index.setdefault(name, e)
+            return index
+
+        generation = self.catalog.model_generation
+        views = self._views
+        if views is not None and views[0] == generation:
+            return views[1]
+        with self.catalog.lock:
+            if self._views is not None and self._views[0] == self.catalog.model_generation:
+                return self._views[1]
+            generation = self.catalog.model_generation
+            model_map = self.catalog.model_map
+            views = {
+                'columns': KeyedList([model_map[c] for c in self.table.column_definitions]),
+                'keys': KeyedList([model_map[k] for k in self.table.keys]),
+                'foreign_keys': KeyedList([model_map[fk] for fk in self.table.foreign_keys]),
+                'referenced_by': KeyedList([model_map[fk] for fk in self.table.referenced_by])
+            }
+            views['index'] = {
+                'columns': name_index(views['columns'], lambda c: c.column.name),
+                'keys': name_index(views['keys'], lambda k: k.key.name),
+                'foreign_keys': name_index(views['foreign_keys'], lambda fk: fk.fkey.name),
+                'referenced_by': name_index(views['referenced_by'], lambda fk: fk.fkey.name)
+            }
+            self._views = (generation, views)
+            return views
+
+    def _lookup(self, kind, name):
+        """
+        Find a column, key or foreign key of this table by name.
+
+        :param kind: One of 'columns', 'keys', 'foreign_keys' or 'referenced_by'
+        :param name: Name of the element.  Keys and foreign keys can also be named by [schema_name, name]
+        :return: The matching DerivaColumn, DerivaKey or DerivaForeignKey, or None if there is no match.
+        """
+        if isinstance(name, list):
+            name = tuple(name)
+        try:
+            return self._model_views()['index'][kind].get(name)
+        except TypeError:  # Not a valid name
+            return None
 
     def key_referenced(self, columns):
         """
@@ -2303,14 +2763,36 @@ class DerivaTable(DerivaCore):
         columns = set(columns)
         return [fk for fk in self.referenced_by if {i.name for i in fk.referenced_columns} == columns]
 
-    def _map_model(self):
-        for c in self.table.column_definitions:
-            self.catalog.model_map[c] = DerivaColumn(self.catalog, c)
-        for k in self.table.keys:
-            self.catalog.model_map[k] = DerivaKey(self.catalog, k)
-        for fk in self.table.foreign_keys:
-            self.catalog.model_map[fk] = DerivaForeignKey(self.catalog, fk)
+    def _rebind(self, table, old_map):
+        """
+        Point this table at a newly fetched ermrest table.  If the table definition is unchanged the existing column,
+        key and foreign key objects are kept, otherwise they are re-mapped from the new definition.
 
+        :param table: ermrest_model Table from the refreshed model
+        :param old_map: model_map from before the refresh
+        :return: True if the table definition was unchanged.
+        """
+        old_table = self.table
+        self.table = table
+        self._views = None
+        self.catalog.model_map[table] = self
+
+        # New column, key and foreign key objects will be created as they are used.
+        if old_table.prejson() != table.prejson():
+            return False
+
+        # Definitions are the same, so elements line up one to one.
+        for attr, old_elements, new_elements in [
+            ('column', old_table.column_definitions, table.column_definitions),
+            ('key', old_table.keys, table.keys),
+            ('fkey', old_table.foreign_keys, table.foreign_keys)
+        ]:
+            for old, new in zip(old_elements, new_elements):
+                element = old_map.get(old)
+                if element is not None:
+                    setattr(element, attr, new)
+                    self.catalog.model_map[new] = element
+        return True
 
     def _referenced(self, fkey_id, referenced_by):
         """
@@ -2366,19 +2848,18 @@ class DerivaTable(DerivaCore):
         key = DerivaKey(self, columns, name, comment, annotations, define=True)
         self.logger.debug('creating key....')
         key.create()
+        self.catalog._model_changed()
 
     def column(self, column_name):
         return self.catalog.model_map[self.table[column_name]]
 
     def validate(self):
-        with DerivaModel(self.catalog):
-            rval = self.annotations.validate(self)
-            rval = self.keys.validate() and rval
-            rval = self.foreign_keys.validate() and rval
-            rval = self.columns.validate() and rval
-            rval = self.acls.validate(self) and rval
-            rval = self.acl_bindings.validate(self) and rval
-            return rval
+        rval = self.annotations.validate(self)
+        for i in self.keys + self.foreign_keys + self.columns:
+            rval = i.validate() and rval
+        rval = self.acls.validate(self) and rval
+        rval = self.acl_bindings.validate(self) and rval
+        return rval
 
     def validate_display(self):
         # TODO FInish....
@@ -2459,6 +2940,7 @@ class DerivaTable(DerivaCore):
                                         annotations=annotations,
                                         define=True)
             )
+            self.catalog._model_changed()
 
             _, _, inbound_sources = referenced_table.sources(filter=[fkey.name])
             # Pick out the source for this key:
@@ -2609,13 +3091,16 @@ class DerivaTable(DerivaCore):
         :return:
         """
 
-        for k, key_def in column_map.get_keys().items():
-            self.logger.debug('from key_name %s to key_name: %s', k, key_def.name)
-            key_def.create()
+        try:
+            for k, key_def in column_map.get_keys().items():
+                self.logger.debug('from key_name %s to key_name: %s', k, key_def.name)
+                key_def.create()
 
-        for k, fkey_def in column_map.get_foreign_keys().items():
-            self.logger.debug('fro fkey_name %s to %s', k, fkey_def.name)
-            fkey_def.create()
+            for k, fkey_def in column_map.get_foreign_keys().items():
+                self.logger.debug('fro fkey_name %s to %s', k, fkey_def.name)
+                fkey_def.create()
+        finally:
+            self.catalog._model_changed()
 
     def _delete_columns_in_display(self, annotation, columns):
         raise DerivaCatalogError(self, 'Cannot delete column from display annotation')
@@ -2744,6 +3229,7 @@ class DerivaTable(DerivaCore):
             # Now delete the actual columns
             for c in columns:
                 c.drop()
+            self.catalog._model_changed()
 
             # Now clean up all the annotations.
             self._delete_columns_from_annotations(columns, column_specs)
@@ -2818,6 +3304,7 @@ class DerivaTable(DerivaCore):
                 column.update_table(self)
                 column.create()
                 column_names.append(column.name)
+            self.catalog._model_changed()
 
             if visible:
                 sources, _, _ = self.sources(filter=column_names)
@@ -2898,7 +3385,8 @@ class DerivaTable(DerivaCore):
                 fk.referenced_table.visible_foreign_keys.delete_visible_source(fk.name)
             # Now we can delete the table.
             self.table.drop()
-            del self.catalog.model_map[self.table]
+            self.catalog.model_map.pop(self.table, None)
+            self.catalog._model_changed()
             self.deleted = True
 
     def _relink_columns(self, dest_table, column_map):
@@ -2944,7 +3432,9 @@ class DerivaTable(DerivaCore):
                    comment=None,
                    acls={},
                    acl_bindings={},
-                   annotations={}
+                   annotations={},
+                   resume=False,
+                   page_size=10000
                    ):
         """
         Copy the current table to the specified target schema and table. All annotations and keys are modified to
@@ -2953,6 +3443,10 @@ class DerivaTable(DerivaCore):
         if the clone argument is set to true, the RIDs of the source table are reused, so that the equivalent of a
         move operation can be obtained.
 
+        Rows are copied in RID order, page_size rows at a time.  If a copy with clone set fails part way through, it
+        can be restarted with resume set, which will reuse the existing target table and copy the rows that come after
+        the last RID in it.
+
         :param schema_name: Target schema name
         :param table_name:  Target table name
         :param column_map: A dictionary that is used to rename columns in the target table.
@@ -2963,10 +3457,15 @@ class DerivaTable(DerivaCore):
         :param acls:
         :param acl_bindings:
         :param annotations:
+        :param resume: Continue a previous copy into an existing table. Requires clone.
+        :param page_size: Number of rows to read and insert at a time.
         :return: The new table
         """
         self.logger.debug('schema_name %s dest_table %s', schema_name, table_name)
 
+        if resume and not clone:
+            raise DerivaTableError(self, 'Copy can only be resumed if RIDs are cloned')
+
         with DerivaModel(self.catalog):
             # Augment the column_map with entries for columns in the table, but not in the map.
             new_map = {i.name: column_map.get(i.name, i.name) for i in self.columns}
@@ -2982,41 +3481,71 @@ class DerivaTable(DerivaCore):
             annotations = self._rename_columns_in_annotations(column_map)
             annotations.pop(chaise_tags.visible_foreign_keys, None)
 
-            new_table = self.catalog[schema_name].create_table(
-                table_name,
-                # Use column_map to change the name of columns in the new table.
-                column_defs=column_map.get_columns().values(),
-                key_defs=[i for i in column_map.get_keys().values()] + key_defs,
-                fkey_defs=[i for i in column_map.get_foreign_keys().values()] + fkey_defs,
-                comment=comment if comment else self.comment,
-                acls={**self.acls, **acls},
-                acl_bindings={**self.acl_bindings, **acl_bindings},
-                annotations=annotations
-            )
+            if resume and table_name in self.catalog[schema_name].tables:
+                new_table = self.catalog[schema_name][table_name]
+            else:
+                new_table = self.catalog[schema_name].create_table(
+                    table_name,
+                    # Use column_map to change the name of columns in the new table.
+                    column_defs=column_map.get_columns().values(),
+                    key_defs=[i for i in column_map.get_keys().values()] + key_defs,
+                    fkey_defs=[i for i in column_map.get_foreign_keys().values()] + fkey_defs,
+                    comment=comment if comment else self.comment,
+                    acls={**self.acls, **acls},
+                    acl_bindings={**self.acl_bindings, **acl_bindings},
+                    annotations=annotations
+                )
 
-            # Create new table
-            new_table.table_model = table_name
-            new_table.schema_model = schema_name
+                # Create new table
+                new_table.table_model = table_name
+                new_table.schema_model = schema_name
 
             # Copy over values from original to the new one, mapping column names where required. Use the column_fill
             # argument to provide values for non-null columns.
             pb = self.catalog.getPathBuilder()
-            from_path = pb.schemas[self.schema_name].tables[self.name]
             to_path = pb.schemas[schema_name].tables[table_name]
-
-            self.logger.debug('copying columns: %s',
-                              {column_map.get(i.name, i).name: getattr(from_path, i.name) for i in self.columns})
-
-            v = from_path.attributes(
-                    **{column_map.get(i.name, i).name: getattr(from_path, i.name) for i in self.columns})
-
-            rows = map(
-                lambda x: {**x, **{k: v.fill for k, v in column_map.get_columns().items() if v.fill}},
-                v.fetch())
-
-            to_path.insert(list(rows), **({'nondefaults': {'RID', 'RCT', 'RCB'}} if clone else {}))
+            self._copy_rows(to_path, column_map, clone=clone, resume=resume, page_size=page_size)
         return new_table
 
+    def _copy_rows(self, to_path, column_map, clone=False, resume=False, page_size=10000):
+        """
+        Copy the rows of this table into another table one page at a time in RID order, so that neither the whole
+        table nor the whole insert has to be held in memory.
+
+        :param to_path: Datapath for the target table
+        :param column_map: DerivaColumnMap from the columns of this table to the target table.
+        :param clone: Reuse the RID, RCT and RCB of the source rows.
+        :param resume: Skip over the rows up to the last RID that is already in the target table.
+        :param page_size: Number of rows to read and insert at a time.
+        :return: Number of rows copied.
+        """
+        pb = self.catalog.getPathBuilder()
+        from_path = pb.schemas[self.schema.name].tables[self.name]
+
+        projection = {column_map.get(i.name, i).name: getattr(from_path, i.name) for i in self.columns}
+        fill = {k: v.fill for k, v in column_map.get_columns().items() if v.fill}
+        self.logger.debug('copying columns: %s', projection)
+
+        last_rid = None
+        if resume:
+            last = list(to_path.attributes(to_path.RID).sort(to_path.RID.desc).fetch(limit=1))
+            last_rid = last[0]['RID'] if last else None
+            self.logger.info('Resuming copy of %s after RID %s', self.name, last_rid)
+
+        count = 0
+        while True:
+            path = from_path if last_rid is None else from_path.filter(from_path.RID > last_rid)
+            rows = list(path.attributes(**projection).sort(from_path.RID).fetch(limit=page_size))
+            if not rows:
+                break
+            to_path.insert([{**r, **fill} for r in rows], **({'nondefaults': {'RID', 'RCT', 'RCB'}} if clone else {}))
+            count += len(rows)
+            last_rid = rows[-1]['RID']
+            self.logger.info('Copied %d rows from %s', count, self.name)
+            if len(rows) < page_size:
+                break
+        return count
+
     def move_table(self, schema_name, table_name,
                    delete=True,
                    column_map={},
@@ -3025,7 +3554,9 @@ class DerivaTable(DerivaCore):
                    comment=None,
                    acls={},
                    acl_bindings={},
-                   annotations={}
+                   annotations={},
+                   resume=False,
+                   page_size=10000
                    ):
         """
         Move a table, renaming and inserting new columns.
@@ -3040,6 +3571,8 @@ class DerivaTable(DerivaCore):
         :param acls:
         :param acl_bindings:
         :param annotations:
+        :param resume: Continue a previous move that failed while copying rows.
+        :param page_size: Number of rows to copy at a time.
         :return: New DerivaTable object
         """
         self.logger.debug('%s %s %s', schema_name, table_name, column_map)
@@ -3060,7 +3593,9 @@ class DerivaTable(DerivaCore):
                                         comment=comment,
                                         acls=acls,
                                         acl_bindings=acl_bindings,
-                                        annotations=annotations)
+                                        annotations=annotations,
+                                        resume=resume,
+                                        page_size=page_size)
 
             self._relink_columns(new_table, column_map)
             if delete:
@@ -7,15 +7,27 @@ import sys
 import time
 import json
 import ast
+import csv
 import datetime
+import glob
+import gzip
+import io
+import functools
+import hashlib
+import heapq
+import itertools
 import logging
+import queue
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from requests import HTTPError
 from deriva.core import ErmrestCatalog, get_credential, init_logging, urlparse
 from deriva.core import tag as chaise_tags
 import deriva.core.ermrest_model as em
 from deriva.utils.catalog.manage.dump_catalog import DerivaCatalogToString
-from deriva.utils.catalog.manage.utils import LoopbackCatalog, LoopbackModel
+from deriva.utils.catalog.manage.utils import LoopbackCatalog, LoopbackModel, load_module_from_path
 from deriva.utils.catalog.components.deriva_model import DerivaModel, DerivaCatalog
 from deriva.core.base_cli import BaseCLI
 from deriva.utils.catalog.version import __version__ as VERSION
@@ -103,6 +115,699 @@ class DerivaCSVError(Exception):
         self.msg = msg
 
 
+def _source_fingerprint(source, prefix_size=65536):
+    """
+    Cheaply identify the contents of a source: the size, modification time and a hash of the first bytes of each of
+    its files.
+    :return: list of dictionaries, one per file, or None if the source is not made up of local files.
+    """
+    try:
+        paths = _shard_paths(source) if _is_sharded(source) else [source]
+        fingerprint = []
+        for path in paths:
+            st = os.stat(path)
+            with open(path, 'rb') as f:
+                prefix = hashlib.sha256(f.read(prefix_size)).hexdigest()
+            fingerprint.append({'path': os.path.abspath(path), 'size': st.st_size, 'mtime': st.st_mtime,
+                                'prefix_sha256': prefix})
+    except (OSError, TypeError, DerivaCSVError):
+        return None
+    return fingerprint
+
+
+class DerivaUploadCheckpoint:
+    """
+    Manifest of the chunks of an upload.  For each chunk we keep the row number and byte offsets in the source file
+    where it starts and ends, a hash of its contents, and whether it has been committed to the catalog. The manifest
+    is rewritten each time a chunk commits, so an interrupted upload can be restarted by seeking directly to the
+    first chunk that has not been committed, even when chunks finished out of order.  The manifest also records the
+    size, modification time and a hash of the start of the source, and is refused if the source has changed.
+    """
+
+    def __init__(self, filename, chunk_size, upload_id=None, source=None):
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.upload_id = upload_id
+        self.source = source
+        self.fingerprint = _source_fingerprint(source) if source is not None else None
+        self.chunks = {}
+        self.resumed = False  # True if we are picking up from a checkpoint written by an earlier run.
+        self._lock = threading.Lock()
+
+        if os.path.exists(filename):
+            with open(filename) as f:
+                state = json.load(f)
+            if state['chunk_size'] != chunk_size:
+                raise DerivaCSVError(msg='Checkpoint {} was written with chunk size {}'.format(filename,
+                                                                                           state['chunk_size']))
+            if upload_id is not None and state['upload_id'] != upload_id:
+                raise DerivaCSVError(msg='Checkpoint {} is for upload id {}'.format(filename, state['upload_id']))
+            if source is not None and state['source'] != source:
+                raise DerivaCSVError(msg='Checkpoint {} is for source {}'.format(filename, state['source']))
+            if source is not None and state.get('fingerprint') != self.fingerprint:
+                raise DerivaCSVError(msg='Source {} has changed since checkpoint {} was written'.format(source,
+                                                                                                     filename))
+            self.upload_id = state['upload_id']
+            self.chunks = {c['chunk']: c for c in state['chunks']}
+            self.resumed = True
+            logger.info('Resuming upload from checkpoint %s: %s chunks committed', filename, len(self.committed))
+
+    @property
+    def committed(self):
+        return {n for n, c in self.chunks.items() if c['committed']}
+
+    def resume_point(self):
+        """
+        Find where to start reading the source again.  This is the first chunk that has not been committed, or if
+        every chunk in the manifest has been committed, the position just after the last of them.
+        :return: chunk number, row number and byte offset to start at. The offset is None if the position is not
+                 known, in which case the source has to be read from the beginning.
+        """
+        with self._lock:
+            previous = None
+            for n in itertools.count(1):
+                chunk = self.chunks.get(n)
+                if chunk is None or not chunk['committed']:
+                    break
+                previous = chunk
+        if chunk is not None:
+            start = chunk['chunk'], chunk['row'], chunk['offset']
+        elif previous is not None and previous['row'] is not None:
+            start = previous['chunk'] + 1, previous['row'] + previous['rows'], previous['end']
+        else:
+            start = None, None, None
+        if None in start:
+            return 1, None, None
+        return start
+
+    def record(self, chunk_number, rows, row=None, offset=None, end=None):
+        """
+        Add a chunk to the manifest before it is uploaded.  If the chunk is already in the manifest, make sure that
+        the source has not changed since it was recorded.
+
+        :param chunk_number: Position of the chunk in the upload, starting at 1.
+        :param rows: Rows in the chunk
+        :param row: Row number of the first row in the chunk
+        :param offset: Byte offset in the source of the first row in the chunk
+        :param end: Byte offset in the source just after the last row in the chunk
+        :return: True if the chunk still needs to be uploaded.
+        """
+        digest = hashlib.sha256(json.dumps(rows, default=str).encode('utf-8')).hexdigest()
+        with self._lock:
+            chunk = self.chunks.get(chunk_number)
+            if chunk is None:
+                self.chunks[chunk_number] = {'chunk': chunk_number, 'row': row, 'rows': len(rows),
+                                             'offset': offset, 'end': end, 'sha256': digest, 'committed': False}
+                return True
+            if chunk['sha256'] != digest:
+                raise DerivaCSVError(msg='Chunk {} of {} has changed since checkpoint {} was written'.format(
+                    chunk_number, self.source, self.filename))
+            return not chunk['committed']
+
+    def commit(self, chunk_number):
+        """
+        Record that a chunk has been committed to the catalog.
+        :param chunk_number: Position of the chunk in the upload, starting at 1.
+        """
+        with self._lock:
+            self.chunks[chunk_number]['committed'] = True
+            self.save()
+
+    def save(self):
+        # Write to a temporary file and then rename it so that a crash never leaves a partial checkpoint behind.
+        tmpname = self.filename + '.tmp'
+        with open(tmpname, 'w') as f:
+            json.dump({'source': self.source,
+                       'fingerprint': self.fingerprint,
+                       'upload_id': self.upload_id,
+                       'chunk_size': self.chunk_size,
+                       'chunks': [self.chunks[n] for n in sorted(self.chunks)]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpname, self.filename)
+
+    def finish(self):
+        """
+        Remove the checkpoint once the upload has completed, so that a later upload of the same table starts afresh.
+        """
+        with self._lock:
+            try:
+                os.remove(self.filename)
+            except FileNotFoundError:
+                pass
+
+
+class _OffsetLines:
+    """
+    Iterate over the lines of a binary file, keeping track of the byte offset just after the last line that was read.
+    Line breaks are translated as they are when tabulator reads the file in text mode, so that line breaks inside
+    quoted values come out the same.
+    """
+
+    def __init__(self, f, encoding):
+        self._f = f
+        self._encoding = encoding
+        self.offset = f.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self._f.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode(self._encoding).replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _csv_reader_options(dialect):
+    """
+    Get the csv.reader arguments that read a file the same way as the tabulator stream that produced dialect.
+    """
+    options = {'delimiter': dialect.get('delimiter', ','),
+               'quotechar': dialect.get('quoteChar', '"') or None,
+               'doublequote': dialect.get('doubleQuote', True),
+               'skipinitialspace': dialect.get('skipInitialSpace', False),
+               'escapechar': dialect.get('escapeChar')}
+    if options['quotechar'] is None:
+        options['quoting'] = csv.QUOTE_NONE
+    return options
+
+
+def _csv_records(filename, offset, row_number, encoding, dialect):
+    """
+    Read the records in a CSV file starting at a byte offset, which must be at the start of a record.
+
+    :param filename: CSV file
+    :param offset: Byte offset in the file at which to start
+    :param row_number: Row number of the record at offset.
+    :param encoding: Character encoding of the file
+    :param dialect: tabulator CSV dialect of the file
+    :return: Iterator of (row number, start offset, end offset, row) for each record.
+    """
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        lines = _OffsetLines(f, encoding)
+        reader = csv.reader(lines, **_csv_reader_options(dialect))
+        start = offset
+        for row in reader:
+            yield row_number, start, lines.offset, row
+            start = lines.offset
+            row_number += 1
+
+
+def _resize_connection_pool(ermrest_catalog, size):
+    """
+    Make sure that the HTTP session used by a catalog can keep at least size connections open at the same time.
+    """
+    session = getattr(ermrest_catalog, '_session', None)
+    if session is None:
+        return
+    for adapter in set(session.adapters.values()):
+        if getattr(adapter, '_pool_maxsize', size) < size:
+            adapter.init_poolmanager(adapter._pool_connections, size, block=adapter._pool_block)
+
+
+def _seekable_csv(stream):
+    """
+    Check if a tabulator stream is a plain CSV file in which record boundaries can be found from the raw bytes.
+    """
+    return (stream.scheme == 'file' and stream.format == 'csv' and stream.compression == 'no' and
+            '\n'.encode(stream.encoding) == b'\n')
+
+
+def _csv_shards(filename, shards, quotechar='"'):
+    """
+    Split a CSV file into byte ranges that start and end on record boundaries.  A line break is taken to end a record
+    if an even number of quote characters come before it, which holds as long as quotes are only used around fields.
+
+    :param filename: CSV file
+    :param shards: Number of ranges to aim for.
+    :param quotechar: CSV quote character
+    :return: List of (start, end) byte offsets.
+    """
+    size = os.path.getsize(filename)
+    # Without a quote character, every line break ends a record.
+    quote = quotechar.encode('ascii') if quotechar else None
+    boundaries = [0]
+    quotes = 0
+    with open(filename, 'rb') as f:
+        for i in range(1, shards):
+            target = size * i // shards
+            if target <= f.tell():
+                continue
+            # Count the quotes up to the target, and then carry on to the end of a record.
+            data = f.read(target - f.tell())
+            quotes += data.count(quote) if quote else 0
+            for line in f:
+                quotes += line.count(quote) if quote else 0
+                if quotes % 2 == 0:
+                    break
+            if f.tell() >= size:
+                break
+            boundaries.append(f.tell())
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _infer_shard(filename, start, end, encoding, dialect, block_size):
+    """
+    Infer the type of each column from the records in a byte range of a CSV file.  The header is skipped if the range
+    is at the start of the file.
+
+    :return: The type of each column and the number of rows that were looked at.
+    """
+    records = _csv_records(filename, start, 1, encoding, dialect)
+    if start == 0:
+        next(records, None)
+    rows = (row for _, offset, _, row in itertools.takewhile(lambda r: r[1] < end, records))
+    types, row_count = [], 0
+    for block in _chunks(rows, block_size):
+        row_count += len(block)
+        if _infer_block(block, types):
+            break
+    records.close()
+    return types, row_count
+
+
+def _to_boolean(v):
+    return None if v == '' else v == 'true'
+
+
+def _to_integer(v):
+    return None if v == '' else int(v)
+
+
+def _to_number(v):
+    return None if v == '' else float(v)
+
+
+def _to_date(v):
+    return None if v == '' else v
+
+
+def _row_converter(field_types, row_number_as_key=False, upload_id=None):
+    """
+    Build a function that converts the string values in a row of a CSV file into python values for the columns of a
+    table.  The conversion for each column is looked up once here rather than for every value.
+
+    :param field_types: tableschema type of each column in the table
+    :param row_number_as_key: If true, the first two columns of the table are the upload id and row number, which are
+                              not in the file.
+    :param upload_id: Upload id to put in each row.
+    :return: function that takes a row number and a row and returns the converted row.
+    """
+    converters = {'boolean': _to_boolean, 'integer': _to_integer, 'number': _to_number}
+    offset = 2 if row_number_as_key else 0
+    column_converters = []
+    for idx, t in enumerate(field_types[offset:]):
+        converter = converters.get(t, _to_date if 'date' in t else None)
+        if converter is not None:
+            column_converters.append((idx, converter))
+
+    def convert_row(row_number, row):
+        if len(row) >= len(field_types) - offset:
+            for idx, converter in column_converters:
+                row[idx] = converter(row[idx])
+        else:
+            for idx, converter in column_converters:
+                if idx < len(row):
+                    row[idx] = converter(row[idx])
+        if row_number_as_key:
+            # Need to correct row number to take header into account...
+            row[0:0] = (upload_id, row_number - 1)
+        return row
+
+    return convert_row
+
+
+def _prefetch(items, depth):
+    """
+    Produce items from an iterable in a background thread, so that producing the next items overlaps with using the
+    current one.  Exceptions raised while producing items are passed on to the consumer.
+
+    :param items: Iterable to read from
+    :param depth: Maximum number of items to read ahead.
+    :return: Iterator over the items.
+    """
+    items_queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items_queue.put(item, timeout=.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except Exception as e:
+            put((done, e))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = items_queue.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+_compressed_extensions = ['.gz', '.zst']
+
+
+def _is_sharded(source):
+    """
+    Check if a source names a set of CSV files, or a file that tabulator can't decompress itself.
+    """
+    return (isinstance(source, str) and
+            (os.path.isdir(source) or any(c in source for c in '*?[') or source.endswith('.zst')))
+
+
+def _shard_paths(source):
+    """
+    List the files that make up a sharded source, in the order they are read.
+    """
+    if os.path.isdir(source):
+        paths = [os.path.join(source, i) for i in os.listdir(source)
+                 if i.endswith('.csv') or any(i.endswith('.csv' + ext) for ext in _compressed_extensions)]
+    else:
+        paths = glob.glob(source)
+    if not paths:
+        raise DerivaCSVError(msg='No CSV files found in {}'.format(source))
+    return sorted(paths)
+
+
+def _source_table_name(source):
+    """
+    Pick a table name from the name of a source file, directory or glob.
+    """
+    name = os.path.basename(source.rstrip('/'))
+    name = re.split(r'[*?\[]', name)[0].strip('_-. ') or os.path.basename(os.path.dirname(source)) or name
+    for ext in _compressed_extensions:
+        if name.endswith(ext):
+            name = name[:-len(ext)]
+    return os.path.splitext(name)[0]
+
+
+def _open_shard(path):
+    """
+    Open a CSV file for reading as bytes, decompressing it as it is read if needed.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise DerivaCSVError(msg='The zstandard package is needed to read {}'.format(path))
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    return open(path, 'rb')
+
+
+def _check_shard_headers(paths):
+    """
+    Make sure that every file in a sharded source has the same header line.
+    """
+    header = None
+    for path in paths:
+        with _open_shard(path) as f:
+            shard_header = f.readline().rstrip(b'\r\n')
+        if header is None:
+            header = shard_header
+        elif shard_header != header:
+            raise DerivaCSVError(msg='Header of {} does not match {}'.format(path, paths[0]))
+
+
+class _ShardReader(io.RawIOBase):
+    """
+    Read a set of CSV files as if they were one file.  The header line of each file after the first is skipped.  The
+    files are decompressed as they are read, so nothing is written to disk.
+    """
+
+    def __init__(self, paths):
+        self._paths = paths
+        self._shard = None
+        self.seek(0)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # Only rewinding is needed, to re-read the sample used to detect the encoding.
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('Sharded sources can only be rewound')
+        self._close_shard()
+        self._remaining = list(self._paths)
+        self._pending = b''
+        self._first = True
+        self._last_byte = b'\n'
+        return 0
+
+    def _close_shard(self):
+        if self._shard is not None:
+            self._shard.close()
+            self._shard = None
+
+    def _next_shard(self):
+        self._close_shard()
+        if not self._remaining:
+            return False
+        self._shard = _open_shard(self._remaining.pop(0))
+        if not self._first:
+            self._shard.readline()
+        self._first = False
+        return True
+
+    def readinto(self, b):
+        while not self._pending:
+            data = self._shard.read(len(b)) if self._shard is not None else b''
+            if data:
+                self._pending = data
+                self._last_byte = data[-1:]
+            elif self._shard is not None and self._last_byte != b'\n':
+                # Make sure the last row of a file doesn't run into the first row of the next one.
+                self._pending = self._last_byte = b'\n'
+            elif not self._next_shard():
+                return 0
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        self._close_shard()
+        super(_ShardReader, self).close()
+
+
+class _ShardLoader(tabulator.Loader):
+    """
+    tabulator loader for the 'shards' scheme, used for a directory or glob of CSV files.
+    """
+
+    options = []
+
+    def __init__(self, bytes_sample_size=tabulator.config.DEFAULT_BYTES_SAMPLE_SIZE, **options):
+        self.__bytes_sample_size = bytes_sample_size
+        self.__stats = None
+
+    def attach_stats(self, stats):
+        self.__stats = stats
+
+    def load(self, source, mode='t', encoding=None):
+        bytes = io.BufferedReader(_ShardReader(_shard_paths(source)))
+        if self.__stats:
+            bytes = tabulator.helpers.BytesStatsWrapper(bytes, self.__stats)
+        if mode == 'b':
+            return bytes
+
+        # Detect encoding
+        if self.__bytes_sample_size:
+            sample = bytes.read(self.__bytes_sample_size)
+            bytes.seek(0)
+            encoding = tabulator.helpers.detect_encoding(sample, encoding)
+        return io.TextIOWrapper(bytes, encoding)
+
+
+def _chunks(rows, chunk_size):
+    """
+    Group an iterable of rows into lists of at most chunk_size rows.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _external_sort(rows, key, run_size=100000):
+    """
+    Sort an iterable of rows without holding all of them in memory.  Rows are read run_size at a time, and each run
+    is sorted and written to a temporary file. The runs are then merged as they are read back.
+
+    :param rows: Iterable of JSON serializable rows
+    :param key: Function that returns the sort key for a row
+    :param run_size: Maximum number of rows to keep in memory at one time.
+    :return: Iterator over the rows in sorted order.
+    """
+    runs = []
+    for chunk in _chunks(rows, run_size):
+        chunk.sort(key=key)
+        if not runs and len(chunk) < run_size:
+            # Everything fit in memory, so no need to use any files.
+            yield from chunk
+            return
+        run = tempfile.TemporaryFile(mode='w+')
+        for row in chunk:
+            run.write(json.dumps(row) + '\n')
+        run.seek(0)
+        runs.append(run)
+    logger.debug('Merging %s sorted runs', len(runs))
+    try:
+        yield from heapq.merge(*[map(json.loads, run) for run in runs], key=key)
+    finally:
+        for run in runs:
+            run.close()
+
+
+# Values whose type can be decided by their text alone.  Anything that doesn't match is handed to _value_type, so these
+# only need to be right for what they do match.
+_type_patterns = [
+    (re.compile(r'(?i)true|false'), bool),
+    (re.compile(r'[+-]?(?:0|[1-9][0-9]*)'), int),
+    (re.compile(r'[+-]?(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|[+-]?[0-9]+[eE][+-]?[0-9]+'), float),
+]
+_iso_date_pattern = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}(?:[ T][0-9]{2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]{1,6})?)?)?')
+_url_type = type(urlparse('foo'))
+
+
+@functools.lru_cache(maxsize=65536)
+def _value_type(val):
+    """
+    Work out the python type of a single, non-empty, cell value.
+    """
+    for pattern, val_type in _type_patterns:
+        if pattern.fullmatch(val):
+            return val_type
+    if _iso_date_pattern.fullmatch(val):
+        try:
+            datetime.datetime.fromisoformat(val)
+            return datetime.datetime
+        except ValueError:
+            pass
+
+    # Deal with booleans so you don't confuse with strings.
+    if val.upper() == 'TRUE':
+        return bool
+    elif val.upper() == 'FALSE':
+        return bool
+
+    # Now see if you can turn into python numeric type...
+    try:
+        v = ast.literal_eval(val)
+    except SyntaxError:
+        v = val
+    except ValueError:
+        v = val
+    val_type = type(v)
+
+    if val_type is str:
+        try:
+            dateutil.parser.parse(v, ignoretz=True)
+            val_type = datetime.datetime
+        except ValueError:
+            pass
+
+    if val_type is str:
+        url_result = urlparse(v)
+        if url_result.scheme != '' and url_result.netloc != '':
+            val_type = type(url_result)
+    return val_type
+
+
+def _join_types(prev_type, val_type):
+    """
+    Combine the type of a column so far with the type of another value in the column.
+    """
+    if prev_type is None:
+        return val_type
+    # Float overrides integer.
+    if (val_type == float and prev_type == int) or (val_type == int and prev_type == float):
+        return float
+    elif val_type != prev_type:  # Types are different, so pick text
+        return str
+    return prev_type
+
+
+def _infer_block(block, types):
+    """
+    Update the type of each column with the values in a block of rows.  Combining types doesn't depend on the order
+    of the values, so each distinct value in a column only has to be looked at once.
+
+    :param block: List of rows
+    :param types: Current type of each column, updated in place.
+    :return: True if every column has been reduced to a string.
+    """
+    for cindex, values in enumerate(itertools.zip_longest(*block, fillvalue='')):
+        if cindex == len(types):
+            types.append(None)
+        column_type = types[cindex]
+        if column_type is str:
+            continue
+        for value in set(values):
+            if value == '':
+                continue
+            column_type = _join_types(column_type, _value_type(value))
+            if column_type is str:
+                break
+        types[cindex] = column_type
+    return all(t is str for t in types)
+
+
+def _merge_types(types, other):
+    """
+    Combine the column types inferred from two parts of a table.
+    """
+    merged = []
+    for a, b in itertools.zip_longest(types, other):
+        merged.append(a if b is None else _join_types(a, b))
+    return merged
+
+
+def _reservoir_sample(rows, size, seed=None):
+    """
+    Pick a uniform random sample of size rows from an iterable without knowing how many rows there are.
+    """
+    rng = random.Random(seed)
+    sample = []
+    for i, row in enumerate(rows):
+        if i < size:
+            sample.append(row)
+        else:
+            j = rng.randint(0, i)
+            if j < size:
+                sample[j] = row
+    return sample
+
+
 class DerivaCSVModel:
     """
     Class to represent a CSV schema as a dervia catalog model. This class takes a table schema, performs name
@@ -156,10 +861,12 @@ class DerivaCSVModel:
                 continue
             mapped_name = csvschema.map_name(col.name)
             self.field_name_map[col.name] = mapped_name
-            self.type_map.setdefault(table_schema_ermrest_type_map[col.type + ':' + col.format], []).append(col.name)
+            # Sources with typed columns give the deriva type directly, rather than leaving it to be picked from the
+            # tableschema type.
+            t = col.descriptor.get('derivaType', table_schema_ermrest_type_map[col.type + ':' + col.format])
+            self.type_map.setdefault(t, []).append(col.name)
 
-            t = "{}:{}".format(col.type, col.format)
-            column_defs.append(em.Column.define(mapped_name, em.builtin_types[table_schema_ermrest_type_map[t]],
+            column_defs.append(em.Column.define(mapped_name, em.builtin_types[t],
                                                 nullok=not col.required, comment=col.descriptor.get('description', '')))
         return column_defs
 
@@ -175,6 +882,143 @@ class DerivaCSVModel:
         return keys
 
 
+class DerivaCSVValidator:
+    """
+    Check rows of a table against a tableschema one row at a time, so that a table can be validated in a single pass
+    as it is read.  Type, required and unique constraints are checked.  Uniqueness is tracked with 64 bit hashes of
+    the values rather than the values themselves. Errors are reported in the same form as goodtables.
+    """
+
+    def __init__(self, table_schema, fail_fast=False, error_limit=1000):
+        """
+
+        :param table_schema: tableschema Schema to check against.
+        :param fail_fast: Stop at the first error.
+        :param error_limit: Stop once this many errors have been found.
+        """
+        self.schema = table_schema
+        self.fail_fast = fail_fast
+        self.error_limit = 1 if fail_fast else error_limit
+        self.errors = []
+        self.row_count = 0
+        self.headers = None
+        self._start_time = time.time()
+
+        self._missing_values = set(table_schema.descriptor.get('missingValues', ['']))
+        self._fields = list(enumerate(table_schema.fields))
+        self._required = [i for i, f in self._fields if f.required]
+
+        # Columns or groups of columns whose values have to be unique, along with the hashes we have seen so far.
+        names = table_schema.field_names
+        unique = [[i] for i, f in self._fields if f.constraints.get('unique')]
+        if table_schema.primary_key and len(table_schema.primary_key) > 1:
+            unique.append([names.index(i) for i in table_schema.primary_key])
+        elif table_schema.primary_key and [names.index(table_schema.primary_key[0])] not in unique:
+            unique.append([names.index(table_schema.primary_key[0])])
+        self._unique = [(columns, {}) for columns in unique]
+
+    @property
+    def done(self):
+        return len(self.errors) >= self.error_limit
+
+    def _error(self, code, message, row_number=None, column_number=None, row=None, **message_data):
+        if self.done:
+            return
+        error = {'code': code, 'message': message, 'message-data': message_data}
+        if row is not None:
+            error['row'] = row
+        if row_number is not None:
+            error['row-number'] = row_number
+        if column_number is not None:
+            error['column-number'] = column_number
+        self.errors.append(error)
+
+    def check_headers(self, headers):
+        """
+        Check that the headers of the table, after name mapping, line up with the fields in the schema.
+        :param headers:
+        :return: True if the headers are OK.
+        """
+        self.headers = headers
+        valid = True
+        for column_number, (header, field_name) in enumerate(
+                itertools.zip_longest(headers, self.schema.field_names), start=1):
+            if header != field_name:
+                valid = False
+                self._error('non-matching-header',
+                            'Header in column {} doesn\'t match field name {} in the schema'.format(column_number,
+                                                                                                   field_name),
+                            column_number=column_number, header=header, field_name=field_name)
+        return valid
+
+    def check_row(self, row_number, row):
+        """
+        Check one row of the table.
+        :param row_number: Row number in the source, counting the header as row 1.
+        :param row: List of string values, or for typed sources such as Parquet, the values that are uploaded.
+        :return: True if the row is OK.
+        """
+        self.row_count += 1
+        error_count = len(self.errors)
+        if len(row) > len(self._fields):
+            column_number = len(self._fields) + 1
+            self._error('extra-value', 'Row {} has an extra value in column {}'.format(row_number, column_number),
+                        row_number=row_number, column_number=column_number, row=row)
+        elif len(row) < len(self._fields):
+            self._error('missing-value', 'Row {} has a missing value in column {}'.format(row_number, len(row) + 1),
+                        row_number=row_number, column_number=len(row) + 1, row=row)
+            row = row + [''] * (len(self._fields) - len(row))
+
+        values = []
+        for column_number, field in self._fields:
+            value = row[column_number]
+            # Only strings can be missing values. Values read from a Parquet file may be lists, which can't be hashed.
+            if value is None or (isinstance(value, str) and value in self._missing_values):
+                values.append(None)
+                if field.required:
+                    self._error('required-constraint',
+                                'Column {} is a required field, but row {} has no value'.format(column_number + 1,
+                                                                                               row_number),
+                                row_number=row_number, column_number=column_number + 1, row=row)
+                continue
+            try:
+                values.append(field.cast_value(value, constraints=False))
+            except exceptions.CastError:
+                values.append(value)
+                self._error('type-or-format-error',
+                            'The value "{}" in row {} and column {} is not type "{}" and format "{}"'.format(
+                                value, row_number, column_number + 1, field.type, field.format),
+                            row_number=row_number, column_number=column_number + 1, row=row,
+                            value=value, field_type=field.type, field_format=field.format)
+
+        for columns, seen in self._unique:
+            key = [values[i] for i in columns]
+            if None in key:
+                continue
+            digest = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=8).digest()
+            first_row = seen.setdefault(digest, row_number)
+            if first_row != row_number:
+                self._error('unique-constraint',
+                            'Rows {} has unique constraint violation in column {}'.format(
+                                ', '.join(str(i) for i in [first_row, row_number]),
+                                ', '.join(str(i + 1) for i in columns)),
+                            row_number=row_number, column_number=columns[0] + 1, row=row)
+        return len(self.errors) == error_count
+
+    def report(self, source=None):
+        """
+        Summarize the results of the validation in the same form as a goodtables report.
+        """
+        valid = not self.errors
+        table = {'time': round(time.time() - self._start_time, 3), 'valid': valid, 'error-count': len(self.errors),
+                 'row-count': self.row_count + 1, 'source': source, 'headers': self.headers, 'errors': self.errors}
+        warnings = []
+        if self.done:
+            warnings.append('Table "{}" inspection has reached {} error(s) limit'.format(source, self.error_limit))
+        return {'time': table['time'], 'valid': valid, 'error-count': len(self.errors), 'table-count': 1,
+                'tables': [table], 'warnings': warnings}
+
+
 class DerivaCSV(Table):
 
     def __init__(self, source, schema_name, table_name=None, column_map=True,
@@ -199,7 +1043,13 @@ class DerivaCSV(Table):
         """
         if schema is True:
             schema = None
-        super(DerivaCSV, self).__init__(source, schema=schema)
+
+        # A directory or glob of (possibly compressed) CSV files is read as one table.
+        self._stream_options = {}
+        if _is_sharded(source):
+            _check_shard_headers(_shard_paths(source))
+            self._stream_options = {'scheme': 'shards', 'format': 'csv', 'custom_loaders': {'shards': _ShardLoader}}
+        super(DerivaCSV, self).__init__(source, schema=schema, **self._stream_options)
 
         self.source = source
         self.table_name = table_name
@@ -222,13 +1072,13 @@ class DerivaCSV(Table):
 
         # If tablename is not specified, use the file name of the data file as the table name.
         if not self.table_name:
-            self.table_name = os.path.splitext(os.path.basename(source))[0]
+            self.table_name = _source_table_name(source)
 
         # Make the table name consistent with the naming strategy
         self.table_name = self.map_name(self.table_name)
 
         # Do initial infer to set up headers and schema.
-        Table.infer(self)
+        self._infer_headers()
 
         # Headers have to be unique
         if len(self.headers) != len(set(self.headers)):
@@ -245,6 +1095,9 @@ class DerivaCSV(Table):
 
         return
 
+    def _infer_headers(self):
+        Table.infer(self)
+
     def __set_key_constraints(self):
         """
         Go through the schema and set up the primary key column based on provided key_columns.  Then go through the
@@ -285,78 +1138,58 @@ class DerivaCSV(Table):
         self.schema.commit(strict=True)
         return
 
-    @staticmethod
-    def __get_type(val, prev_type):
-        # Skip over empty cells or if you have already gotten to string type.
-        if val == '' or prev_type is str:
-            next_type = prev_type
-        else:
-            # Deal with booleans so you don't confuse with strings.
-            if val.upper() == 'TRUE':
-                val = True
-            elif val.upper() == 'FALSE':
-                val = False
-
-            # Now see if you can turn into python numeric type...
-            try:
-                v = ast.literal_eval(val)
-            except SyntaxError:
-                v = val
-            except ValueError:
-                v = val
-            val_type = type(v)
-
-            if val_type is str:
-                try:
-                    dateutil.parser.parse(v, ignoretz=True)
-                    val_type = datetime.datetime
-                except ValueError:
-                    pass
-
-            if val_type is str:
-                url_result = urlparse(v)
-                if url_result.scheme != '' and url_result.netloc != '':
-                    val_type = type(url_result)
-
-            next_type = val_type
-
-            # Do promotion/demotion.
-            if prev_type is not None:
-                # Float overrides integer.
-                if (val_type == float and prev_type == int) or (val_type == int and prev_type == float):
-                    next_type = float
-                elif val_type != prev_type:  # Types are different, so pick text
-                    next_type = str
-
-        return next_type
-
-    def infer(self, limit=None, confidence=.75):
-        """
-        Infer the current type by looking at the values in the table
+    def infer(self, limit=None, confidence=.75, sample=None, block_size=10000, seed=None, workers=1):
+        """
+        Infer the current type by looking at the values in the table.  Values are checked a column at a time in blocks
+        of rows, and reading stops as soon as every column has been reduced to a string.
+
+        :param limit: Maximum number of rows to read.
+        :param confidence:
+        :param sample: If provided, infer types from a random sample of this many rows rather than all of the rows.
+        :param block_size: Number of rows to look at in one go.
+        :param seed: Random seed used for sampling.
+        :param workers: Number of processes to use.  If more than one, a local CSV file is split into that many
+                        pieces which are inferred at the same time.
          """
         # Do initial infer tqo set up headers and schema.
         Table.infer(self)
 
-        rows = self.read(cast=False)
         headers = self.headers
         # Get descriptor
         fields = []
-        type_matches = {}
         for header in headers:
             fields.append({'name': header})
 
-        rindex = 0
-        for rindex, row in enumerate(rows):
-            if limit is not None and rindex == limit:
-                break
-            # build a column-wise lookup of type matches
-            for cindex, value in enumerate(row):
-                typeid = self.__get_type(value, type_matches.get(cindex, None))
-                type_matches[cindex] = typeid
-        self.row_count = rindex
-        url_type = type(urlparse('foo'))
-
-        for index, results in type_matches.items():
+        with tabulator.Stream(self.source, **self._stream_options) as stream:
+            encoding, dialect = stream.encoding, stream.dialect
+            # Record boundaries are found by counting quotes, which doesn't work if quotes can be escaped.
+            shardable = (_seekable_csv(stream) and 'escapeChar' not in dialect and limit is None and sample is None
+                         and workers > 1)
+
+        if shardable:
+            shards = _csv_shards(self.source, workers, quotechar=dialect.get('quoteChar'))
+            logger.debug('Inferring types from %s shards', len(shards))
+            type_matches = []
+            self.row_count = 0
+            starts, ends = zip(*shards)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for types, row_count in executor.map(_infer_shard, itertools.repeat(self.source), starts, ends,
+                                                     itertools.repeat(encoding), itertools.repeat(dialect),
+                                                     itertools.repeat(block_size)):
+                    type_matches = _merge_types(type_matches, types)
+                    self.row_count += row_count
+        else:
+            rows = itertools.islice(self.iter(cast=False), limit)
+            if sample is not None:
+                rows = _reservoir_sample(rows, sample, seed=seed)
+            type_matches = []
+            self.row_count = 0
+            for block in _chunks(rows, block_size):
+                self.row_count += len(block)
+                if _infer_block(block, type_matches):
+                    break
+
+        for index, results in enumerate(type_matches):
             type_name, type_format = None, 'default'
             if results is bool:
                 type_name = 'boolean'
@@ -369,7 +1202,7 @@ class DerivaCSV(Table):
             elif results is datetime.datetime:
                 type_name = 'datetime'
                 type_format = 'any'
-            elif results is url_type:
+            elif results is _url_type:
                 type_name = 'string'
                 type_format = 'uri'
             else:
@@ -384,36 +1217,63 @@ class DerivaCSV(Table):
         self.schema.commit()
         return
 
-    def validate(self, catalog, validation_limit=500000):
+    def validate(self, catalog, validation_limit=500000, engine='goodtables', fail_fast=False):
         """
         For the specified table data, validate the contents of the table against an existing table in a catalog.
         :parameter catalog
         :param validation_limit: How much of the table to check. Defaults to entire table.
+        :param engine: Use goodtables to do the validation, or 'stream' to check the table in a single pass with
+                       DerivaCSVValidator.
+        :param fail_fast: Stop at the first error. Only used by the stream engine.
         :return: an error report and the number of rows in the table as a tuple
         """
 
-        table_schema = self.table_schema_from_catalog(catalog, self.schema_name, self.table_name)
+        table_schema = self._file_schema(self.table_schema_from_catalog(catalog))
 
-        if self.row_number_as_key:
-            # Need to correct for two upload_id and row number....
-            del table_schema.descriptor['primaryKey']
-            table_schema.descriptor['fields'] = table_schema.descriptor['fields'][2:]
-            table_schema.commit()
+        if engine == 'stream':
+            return self._validate_stream(table_schema, validation_limit, fail_fast)
 
         # First, just check the headers to make sure they line up under mapping.
-        report = goodtables.validate(self.source, schema=table_schema.descriptor, checks=['non-matching-header'])
+        report = goodtables.validate(self.source, schema=table_schema.descriptor, checks=['non-matching-header'],
+                                     **self._stream_options)
         if not report['valid'] and self._column_map:
             mapped_headers = map(lambda x: self.map_name(x), report['tables'][0]['headers'])
             bad_headers = list(filter(lambda x: x[0] != x[1], zip(table_schema.field_names, mapped_headers)))
             if bad_headers:
                 report['headers'] = [x[1] for x in bad_headers]
-                return report['valid'], report, validation_limit
+                return report['valid'], report
         report = goodtables.validate(self.source, row_limit=validation_limit, schema=table_schema.descriptor,
-                                     skip_checks=['non-matching-header'])
+                                     skip_checks=['non-matching-header'], **self._stream_options)
         self.validation_report = report
 
         return report['valid'], report
 
+    def _file_schema(self, table_schema):
+        """
+        Adjust a schema from the catalog so it only has the columns that are in the source file.
+        """
+        if self.row_number_as_key:
+            # Need to correct for two upload_id and row number....
+            del table_schema.descriptor['primaryKey']
+            table_schema.descriptor['fields'] = table_schema.descriptor['fields'][2:]
+            table_schema.commit()
+        return table_schema
+
+    def _validate_stream(self, table_schema, row_limit, fail_fast):
+        """
+        Validate the table in one pass over the source.
+        """
+        validator = DerivaCSVValidator(table_schema, fail_fast=fail_fast)
+        with tabulator.Stream(self.source, headers=1, **self._stream_options) as stream:
+            if validator.check_headers([self.map_name(i) for i in stream.headers]):
+                for row_number, _, row in itertools.islice(stream.iter(extended=True), row_limit):
+                    validator.check_row(row_number, row)
+                    if validator.done:
+                        break
+        report = validator.report(source=self.source)
+        self.validation_report = report
+        return report['valid'], report
+
     def table_schema_from_catalog(self, catalog, skip_system_columns=True, outfile=None):
         """
         Create a TableSchema by querying an ERMRest catalog and converting the model format.
@@ -424,9 +1284,8 @@ class DerivaCSV(Table):
         :return: table schema representation of the model
         """
 
-        with DerivaModel(catalog) as m:
-            schema = m.schema_model(catalog[self.schema_name])
-            table = schema.tables[self.map_name(self.table_name)]
+        with DerivaModel(catalog):
+            table = catalog[self.schema_name][self.map_name(self.table_name)].table
             fields = []
             primary_key = None
 
@@ -453,7 +1312,7 @@ class DerivaCSV(Table):
                 # Now see if column is unique.  For this to be true, it must be in the list of keys for the table, and
                 #  the unique column list must be a singleton.
 
-                if [col.name] in [i.unique_columns for i in table.keys]:
+                if [col.name] in [[c.name for c in i.unique_columns] for i in table.keys]:
                     field['constraints']['unique'] = True
 
                 if not col.nullok:
@@ -462,9 +1321,10 @@ class DerivaCSV(Table):
 
             # Now look for a key column that is not the RID
             for i in table.keys:
-                if i.unique_columns == ['RID']:
+                key_columns = [c.name for c in i.unique_columns]
+                if key_columns == ['RID']:
                     continue
-                primary_key = i.unique_columns
+                primary_key = key_columns
                 break
 
             try:
@@ -480,13 +1340,25 @@ class DerivaCSV(Table):
                 raise exception
             return catalog_schema
 
-    def upload_to_deriva(self, catalog, upload_id=None, chunk_size=10000):
+    def upload_to_deriva(self, catalog, upload_id=None, chunk_size=10000, sort_run_size=100000, parallel=1,
+                         checkpoint=None, pipeline=False, validator=None):
         """
-        Upload the source table to deriva.
+        Upload the source table to deriva.  The file is streamed, so memory use depends on chunk_size and
+        sort_run_size, not on the size of the file.
 
         :param catalog
         :param upload_id
         :param chunk_size: Number of rows to upload at one time.
+        :param sort_run_size: Number of rows to sort in memory before spilling to a temporary file when ordering the
+                              rows by key.
+        :param parallel: Number of chunks to upload at the same time.  Only used with a checkpoint, or if the table has
+                         no key, as otherwise a restart relies on the chunks being committed in order.
+        :param checkpoint: File used to record which chunks have been committed.  With a checkpoint, rows are
+                           uploaded in file order and a restart begins at the first chunk that was not committed. The
+                           file is removed once the upload completes.
+        :param pipeline: Read and convert the file in a separate thread from the one doing the upload.
+        :param validator: DerivaCSVValidator used to check each row as it is read.  The upload stops before sending
+                          a chunk that contains an invalid row.
         :return:
         """
 
@@ -500,14 +1372,11 @@ class DerivaCSV(Table):
 
         field_types = [i.type for i in catalog_schema.fields]
 
-        # Find the next available upload id.
-        if upload_id is None and self.row_number_as_key:
-            upload_id = 0
-            e = list(target_table.entities().fetch(limit=1, sort=[target_table.column_definitions['Upload_Id'].desc]))
-            if len(e) == 1:
-                upload_id = e[0]['Upload_Id'] + 1
-            logger.info('New upload id: %s', upload_id)
-            sys.stdout.flush()
+        upload_id, checkpoint = self._start_upload(target_table, upload_id, chunk_size, checkpoint, validator)
+
+        convert_row = _row_converter(field_types, row_number_as_key=self.row_number_as_key, upload_id=upload_id)
+        if validator is not None:
+            convert_row = self._validated(convert_row, validator)
 
         def to_json(extended_rows):
             """
@@ -517,81 +1386,182 @@ class DerivaCSV(Table):
             """
 
             for row_number, headers, row in extended_rows:
-                # Add system columns to deal with row number as primary key.
-                if self.row_number_as_key:
-                    # Need to correct row number to take header into account...
-                    row = [upload_id, row_number - 1] + row
-                for idx, (v, t) in enumerate(zip(row, field_types)):
-                    if t in ['boolean', 'integer', 'number', 'date'] and v == '':
-                        row[idx] = None
-                    else:
-                        if t == 'boolean':
-                            row[idx] = True if row[idx] == 'true' else False
-                        if t == 'integer':
-                            row[idx] = int(v)
-                        if t == 'number':
-                            row[idx] = float(v)
-                        if 'date' in t and v == '':
-                            row[idx] = None
-                yield (row_number, headers, row)
+                yield row_number, headers, convert_row(row_number, row)
 
+        def checkpoint_chunks(stream):
+            """
+            Read the source in chunks, recording each one in the checkpoint and skipping those already committed.
+            """
+            chunk_number, row_number, offset = checkpoint.resume_point()
+            if not _seekable_csv(stream):
+                for n, chunk in enumerate(_chunks(stream.iter(keyed=True), chunk_size), start=1):
+                    if checkpoint.record(n, chunk):
+                        yield n, chunk
+                return
+
+            if offset is None:
+                chunk_number, row_number, offset = 1, 1, 0
+            else:
+                logger.info('Resuming upload at chunk %s, row %s', chunk_number, row_number)
+            records = _csv_records(self.source, offset, row_number, stream.encoding, stream.dialect)
+            if offset == 0:
+                next(records, None)  # Skip over the header.
+            headers = catalog_schema.headers
+            for group in _chunks(records, chunk_size):
+                chunk = [dict(zip(headers, convert_row(n, row))) for n, _, _, row in group]
+                if checkpoint.record(chunk_number, chunk, row=group[0][0], offset=group[0][1], end=group[-1][2]):
+                    yield chunk_number, chunk
+                chunk_number += 1
+
+        # Rows are read from the file as they are needed, so only a chunk at a time is held in memory.
         with tabulator.Stream(self.source, headers=catalog_schema.headers, post_parse=[to_json],
-                              skip_rows=[1]) as stream:
-            rows = stream.read(keyed=True)
-        row_index = 0
-
-        # Read in the source table and sort based on the primary key value.
-        if catalog_schema.primary_key:
-            #  Sort the rows based on the primary key.
-            rows.sort(key=lambda x: [x[i] for i in catalog_schema.primary_key])
-
-            # determine current position in (partial?) copy
-            # Key can be compound, so we meed to create the column sorting descriptor.
-            filtered=target_table
-            if self.row_number_as_key:
-                logger.debug('setting ID filter %s', upload_id)
-                filtered = target_table.filter(target_table.Upload_Id == upload_id)
-
-            sort = [target_table.column_definitions[i].desc for i in catalog_schema.primary_key]
-            logger.debug('Sort %s', sort)
-            e = list(filtered.entities().fetch(limit=1, sort=sort))
-            logging.debug('number of entities to upload %s %s', len(e), e)
-            logging.debug('number of entities to upload %s %s', len(e), e)
-            logging.debug('target_uri %s', target_table.uri)
-            if len(e) == 1:
-                # Part of this table has already been uploaded, so we want to find out how far we got and start from
-                # there
-                max_value = [e[0][i] for i in catalog_schema.primary_key]
-                # Now convert this to an location in the table
-                row_index = next(i for i, v in enumerate(rows)
-                                 if [v[i] for i in catalog_schema.primary_key] == max_value) + 1
-                if row_index == len(rows):
-                    logger.info('Previous upload completed')
-                else:
-                    logger.info('Resuming upload at row count %s', row_index)
-        else:
-            # We don't have a key, or the key is composite, so in this case we just have to hope for the best....
-            chunk_size = len(rows)
-        chunk_cnt = 1
-        row_count = 0
-        while True:
-            # Get chunk from rows from rows[last:last+page_size] ....
-            chunk = rows[row_index:row_index + chunk_size]
-            if not chunk == []:
-                start_time = time.time()
-                target_table.insert(chunk, add_system_defaults=True)
-                stop_time = time.time()
-                logger.info('Completed chunk {} size {} in {:.1f} sec.'.format(chunk_cnt, chunk_size, stop_time - start_time))
-                sys.stdout.flush()
-                chunk_cnt += 1
-                row_index += len(chunk)
-                row_count += len(chunk)
+                              skip_rows=[1], **self._stream_options) as stream:
+            if checkpoint is not None:
+                # The checkpoint tells us where to restart, so the rows can be uploaded in the order they are in.
+                chunks = checkpoint_chunks(stream)
+            elif catalog_schema.primary_key:
+                # Upload the source table in order of the primary key value so that we can tell where to restart.
+                if parallel > 1:
+                    # Restarting after the largest key in the catalog is only safe if chunks are committed in key
+                    # order, which parallel uploads don't guarantee.
+                    logger.warning('Uploading one chunk at a time: parallel uploads need a checkpoint')
+                    parallel = 1
+
+                def key(x):
+                    return [x[i] for i in catalog_schema.primary_key]
+
+                # Sort the rows based on the primary key, spilling to disk if the table is large.
+                rows = _external_sort(stream.iter(keyed=True), key, run_size=max(chunk_size, sort_run_size))
+
+                # determine current position in (partial?) copy
+                # Key can be compound, so we meed to create the column sorting descriptor.
+                filtered = target_table
+                if self.row_number_as_key:
+                    logger.debug('setting ID filter %s', upload_id)
+                    filtered = target_table.filter(target_table.Upload_Id == upload_id)
+
+                sort = [target_table.column_definitions[i].desc for i in catalog_schema.primary_key]
+                logger.debug('Sort %s', sort)
+                e = list(filtered.entities().fetch(limit=1, sort=sort))
+                logging.debug('number of entities to upload %s %s', len(e), e)
+                logging.debug('target_uri %s', target_table.uri)
+                if len(e) == 1:
+                    # Part of this table has already been uploaded, so skip over the rows up to the largest key
+                    # that is already in the catalog.
+                    max_value = [e[0][i] for i in catalog_schema.primary_key]
+                    logger.info('Resuming upload after key %s', max_value)
+                    rows = itertools.dropwhile(lambda x: key(x) <= max_value, rows)
+                chunks = enumerate(_chunks(rows, chunk_size), start=1)
             else:
-                break
+                # Without a key or a checkpoint there is no way to tell where a failed upload stopped, so we just have
+                # to hope for the best....
+                chunks = enumerate(_chunks(stream.iter(keyed=True), chunk_size), start=1)
 
+            if pipeline:
+                chunks = _prefetch(chunks, 2 * parallel)
+
+            # A chunk may have committed without the checkpoint recording it, so when resuming, skip rows that are
+            # already there.
+            on_conflict_skip = bool(checkpoint and checkpoint.resumed and catalog_schema.primary_key)
+            try:
+                row_count = self._insert_chunks(catalog, target_table, chunks, chunk_size, parallel, checkpoint,
+                                                on_conflict_skip)
+            except tabulator.exceptions.SourceError as e:
+                # tabulator wraps errors raised while rows are being converted.
+                if isinstance(e.__context__, DerivaCSVError):
+                    raise e.__context__
+                raise
+
+        if checkpoint is not None:
+            checkpoint.finish()
+        if row_count == 0:
+            logger.info('Previous upload completed')
         return row_count, upload_id
 
-    def convert_to_deriva(self, outfile=None, schemafile=None):
+    def _start_upload(self, target_table, upload_id, chunk_size, checkpoint, validator):
+        """
+        Set up the upload id and checkpoint for an upload, and check the headers if we are validating.
+        :return: upload id and DerivaUploadCheckpoint or None
+        """
+        if checkpoint is not None:
+            checkpoint = DerivaUploadCheckpoint(checkpoint, chunk_size, upload_id=upload_id, source=self.source)
+            upload_id = checkpoint.upload_id
+
+        # Find the next available upload id.
+        if upload_id is None and self.row_number_as_key:
+            upload_id = 0
+            e = list(target_table.entities().fetch(limit=1, sort=[target_table.column_definitions['Upload_Id'].desc]))
+            if len(e) == 1:
+                upload_id = e[0]['Upload_Id'] + 1
+            logger.info('New upload id: %s', upload_id)
+            sys.stdout.flush()
+        if checkpoint is not None:
+            checkpoint.upload_id = upload_id
+            checkpoint.save()
+
+        if validator is not None:
+            if not validator.check_headers([self.map_name(i) for i in self.headers]):
+                self.validation_report = validator.report(source=self.source)
+                raise DerivaCSVError(msg='Headers do not match table {}'.format(self.table_name))
+        return upload_id, checkpoint
+
+    def _validated(self, convert_row, validator):
+        """
+        Wrap a row converter so that each row is checked by validator before it is converted.
+        """
+
+        def validate_row(row_number, row):
+            if not validator.check_row(row_number, row):
+                self.validation_report = validator.report(source=self.source)
+                raise DerivaCSVError(msg='Invalid row {}: {}'.format(row_number, validator.errors[-1]['message']))
+            return convert_row(row_number, row)
+
+        return validate_row
+
+    @staticmethod
+    def _insert_chunks(catalog, target_table, chunks, chunk_size, parallel, checkpoint, on_conflict_skip):
+        """
+        Insert numbered chunks of rows into the target table, up to parallel chunks at the same time.
+        :return: Number of rows inserted.
+        """
+
+        def insert(chunk_number, chunk):
+            start_time = time.time()
+            try:
+                target_table.insert(chunk, add_system_defaults=True, on_conflict_skip=on_conflict_skip)
+            except HTTPError as e:
+                raise DerivaUploadError(chunk_size, chunk_number, e)
+            if checkpoint is not None:
+                checkpoint.commit(chunk_number)
+            stop_time = time.time()
+            logger.info('Completed chunk {} size {} in {:.1f} sec.'.format(chunk_number, len(chunk),
+                                                                           stop_time - start_time))
+            sys.stdout.flush()
+            return len(chunk)
+
+        if parallel <= 1:
+            return sum(insert(n, chunk) for n, chunk in chunks)
+
+        _resize_connection_pool(catalog.ermrest_catalog, parallel)
+        row_count = 0
+        pending = set()
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            try:
+                for n, chunk in chunks:
+                    # Only read ahead a few chunks so that memory stays bounded by the chunk size.
+                    if len(pending) >= 2 * parallel:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        row_count += sum(f.result() for f in done)
+                    pending.add(executor.submit(insert, n, chunk))
+                row_count += sum(f.result() for f in wait(pending).done)
+            except Exception:
+                # Let chunks that are already being sent finish, so the checkpoint is accurate.
+                for f in pending:
+                    f.cancel()
+                raise
+        return row_count
+
+    def convert_to_deriva(self, outfile=None, schemafile=None, infer_workers=1):
         """
         Read in a table, try to figure out the type of its columns and output a deriva-py program that can be used
         to create the table in a catalog.
@@ -599,6 +1569,7 @@ class DerivaCSV(Table):
         :param outfile: Where to put the deriva_py program. If None, put in same directory as the input file with
                         the same name as the table.
         :param schemafile: If true, dump tableschema output.
+        :param infer_workers: Number of processes to use for type inference.
         :return: dictionary that has the column name mapping derived by this routine.
         """
 
@@ -609,14 +1580,13 @@ class DerivaCSV(Table):
 
         # If not provided the name of a schema file, then infer the schema and save to a file if True.
         if schemafile is True or schemafile is None or schemafile is False:
-            self.infer()
+            self.infer(workers=infer_workers)
         if schemafile is True:
             self.schema.save(outname + '.json')
 
         deriva_model = DerivaCSVModel(self)
 
-        stringer = DerivaCatalogToString(
-            DerivaCatalog("host", ermrest_catalog=deriva_model.catalog), groups={})
+        stringer = DerivaCatalogToString(deriva_model.catalog, groups={})
         table_string = stringer.table_to_str(self.schema_name, self.table_name)
 
         if schemafile is True:
@@ -629,10 +1599,12 @@ class DerivaCSV(Table):
         return deriva_model.field_name_map, deriva_model.type_map
 
     def create_validate_upload_csv(self, catalog, convert=True, validate=False, create=False, upload=False,
-                                   upload_id=None, derivafile=None, schemafile=None, chunk_size=10000):
+                                   upload_id=None, derivafile=None, schemafile=None, chunk_size=10000, parallel=1,
+                                   checkpoint=None, infer_workers=1, validate_engine='goodtables', fail_fast=False,
+                                   pipeline=False):
         """
 
-        :param catalog: Ermrest catalog to be used for operations.
+        :param catalog: DerivaCatalog to be used for operations.
         :param convert: If true, use table inference to infer types for columns of table and create a deriva-py program
         :param derivafile: Specify the file name of where the deriva-py program to create the table exists
         :param schemafile: File that contains tableschema. May be input or output depending on other arguments
@@ -642,6 +1614,13 @@ class DerivaCSV(Table):
         :param upload: If true, upload file to deriva catalog.
         :param upload_id: ID of upload to continue.
         :param chunk_size: Number of rows to upload at one time.
+        :param parallel: Number of chunks to upload at the same time.
+        :param checkpoint: File used to record the progress of the upload.
+        :param infer_workers: Number of processes to use for type inference.
+        :param validate_engine: 'goodtables' or 'stream'
+        :param fail_fast: Stop validation at the first error.
+        :param pipeline: When validating and uploading, read the file once and validate rows as they are uploaded,
+                         rather than reading it for each step.
         :return:
         """
         tdir = tempfile.mkdtemp()
@@ -655,7 +1634,7 @@ class DerivaCSV(Table):
         if convert:  # Generate deriva-py file to create table if convert option is specified.
             logger.info('Converting table spec to deriva-py....')
             sys.stdout.flush()
-            self.convert_to_deriva(outfile=derivafile, schemafile=schemafile)
+            self.convert_to_deriva(outfile=derivafile, schemafile=schemafile, infer_workers=infer_workers)
 
         if create:
             logger.info('Creating table definition {}:{}'.format(self.schema_name, self.table_name))
@@ -664,12 +1643,17 @@ class DerivaCSV(Table):
             if derivafile is None:
                 derivafile = '{}/{}.py'.format(tdir, self.table_name)
             tablescript = load_module_from_path(derivafile)
-            # Now create the table.
-            tablescript.main(catalog, 'table')
-
-        if validate:
+            # Now create the table and pick up the new definition.
+            tablescript.main(catalog.ermrest_catalog, 'table')
+            catalog.refresh(incremental=True)
+
+        validator = None
+        if validate and upload and pipeline:
+            # Rows are checked as they are read for the upload.
+            validator = DerivaCSVValidator(self._file_schema(self.table_schema_from_catalog(catalog)))
+        elif validate:
             try:
-                valid, report = self.validate(catalog)
+                valid, report = self.validate(catalog, engine=validate_engine, fail_fast=fail_fast)
                 if not valid:
                     for i in report['tables'][0]['errors']:
                         print(i)
@@ -680,7 +1664,8 @@ class DerivaCSV(Table):
         if upload:
             logger.info('Loading table data {}:{}'.format(self.schema_name, self.table_name))
             sys.stdout.flush()
-            row_cnt = self.upload_to_deriva(catalog, chunk_size=chunk_size, upload_id=upload_id)
+            row_cnt = self.upload_to_deriva(catalog, chunk_size=chunk_size, upload_id=upload_id, parallel=parallel,
+                                            checkpoint=checkpoint, pipeline=pipeline, validator=validator)
 
             return row_cnt
 
@@ -711,6 +1696,235 @@ class DerivaCSV(Table):
         return mname
 
 
+def _arrow_field_type(arrow_type):
+    """
+    Map an Arrow type to a tableschema type and format, used to check values, and the deriva type of the column.  The
+    deriva type is picked from the Arrow type directly, as going through the tableschema type would lose the width
+    of integers and floats and whether timestamps have a time zone.
+    :return: tableschema type, tableschema format, deriva type
+    """
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(arrow_type):
+        return _arrow_field_type(arrow_type.value_type)
+    if pa.types.is_boolean(arrow_type):
+        return 'boolean', 'default', 'boolean'
+    if pa.types.is_int8(arrow_type) or pa.types.is_int16(arrow_type) or pa.types.is_uint8(arrow_type):
+        return 'integer', 'default', 'int2'
+    if pa.types.is_int32(arrow_type) or pa.types.is_uint16(arrow_type):
+        return 'integer', 'default', 'int4'
+    if pa.types.is_uint64(arrow_type):
+        # Values may not fit in an int8 and deriva-py has no numeric type, so don't guess.
+        raise DerivaCSVError(msg='Unsupported Arrow type: {}, cast the column to int64 or float64'.format(arrow_type))
+    if pa.types.is_integer(arrow_type):
+        return 'integer', 'default', 'int8'
+    if pa.types.is_float16(arrow_type) or pa.types.is_float32(arrow_type):
+        return 'number', 'default', 'float4'
+    if pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        return 'number', 'default', 'float8'
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return 'string', 'default', 'text'
+    if pa.types.is_date(arrow_type):
+        return 'date', 'default', 'date'
+    if pa.types.is_timestamp(arrow_type):
+        return 'datetime', 'default', 'timestamptz' if arrow_type.tz is not None else 'timestamp'
+    if pa.types.is_time(arrow_type):
+        # deriva-py has no time type, so times are kept in the text form they are uploaded in.
+        return 'time', 'default', 'text'
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+        _, _, value_type = _arrow_field_type(arrow_type.value_type)
+        array_type = value_type + '[]'
+        return 'array', 'default', array_type if array_type in em.builtin_types else 'jsonb'
+    if pa.types.is_struct(arrow_type) or pa.types.is_map(arrow_type):
+        return 'object', 'default', 'jsonb'
+    raise DerivaCSVError(msg='Unsupported Arrow type: {}'.format(arrow_type))
+
+
+def _arrow_json_type(arrow_type):
+    """
+    Find the Arrow type whose python values can be sent to ermrest as JSON for an Arrow type.
+    """
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(arrow_type):
+        return _arrow_json_type(arrow_type.value_type)
+    if pa.types.is_date(arrow_type) or pa.types.is_timestamp(arrow_type) or pa.types.is_time(arrow_type):
+        return pa.string()
+    if pa.types.is_decimal(arrow_type):
+        return pa.float64()
+    if pa.types.is_list(arrow_type):
+        return pa.list_(_arrow_json_type(arrow_type.value_type))
+    if pa.types.is_large_list(arrow_type):
+        return pa.large_list(_arrow_json_type(arrow_type.value_type))
+    return arrow_type
+
+
+def _arrow_json_array(array):
+    """
+    Convert an Arrow array to one whose python values can be sent to ermrest as JSON.
+    """
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    json_type = _arrow_json_type(array.type)
+    return array if json_type == array.type else array.cast(json_type)
+
+
+class DerivaParquet(DerivaCSV):
+    """
+    Table backed by a Parquet file.  Column types come straight from the Arrow schema of the file, so there is no
+    type inference, and rows are uploaded from record batches without any string parsing.
+    """
+
+    def __init__(self, source, schema_name, table_name=None, column_map=True,
+                 key_columns=None, row_number_as_key=False,
+                 schema=None):
+        """
+
+        :param source: Parquet file containing the table data
+        :param schema_name: Name of the Deriva Schema in which this table will be located
+        :param table_name: Name of the table.  If not provided, use the source file name
+        :param column_map: a column name mapping dictionary, as for DerivaCSV
+        :param key_columns: name of columns to use as keys (non-null, unique), as for DerivaCSV
+        :param row_number_as_key: if key column is not provided, use the row number of the file in combination with a
+                            upload ID generated by system to identify the row.
+        :param schema: existing tableschema file to use instead of the Arrow schema
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise DerivaCSVError(msg='Parquet sources need pyarrow. '
+                                     'Install this software package with the [parquet] qualifier.')
+
+        self._parquet_file = pq.ParquetFile(source)
+        if schema is None or schema is True:
+            schema = self._arrow_schema()
+        super(DerivaParquet, self).__init__(source, schema_name, table_name=table_name, column_map=column_map,
+                                            key_columns=key_columns, row_number_as_key=row_number_as_key,
+                                            schema=schema)
+
+    def _arrow_schema(self):
+        """
+        Build a tableschema descriptor from the Arrow schema of the file.
+        """
+        fields = []
+        for field in self._parquet_file.schema_arrow:
+            type_name, type_format, deriva_type = _arrow_field_type(field.type)
+            fields.append({'name': field.name, 'type': type_name, 'format': type_format, 'derivaType': deriva_type,
+                           'constraints': {} if field.nullable else {'required': True}})
+        return {'fields': fields, 'missingValues': ['']}
+
+    def _infer_headers(self):
+        # The schema comes from the file, so there is nothing to read.
+        pass
+
+    @property
+    def headers(self):
+        return self.schema.field_names
+
+    def infer(self, *args, **kwargs):
+        """
+        Types are taken from the Arrow schema, so there is nothing to infer.
+        """
+        self.row_count = self._parquet_file.metadata.num_rows
+        return
+
+    def _file_schema(self, table_schema):
+        """
+        Adjust a schema from the catalog so it can check the rows read from the file.  Rows are checked in the form
+        they are uploaded in, and the text form Arrow gives dates and times is not the pattern of the default format.
+        """
+        table_schema = super(DerivaParquet, self)._file_schema(table_schema)
+        for field in table_schema.descriptor['fields']:
+            if field['type'] in ('date', 'datetime', 'time') and field.get('format', 'default') == 'default':
+                field['format'] = 'any'
+        table_schema.commit()
+        return table_schema
+
+    def _rows(self, batch_size=10000):
+        """
+        Read the rows of the file as lists of the python values that are uploaded.
+        :return: Iterator of (row number, row), with the first row numbered 2 to match a CSV file with a header.
+        """
+        row_number = 2
+        for batch in self._parquet_file.iter_batches(batch_size=batch_size):
+            for row in zip(*[_arrow_json_array(c).to_pylist() for c in batch.columns]):
+                yield row_number, list(row)
+                row_number += 1
+
+    def validate(self, catalog, validation_limit=500000, engine='stream', fail_fast=False):
+        """
+        Validate the contents of the file against an existing table in a catalog.  goodtables can't read Parquet,
+        so the stream engine is always used.
+        """
+        table_schema = self._file_schema(self.table_schema_from_catalog(catalog))
+        validator = DerivaCSVValidator(table_schema, fail_fast=fail_fast)
+        if validator.check_headers([self.map_name(i) for i in self.headers]):
+            for row_number, row in itertools.islice(self._rows(), validation_limit):
+                validator.check_row(row_number, row)
+                if validator.done:
+                    break
+        report = validator.report(source=self.source)
+        self.validation_report = report
+        return report['valid'], report
+
+    def upload_to_deriva(self, catalog, upload_id=None, chunk_size=10000, sort_run_size=None, parallel=1,
+                         checkpoint=None, pipeline=False, validator=None):
+        """
+        Upload the file to deriva one record batch at a time.  Rows are sent in the order they are in the file, so a
+        failed upload can only be resumed if a checkpoint is used.  Arguments are the same as for
+        DerivaCSV.upload_to_deriva.
+        """
+        import pyarrow as pa
+
+        target_table = catalog[self.schema_name][self.table_name].datapath
+        catalog_schema = self.table_schema_from_catalog(catalog)
+
+        # Sanity check columns.
+        names = [self.map_name(i) for i in self.headers]
+        for i in names:
+            if i not in catalog_schema.headers:
+                raise DerivaCSVError(msg="Incompatible column: " + i)
+
+        upload_id, checkpoint = self._start_upload(target_table, upload_id, chunk_size, checkpoint, validator)
+        if self.row_number_as_key:
+            names = ['Upload_Id', 'Row_Number'] + names
+
+        def batches():
+            row_number = 1
+            for n, batch in enumerate(self._parquet_file.iter_batches(batch_size=chunk_size), start=1):
+                if checkpoint is not None and n in checkpoint.committed:
+                    row_number += batch.num_rows
+                    continue
+                columns = [_arrow_json_array(c) for c in batch.columns]
+                if validator is not None:
+                    for i, row in enumerate(zip(*[c.to_pylist() for c in columns]), start=row_number + 1):
+                        if not validator.check_row(i, list(row)):
+                            self.validation_report = validator.report(source=self.source)
+                            raise DerivaCSVError(msg='Invalid row {}: {}'.format(i, validator.errors[-1]['message']))
+                if self.row_number_as_key:
+                    columns = [pa.array([upload_id] * batch.num_rows, pa.int64()),
+                               pa.array(range(row_number, row_number + batch.num_rows), pa.int64())] + columns
+                chunk = pa.RecordBatch.from_arrays(columns, names=names).to_pylist()
+                row_number += batch.num_rows
+                if checkpoint is None or checkpoint.record(n, chunk):
+                    yield n, chunk
+
+        chunks = batches()
+        if pipeline:
+            chunks = _prefetch(chunks, 2 * parallel)
+        # As for CSV files, only skip rows that are already there when resuming an upload.
+        on_conflict_skip = bool(checkpoint and checkpoint.resumed and catalog_schema.primary_key)
+        row_count = self._insert_chunks(catalog, target_table, chunks, chunk_size, parallel, checkpoint,
+                                        on_conflict_skip)
+        if checkpoint is not None:
+            checkpoint.finish()
+        if row_count == 0:
+            logger.info('Previous upload completed')
+        return row_count, upload_id
+
+
 class DerivaCSVCLI (BaseCLI):
 
     def __init__(self, description, epilog):
@@ -720,7 +1934,10 @@ class DerivaCSVCLI (BaseCLI):
             return ast.literal_eval(s)
 
         parser = self.parser
-        parser.add_argument('tabledata', help='Location of tablelike data to be added to catalog')
+        parser.add_argument('tabledata', help='Location of tablelike data to be added to catalog. '
+                                              'Files ending in .parquet or .pq are read as Parquet. A directory '
+                                              'or glob of CSV files, which may be .gz or .zst compressed, is '
+                                              'read as a single table')
         parser.add_argument('schema', help='Name of the schema to be used for table')
         parser.add_argument('--catalog', default=1, help='ID number of desired catalog (Default:1)')
         parser.add_argument('--table', default=None, help='Name of table to be managed (Default:tabledata filename)')
@@ -731,7 +1948,7 @@ class DerivaCSVCLI (BaseCLI):
         parser.add_argument('--rownumber-as-key', action='store_true',
                             help='Use the row number in the CSV as a unique key'
                                  'in conjunction with the upload_id')
-        parser.add_argument('--upload-id', default=None, help='Restart the upload')
+        parser.add_argument('--upload-id', default=None, type=int, help='Restart the upload')
         parser.add_argument('--convert', action='store_true',
                             help='Generate a deriva-py program to create the table [Default:True]')
         parser.add_argument('--column-map', default=True, type=python_value,
@@ -751,11 +1968,27 @@ class DerivaCSVCLI (BaseCLI):
                                  'If an argument is provided, then that schema file is used for the table.')
         parser.add_argument('--chunksize', default=10000, type=int,
                             help='Number of rows to use in chunked upload [Default:10000]')
+        parser.add_argument('--infer-workers', default=1, type=int, metavar='N',
+                            help='Number of processes to use when inferring column types (Default:1)')
         parser.add_argument('--validate', action='store_true',
                             help='Validate the table before uploading [Default:False]')
+        parser.add_argument('--validate-engine', default='goodtables', choices=['goodtables', 'stream'],
+                            help='Validate with goodtables, or with a single streaming pass [Default:goodtables]')
+        parser.add_argument('--pipeline', action='store_true',
+                            help='Validate rows as they are uploaded, reading the table only once [Default:False]')
+        parser.add_argument('--fail-fast', action='store_true',
+                            help='Stop streaming validation at the first error [Default:False]')
         parser.add_argument('--create', dest='create_table', action='store_true',
                             help='Automatically create catalog table based on column type inference [Default:False]')
         parser.add_argument('--upload', action='store_true', help='Load data into catalog [Default:False]')
+        parser.add_argument('--parallel', default=1, type=int, metavar='N',
+                            help='Number of chunks to upload at the same time. Tables with a key need '
+                                 '--checkpoint to upload in parallel (Default:1)')
+        parser.add_argument('--checkpoint', default=None, metavar='FILE',
+                            help='File used to record upload progress so it can be resumed. '
+                                 'Removed once the upload completes (Default:None)')
+        parser.add_argument('--model-cache', default=None, metavar='DIR',
+                            help='Directory in which to cache the catalog model between runs')
 
     @staticmethod
     def _get_credential(host_name, token=None):
@@ -773,24 +2006,36 @@ class DerivaCSVCLI (BaseCLI):
             if args.derivafile is None:
                 args.derivafile = None
 
-        credential = self._get_credential(args.server)
+        credential = self._get_credential(args.host, args.token)
 
         try:
-            catalog = ErmrestCatalog('https', args.host, args.catalog_id, credentials=credential)
-
-            table = DerivaCSV(args.tabledata, args.schema_model,
-                              table_name=args.table_model, column_map=args.column_map,
-                              key_columns=args.key_columns, row_number_as_key=args.row_number_as_key,
-                              schema=args.schemafile)
+            catalog = DerivaCatalog(args.host, catalog_id=args.catalog, model_cache=args.model_cache,
+                                    ermrest_catalog=ErmrestCatalog('https', args.host, args.catalog,
+                                                                   credentials=credential))
+
+            table_class = DerivaCSV
+            if os.path.splitext(args.tabledata)[1].lower() in ['.parquet', '.pq']:
+                table_class = DerivaParquet
+            table = table_class(args.tabledata, args.schema,
+                                table_name=args.table, column_map=args.column_map,
+                                key_columns=args.key_columns, row_number_as_key=args.rownumber_as_key,
+                                schema=args.schemafile)
 
             table.create_validate_upload_csv(catalog,
                                              convert=args.convert, validate=args.validate, create=args.create_table,
                                              upload=args.upload, upload_id=args.upload_id,
                                              derivafile=args.derivafile, schemafile=args.schemafile,
-                                             chunk_size=args.chunksize)
+                                             chunk_size=args.chunksize, parallel=args.parallel,
+                                             checkpoint=args.checkpoint, infer_workers=args.infer_workers,
+                                             validate_engine=args.validate_engine, fail_fast=args.fail_fast,
+                                             pipeline=args.pipeline)
         except DerivaCSVError as err:
             sys.stderr.write(str(err.msg))
             return 1
+        except DerivaUploadError as err:
+            sys.stderr.write('Upload failed in chunk {} (chunk size {}): {}'.format(err.chunk_number, err.chunk_size,
+                                                                                   err.reason))
+            return 1
         except HTTPError as err:
             sys.stderr.write(str(err.msg))
             return 1
@@ -28,7 +28,7 @@ def main(catalog, mode, replace=False, really=False):
     updater = CatalogUpdater(catalog)
     table_def['column_annotations'] = column_annotations
     table_def['column_comment'] = column_comment
-    updater.update_table(mode, schema_name, table_def,replace=replace, really=really)
+    updater.update_table(mode, schema_name, table_def, replace=replace, really=really)
 
 
 if __name__ == "__main__":
@@ -60,11 +60,12 @@ schema_name = '{schema_name}'
 {comments}
 
 schema_def = em.Schema.define(
-        '{schema_name}',
-        comment=comment,
-        acls=acls,
-        annotations=annotations,
-    )
+    '{schema_name}',
+    comment=comment,
+    acls=acls,
+    annotations=annotations,
+)
+
 
 def main(catalog, mode, replace=False):
     updater = CatalogUpdater(catalog)
@@ -96,6 +97,7 @@ import deriva.core.ermrest_model as em
 
 {acls}
 
+
 def main(catalog, mode, replace=False):
     updater = CatalogUpdater(catalog)
     updater.update_catalog(mode, annotations, acls, replace=replace)
@@ -3,6 +3,9 @@ from __future__ import print_function
 from urllib.parse import urlparse
 
 import ast
+import functools
+import hashlib
+import json
 import logging
 import os
 import re
@@ -10,6 +13,8 @@ import sys
 import traceback
 import requests
 
+from concurrent.futures import ProcessPoolExecutor
+
 from requests.exceptions import HTTPError
 
 from deriva.core import format_exception
@@ -26,6 +31,7 @@ from deriva.utils.catalog.manage.deriva_file_templates import table_file_templat
 
 from deriva.utils.catalog.version import __version__ as VERSION
 from deriva.utils.catalog.manage.graph_catalog import DerivaCatalogToGraph
+from deriva.utils.catalog.manage.utils import get_catalog_model
 
 IS_PY2 = (sys.version_info[0] == 2)
 IS_PY3 = (sys.version_info[0] == 3)
@@ -46,6 +52,86 @@ yapf_style = {
 }
 
 
+# Ways in which the generated configuration files can be formatted.  yapf gives the best looking code, pretty lays
+# out the generated literals directly and is much faster, and none leaves the generated code as is.
+formatters = ['yapf', 'pretty', 'none']
+
+
+def format_code(s, formatter='yapf'):
+    """
+    Format generated source code for one of the dumped configuration files.
+    :param s: Source code to format
+    :param formatter: One of yapf, pretty or none.
+    :return: formatted source code
+    """
+    if formatter == 'yapf':
+        return FormatCode(s, style_config=yapf_style)[0]
+    elif formatter == 'pretty':
+        # Literals have already been laid out as they were generated, so all that is left is the whitespace.
+        s = re.sub(r'[ \t]+$', '', s.strip('\n'), flags=re.MULTILINE)
+        return re.sub(r'\n{4,}', '\n\n\n', s) + '\n'
+    elif formatter == 'none':
+        return s
+    raise ValueError('Unknown formatter {}'.format(formatter))
+
+
+def _pretty_literal(value, indent=0, column=0, width=yapf_style['column_limit']):
+    """
+    Lay out a python literal in the same style as yapf.  The literal is put on one line if it fits, otherwise each
+    element of a list, tuple or dictionary is put on its own line.
+    :param value: Value to print
+    :param indent: Indentation of the line on which the literal starts
+    :param column: Column at which the literal starts
+    :param width: Maximum line length
+    :return: string
+    """
+    s = repr(value)
+    if column + len(s) <= width or not value or not isinstance(value, (dict, list, tuple)):
+        return s
+    inner = indent + 4
+    if isinstance(value, dict):
+        items = []
+        for k, v in value.items():
+            key = '{!r}: '.format(k)
+            items.append(key + _pretty_literal(v, inner, inner + len(key), width))
+        brackets = '{}'
+    else:
+        items = [_pretty_literal(v, inner, inner, width) for v in value]
+        brackets = '[]' if isinstance(value, list) else '()'
+        if isinstance(value, tuple) and len(value) == 1:
+            items[0] += ','
+    return '{}\n{}{}\n{}{}'.format(brackets[0], ' ' * inner, (',\n' + ' ' * inner).join(items), ' ' * indent,
+                                    brackets[1])
+
+
+def _pretty_call(func, args, indent=0, width=yapf_style['column_limit']):
+    """
+    Lay out a function call in the same style as yapf.  The call is put on one line if it fits, otherwise each of the
+    arguments is put on its own line.
+    :param func: Name of the function
+    :param args: List of argument strings, which have been laid out for an indentation of indent + 4
+    :param indent: Indentation of the line on which the call starts
+    :param width: Maximum line length
+    :return: string
+    """
+    s = '{}({})'.format(func, ', '.join(args))
+    if indent + len(s) < width and '\n' not in s:
+        return s
+    inner = ' ' * (indent + 4)
+    return '{}(\n{}{}\n{})'.format(func, inner, (',\n' + inner).join(args), ' ' * indent)
+
+
+def _file_digest(filename):
+    """
+    Return the sha256 digest of the contents of a file, or None if the file cannot be read.
+    """
+    try:
+        with open(filename, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
 class DerivaDumpCatalogException (Exception):
     """Base exception class for DerivaDumpCatalog.
     """
@@ -65,12 +151,16 @@ class UsageException (DerivaDumpCatalogException):
 
 
 class DerivaCatalogToString:
-    def __init__(self, catalog, provide_system_columns=True, groups=None):
-        self._model = catalog.getCatalogModel()
+    def __init__(self, catalog, provide_system_columns=True, groups=None, model_cache=None, formatter='yapf'):
+        if formatter not in formatters:
+            raise UsageException('Unknown formatter {}: must be one of {}'.format(formatter, formatters))
+        self._model = get_catalog_model(catalog, model_cache)
         self.host = urlparse(catalog.get_server_uri()).hostname
         self.catalog_id = self._model.catalog.catalog_id
 
         self._provide_system_columns = provide_system_columns
+        self._formatter = formatter
+        self._pretty = formatter == 'pretty'
         # Get the currently known groups for this catalog.
         self._groups = groups
         if groups is None:
@@ -86,24 +176,43 @@ class DerivaCatalogToString:
         self._variables = self._groups.copy()
         self._variables.update(chaise_tags)
 
+        # Map each variable value onto its replacement and the group it refers to, if any, and build a single pattern
+        # that matches any of the quoted values so that code can be substituted in one pass.
+        self._substitutions = {}
+        self._group_order = {k: i for i, k in enumerate(self._groups)}
+        for k, v in self._variables.items():
+            if k in chaise_tags:
+                repl, group = 'chaise_tags.{}'.format(k), None
+            elif k in self._groups:
+                repl, group = 'groups[{!r}]'.format(k), k
+            else:
+                repl, group = k, None
+            self._substitutions.setdefault(v, (repl, group))
+        values = sorted(self._substitutions, key=len, reverse=True)
+        self._variable_pattern = re.compile(r"(['\"])+({})\1".format('|'.join(re.escape(v) for v in values))) \
+            if values else None
+
     def substitute_variables(self, code):
         """
         Factor out code and replace with a variable name.
         :param code:
         :return: new code
         """
-        for k, v in self._variables.items():
-            varsub = r"(['\"])+{}\1".format(v)
-            if k in chaise_tags:
-                repl = 'chaise_tags.{}'.format(k)
-            elif k in self._groups:
-                repl = 'groups[{!r}]'.format(k)
-                if v in code:
-                    self._referenced_groups[k] = v
-            else:
-                repl = k
-            code = re.sub(varsub, repl, code)
+        if self._variable_pattern is None:
+            return code
+
+        referenced = set()
+
+        def substitute(match):
+            repl, group = self._substitutions[match.group(2)]
+            if group is not None:
+                referenced.add(group)
+            return repl
 
+        code = self._variable_pattern.sub(substitute, code)
+        # Keep the referenced groups in the same order as the known groups so the generated groups are stable.
+        for k in sorted(referenced, key=self._group_order.get):
+            self._referenced_groups[k] = self._groups[k]
         return code
 
     def variable_to_str(self, name, value, substitute=True):
@@ -115,7 +224,7 @@ class DerivaCatalogToString:
         :return:
         """
 
-        s = '{} = {!r}\n'.format(name, value)
+        s = '{} = {}\n'.format(name, _pretty_literal(value, column=len(name) + 3) if self._pretty else repr(value))
         if substitute:
             s = self.substitute_variables(s)
         return s
@@ -146,6 +255,15 @@ class DerivaCatalogToString:
         var_map = {v: k for k, v in self._variables.items()}
         if annotations == {}:
             s = '{} = {{}}\n'.format(var_name)
+        elif self._pretty:
+            entries = []
+            for t, v in annotations.items():
+                if t in var_map:
+                    entries.append(self.substitute_variables('{!r}: {}'.format(t, var_map[t])))
+                else:
+                    key = '{!r}: '.format(t)
+                    entries.append(key + _pretty_literal(v, indent=4, column=4 + len(key)))
+            s = '{} = {{\n    {}\n}}\n'.format(var_name, ',\n    '.join(entries))
         else:
             s = '{} = {{'.format(var_name)
             for t, v in annotations.items():
@@ -158,6 +276,14 @@ class DerivaCatalogToString:
         return s
 
     def schema_to_str(self, schema_name):
+        return format_code(self.schema_source(schema_name), self._formatter)
+
+    def schema_source(self, schema_name):
+        """
+        Generate the unformatted source code for a schema configuration file.
+        :param schema_name:
+        :return: source code
+        """
         schema = self._model.schemas[schema_name]
 
         annotations = self.variable_to_str('annotations', schema.annotations)
@@ -169,10 +295,16 @@ class DerivaCatalogToString:
                                         annotations=annotations, acls=acls, comments=comments, groups=groups,
                                         table_names='table_names = [\n{}]\n'.format(
                                             str.join('', ['{!r},\n'.format(i) for i in schema.tables])))
-        s = FormatCode(s, style_config=yapf_style)[0]
         return s
 
     def catalog_to_str(self):
+        return format_code(self.catalog_source(), self._formatter)
+
+    def catalog_source(self):
+        """
+        Generate the unformatted source code for the catalog configuration file.
+        :return: source code
+        """
 
         tag_variables = self.tag_variables_to_str(self._model.annotations)
         annotations = self.annotations_to_str(self._model.annotations)
@@ -183,7 +315,6 @@ class DerivaCatalogToString:
                                          tag_variables=tag_variables,
                                          annotations=annotations,
                                          acls=acls)
-        s = FormatCode(s, style_config=yapf_style)[0]
         return s
 
     def table_annotations_to_str(self, table):
@@ -217,7 +348,48 @@ class DerivaCatalogToString:
         s += self.variable_to_str('column_acl_bindings', column_acl_bindings) + '\n'
         return s
 
+    def _pretty_defs_to_str(self, var_name, func, defs, substitute=True):
+        """
+        Lay out a list of definitions, each of which is a call to func.
+        :param var_name: Name of the variable to assign the list to
+        :param func: Name of the function that is called to create each definition
+        :param defs: List with the arguments of each call
+        :param substitute: If true, replace the group and tag values with their corresponding names
+        :return:
+        """
+        if defs:
+            s = '{} = [\n{}]'.format(var_name, ''.join('    {},\n'.format(_pretty_call(func, args, indent=4))
+                                                       for args in defs))
+        else:
+            s = '{} = []'.format(var_name)
+        return self.substitute_variables(s) if substitute else s
+
+    @staticmethod
+    def _pretty_kwargs(obj, names, strings):
+        """
+        Return the keyword arguments for the non-default values of the named attributes of obj.
+        """
+        args = []
+        for i in names:
+            a = getattr(obj, i)
+            if not (a == {} or a is None or a == 'NO ACTION' or a == ''):
+                v = repr(a) if i in strings else _pretty_literal(a, indent=8, column=9 + len(i))
+                args.append('{}={}'.format(i, v))
+        return args
+
     def foreign_key_defs_to_str(self, table):
+        if self._pretty:
+            return self._pretty_defs_to_str('fkey_defs', 'em.ForeignKey.define', [
+                [repr([c.name for c in fkey.foreign_key_columns]),
+                 "'{}'".format(fkey.pk_table.schema.name),
+                 "'{}'".format(fkey.pk_table.name),
+                 repr([c.name for c in fkey.referenced_columns]),
+                 'constraint_names={!r}'.format(fkey.names)] +
+                self._pretty_kwargs(fkey, ['annotations', 'acls', 'acl_bindings', 'on_update', 'on_delete', 'comment'],
+                                    ['comment', 'on_update', 'on_delete'])
+                for fkey in table.foreign_keys
+            ])
+
         s = 'fkey_defs = [\n'
         for fkey in table.foreign_keys:
             s += """    em.ForeignKey.define({},
@@ -231,7 +403,7 @@ class DerivaCatalogToString:
             for i in ['annotations', 'acls', 'acl_bindings', 'on_update', 'on_delete', 'comment']:
                 a = getattr(fkey, i)
                 if not (a == {} or a is None or a == 'NO ACTION' or a == ''):
-                    v = "'" + a + "'" if re.match('comment|on_update|on_delete', i) else a
+                    v = repr(a) if re.match('comment|on_update|on_delete', i) else a
                     s += "        {}={},\n".format(i, v)
             s += '    ),\n'
 
@@ -240,6 +412,14 @@ class DerivaCatalogToString:
         return s
 
     def key_defs_to_str(self, table):
+        if self._pretty:
+            return self._pretty_defs_to_str('key_defs', 'em.Key.define', [
+                [repr([c.name for c in key.unique_columns]),
+                 'constraint_names={!r}'.format(key.names if key.name else [])] +
+                self._pretty_kwargs(key, ['annotations', 'comment'], ['comment'])
+                for key in table.keys
+            ])
+
         s = 'key_defs = [\n'
         for key in table.keys:
             s += """    em.Key.define({},
@@ -248,7 +428,7 @@ class DerivaCatalogToString:
             for i in ['annotations', 'comment']:
                 a = getattr(key, i)
                 if not (a == {} or a is None or a == ''):
-                    v = "'" + a + "'" if i == 'comment' else a
+                    v = repr(a) if i == 'comment' else a
                     s += "       {} = {},\n".format(i, v)
             s += '),\n'
         s += ']'
@@ -258,6 +438,21 @@ class DerivaCatalogToString:
     def column_defs_to_str(self, table):
         system_columns = ['RID', 'RCB', 'RMB', 'RCT', 'RMT']
 
+        if self._pretty:
+            defs = []
+            for col in table.column_definitions:
+                if col.name in system_columns and self._provide_system_columns:
+                    continue
+                args = ["'{}'".format(col.name), "em.builtin_types['{}']".format(col.type.typename)]
+                if col.nullok is False:
+                    args.append('nullok=False')
+                if col.default and col.name not in system_columns:
+                    args.append('default={!r}'.format(col.default))
+                args.extend("{}=column_{}['{}']".format(i, i, col.name)
+                            for i in ['annotations', 'acls', 'acl_bindings', 'comment'] if getattr(col, i))
+                defs.append(args)
+            return self._pretty_defs_to_str('column_defs', 'em.Column.define', defs, substitute=False)
+
         s = ['column_defs = [']
         for col in table.column_definitions:
             if col.name in system_columns and self._provide_system_columns:
@@ -277,6 +472,13 @@ class DerivaCatalogToString:
         return ''.join(s)
 
     def table_def_to_str(self):
+        if self._pretty:
+            return 'table_def = ' + _pretty_call('em.Table.define', [
+                'table_name', 'column_defs=column_defs', 'key_defs=key_defs', 'fkey_defs=fkey_defs',
+                'annotations=table_annotations', 'acls=table_acls', 'acl_bindings=table_acl_bindings',
+                'comment=table_comment', 'provide_system={}'.format(self._provide_system_columns)
+            ])
+
         s = """table_def = em.Table.define(table_name,
         column_defs=column_defs,
         key_defs=key_defs,
@@ -290,6 +492,16 @@ class DerivaCatalogToString:
         return s
 
     def table_to_str(self, schema_name, table_name):
+        return format_code(self.table_source(schema_name, table_name), self._formatter)
+
+    def table_source(self, schema_name, table_name):
+        """
+        Generate the unformatted source code for a table configuration file.  The groups referenced by the table are
+        added to the groups that are written out for tables generated after this one.
+        :param schema_name:
+        :param table_name:
+        :return: source code
+        """
         logger.debug('%s %s %s', schema_name, table_name, [i for i in self._model.schemas])
         table = self._model.schemas[schema_name].tables[table_name]
 
@@ -309,11 +521,12 @@ class DerivaCatalogToString:
                                        key_defs=key_defs,
                                        fkey_defs=fkey_defs,
                                        table_def=table_def)
-        s = FormatCode(s, style_config=yapf_style)[0]
         return s
 
 
 class DerivaDumpCatalogCLI (BaseCLI):
+    # Name of the file in the dump directory that records the hashes of the generated files.
+    manifest_file = '.dump-manifest.json'
 
     def __init__(self, description, epilog):
         super(DerivaDumpCatalogCLI, self).__init__(description, epilog, VERSION, hostname_required=True)
@@ -330,6 +543,10 @@ class DerivaDumpCatalogCLI (BaseCLI):
         self.catalog_id = 1
         self.graph_format = None
         self.catalog = None
+        self.model_cache = None
+        self.jobs = 1
+        self.force = False
+        self.formatter = 'yapf'
 
         # parent arg parser
         parser = self.parser
@@ -344,6 +561,15 @@ class DerivaDumpCatalogCLI (BaseCLI):
         group.add_argument('--graph', action='store_true', help='Dump graph of catalog')
         parser.add_argument('--graph-format', choices=['pdf', 'dot', 'png', 'svg'],
                             default='pdf', help='Format to use for graph dump')
+        parser.add_argument('--model-cache', default=None, metavar='DIR',
+                            help='Directory in which to cache the catalog model between runs')
+        parser.add_argument('--jobs', '-j', default=1, type=int, metavar='N',
+                            help='Number of processes used to format the generated files')
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate all files, even if the catalog model has not changed since the last dump')
+        parser.add_argument('--formatter', choices=formatters, default='yapf',
+                            help='How to format the generated files: yapf gives the best looking code, pretty is much '
+                                 'faster, and none leaves the generated code unformatted')
 
     @staticmethod
     def _get_credential(host_name, token=None):
@@ -352,36 +578,79 @@ class DerivaDumpCatalogCLI (BaseCLI):
         else:
             return get_credential(host_name)
 
+    @staticmethod
+    def _write_file(filename, s):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, 'wb') as f:
+            f.write(s.encode("utf-8"))
+
     def _dump_table(self, schema_name, table_name, stringer=None, dumpdir='.'):
         logger.info("Dumping out  table def: {}:{}".format(schema_name,table_name))
         if not stringer:
-            stringer = DerivaCatalogToString(self.catalog)
+            stringer = DerivaCatalogToString(self.catalog, model_cache=self.model_cache, formatter=self.formatter)
 
         table_string = stringer.table_to_str(schema_name, table_name)
-        filename= dumpdir + '/' + table_name + '.py'
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'wb') as f:
-            f.write(table_string.encode("utf-8"))
+        self._write_file(dumpdir + '/' + table_name + '.py', table_string)
 
     def _dump_catalog(self):
-        stringer = DerivaCatalogToString(self.catalog)
-        catalog_string = stringer.catalog_to_str()
+        stringer = DerivaCatalogToString(self.catalog, model_cache=self.model_cache, formatter=self.formatter)
 
-        with open('{}/{}_{}.py'.format(self.dumpdir, self.host, self.catalog_id), 'wb') as f:
-            f.write(catalog_string.encode("utf-8"))
+        # The source for each file is generated in order, as the groups referenced by one file are carried into the
+        # ones that follow.  Formatting the source is independent for each file, so that is done by the worker pool.
+        files = [('{}/{}_{}.py'.format(self.dumpdir, self.host, self.catalog_id), stringer.catalog_source())]
 
         for schema_name in self.schemas:
             logger.info("Dumping schema def for {}....".format(schema_name))
-            schema_string = stringer.schema_to_str(schema_name)
-
-            with open('{}/{}.schema.py'.format(self.dumpdir, schema_name), 'wb') as f:
-                f.write(schema_string.encode("utf-8"))
+            files.append(('{}/{}.schema.py'.format(self.dumpdir, schema_name), stringer.schema_source(schema_name)))
 
         for schema_name, schema in self.model.schemas.items():
             if schema_name in self.schemas:
                 for table_name in schema.tables:
-                    self._dump_table(schema_name, table_name, stringer=stringer,
-                                     dumpdir='{}/{}'.format(self.dumpdir, schema_name))
+                    logger.info("Dumping out  table def: {}:{}".format(schema_name, table_name))
+                    files.append(('{}/{}/{}.py'.format(self.dumpdir, schema_name, table_name),
+                                  stringer.table_source(schema_name, table_name)))
+
+        # Only format and write the files whose generated source has changed since the last dump, or which have been
+        # changed or removed on disk.
+        manifest = {} if self.force else self._read_manifest()
+        pending = []
+        for filename, source in files:
+            key = os.path.relpath(filename, self.dumpdir)
+            digest = hashlib.sha256('{}\n{}'.format(self.formatter, source).encode('utf-8')).hexdigest()
+            entry = manifest.get(key, {})
+            if entry.get('source') == digest and entry.get('output') == _file_digest(filename):
+                continue
+            pending.append((filename, key, digest, source))
+
+        sources = [source for _, _, _, source in pending]
+        formatter = functools.partial(format_code, formatter=self.formatter)
+        if self.jobs > 1 and len(pending) > 1 and self.formatter == 'yapf':
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                chunksize = max(1, len(pending) // (4 * self.jobs))
+                formatted = list(executor.map(formatter, sources, chunksize=chunksize))
+        else:
+            formatted = [formatter(source) for source in sources]
+
+        for (filename, key, digest, _), s in zip(pending, formatted):
+            self._write_file(filename, s)
+            manifest[key] = {'source': digest, 'output': hashlib.sha256(s.encode('utf-8')).hexdigest()}
+            print('Updated {}'.format(key))
+        self._write_manifest(manifest)
+        print('{} of {} files updated'.format(len(pending), len(files)))
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.dumpdir, self.manifest_file)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest):
+        filename = os.path.join(self.dumpdir, self.manifest_file)
+        tmpfile = '{}.{}.tmp'.format(filename, os.getpid())
+        with open(tmpfile, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmpfile, filename)
 
     def _graph_catalog(self):
         graph = DerivaCatalogToGraph(self.catalog)
@@ -398,13 +667,17 @@ class DerivaDumpCatalogCLI (BaseCLI):
         self.host = args.host
         self.catalog_id = args.catalog
         self.graph_format = args.graph_format
+        self.model_cache = args.model_cache
+        self.jobs = args.jobs
+        self.force = args.force
+        self.formatter = args.formatter
 
         if self.host is None:
             eprint('Host name must be provided')
             return 1
 
         self.catalog = ErmrestCatalog('https', self.host, self.catalog_id, credentials=self._get_credential(self.host))
-        self.model = self.catalog.getCatalogModel()
+        self.model = get_catalog_model(self.catalog, self.model_cache)
 
         self.schemas = [s for s in (args.schemas if args.schemas else self.model.schemas)
                         if s not in args.skip_schemas
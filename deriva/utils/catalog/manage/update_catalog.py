@@ -1,11 +1,18 @@
 import argparse
 import logging
+import os
+import sys
 from requests.exceptions import HTTPError
 
 from deriva.core import get_credential, AttrDict, ErmrestCatalog
+from deriva.utils.catalog.manage.utils import load_module_from_path
 
 logger = logging.getLogger(__name__)
 
+# Modes for applying many configuration files at once.  all creates any missing schemas and tables and then updates
+# the annotations, acls and comments of everything.
+bulk_modes = ['all', 'schema', 'table', 'annotations', 'acls', 'comment', 'keys', 'fkeys', 'columns']
+
 
 def parse_args(server, catalog_id, is_table=False, is_catalog=False):
     parser = argparse.ArgumentParser(description='Update catalog configuration')
@@ -38,9 +45,26 @@ class CatalogUpdaterException(Exception):
 
 
 class CatalogUpdater:
-    def __init__(self, catalog):
+    def __init__(self, catalog, model=None, defer_apply=False):
+        """
+        :param catalog: ErmrestCatalog to update
+        :param model: Model of the catalog.  If None, the model is retrieved from the catalog.
+        :param defer_apply: If true, changes to annotations, acls and comments are only made to the local copy of the
+            model, and are sent to the catalog when apply is called.
+        """
         self._catalog = catalog
-        self._model = self._catalog.getCatalogModel()
+        self._model = self._catalog.getCatalogModel() if model is None else model
+        self._defer_apply = defer_apply
+
+    def apply(self):
+        """
+        Send any changes to annotations, acls and comments in the model to the catalog.
+        """
+        self._model.apply()
+
+    def _apply(self):
+        if not self._defer_apply:
+            self._model.apply()
 
     @staticmethod
     def update_annotations(o, annotations, merge=False):
@@ -69,7 +93,7 @@ class CatalogUpdater:
             self.update_annotations(self._model, annotations, merge=merge)
         elif mode == 'acls':
             self.update_acls(self._model, acls, merge=merge)
-        self._model.apply()
+        self._apply()
 
     def update_schema(self, mode, schema_def, replace=False, merge=False, really=False):
         schema_name = schema_def['schema_name']
@@ -96,7 +120,7 @@ class CatalogUpdater:
                 self.update_acls(schema, acls, merge=merge)
             elif mode == 'comment':
                 schema.comment = comment
-        self._model.apply()
+        self._apply()
         return schema
 
     def update_table(self, mode, schema_name, table_def, replace=False, merge=False, really=False):
@@ -212,4 +236,148 @@ class CatalogUpdater:
                     self.update_acls(c, column_acls[c.name], merge=merge)
                 if c.name in column_acl_bindings:
                     self.update_acl_bindings(c, column_acl_bindings[c.name], merge=merge)
-        self._model.apply()
+        self._apply()
+
+    def create_tables(self, table_defs, replace=False, really=False):
+        """
+        Create a set of tables, ordered so that a table is created after the tables that its foreign keys refer to.
+        Foreign keys that are part of a cycle are added once all of the tables have been created.
+        :param table_defs: List of (schema_name, table_def) pairs
+        :param replace: Drop any existing table before creating it.
+        :param really: Don't ask for confirmation before dropping a table.
+        :return: List of the new tables.
+        """
+        def referenced_table(fkey_def):
+            column = fkey_def['referenced_columns'][0]
+            return column['schema_name'], column['table_name']
+
+        defs = {(schema_name, table_def['table_name']): table_def for schema_name, table_def in table_defs}
+        depends = {k: {referenced_table(fk) for fk in table_def['foreign_keys']} & set(defs) - {k}
+                   for k, table_def in defs.items()}
+
+        created, deferred, tables = set(), [], []
+        pending = list(defs)
+        while pending:
+            # Take the first table whose referenced tables all exist, or if there is a cycle, the first table.
+            key = next((k for k in pending if depends[k] <= created), pending[0])
+            pending.remove(key)
+            table_def = defs[key]
+            later = [fk for fk in table_def['foreign_keys'] if referenced_table(fk) in depends[key] - created]
+            if later:
+                table_def = dict(table_def, foreign_keys=[fk for fk in table_def['foreign_keys'] if fk not in later])
+                deferred.append((key, later))
+            tables.append(self.update_table('table', key[0], table_def, replace=replace, really=really))
+            created.add(key)
+
+        for (schema_name, table_name), fkey_defs in deferred:
+            table = self._model.schemas[schema_name].tables[table_name]
+            for i in fkey_defs:
+                logger.info('Creating foreign key %s', i['names'])
+                table.create_fkey(i)
+        return tables
+
+
+def _config_files(paths):
+    """
+    Expand a list of configuration files and directories into a list of the python files they contain.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+                files.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith('.py'))
+        else:
+            files.append(path)
+    return files
+
+
+def _table_def(mod):
+    # Same as the main function in a table configuration file.
+    return dict(mod.table_def, column_annotations=mod.column_annotations, column_comment=mod.column_comment)
+
+
+def update_catalog_configs(catalog, mode, paths, replace=False, really=False):
+    """
+    Apply configuration files produced by deriva-catalog-dump to a catalog.  The files are all loaded into this process
+    and share a single CatalogUpdater, so the catalog model is retrieved once, and the changes to annotations, acls
+    and comments are sent to the catalog in one pass rather than once per file.
+
+    :param catalog: ErmrestCatalog to update
+    :param mode: One of bulk_modes.  all creates any schema or table that doesn't exist, and then updates the
+        annotations, acls and comments of the catalog, schemas and tables.  Any other mode does the same as running each
+        of the files with that mode, skipping files that don't have it.
+    :param paths: List of configuration files, or directories containing them.
+    :param replace: Replace existing values with new ones.
+    :param really: Don't ask for confirmation before dropping a schema or table.
+    :return: CatalogUpdater
+    """
+    if mode not in bulk_modes:
+        raise CatalogUpdaterException(msg="Unknown mode {}".format(mode))
+
+    catalogs, schemas, tables = [], [], {}
+    for filename in _config_files(paths):
+        mod = load_module_from_path(filename)
+        if hasattr(mod, 'table_def'):
+            tables[(mod.schema_name, mod.table_def['table_name'])] = mod
+        elif hasattr(mod, 'schema_def'):
+            schemas.append(mod)
+        elif hasattr(mod, 'annotations') and hasattr(mod, 'acls'):
+            catalogs.append(mod)
+        else:
+            logger.warning('Skipping %s: not a catalog configuration file', filename)
+    logger.info('Loaded %d catalog, %d schema and %d table configurations', len(catalogs), len(schemas), len(tables))
+
+    updater = CatalogUpdater(catalog, defer_apply=True)
+    model = updater._model
+    # all only creates schemas and tables that are missing, so there is never anything to drop first.
+    create_replace = replace and mode != 'all'
+
+    if mode in ['all', 'schema']:
+        for m in schemas:
+            if mode == 'schema' or m.schema_def['schema_name'] not in model.schemas:
+                updater.update_schema('schema', m.schema_def, replace=create_replace, really=really)
+
+    if mode in ['all', 'table']:
+        updater.create_tables([(schema_name, _table_def(m)) for (schema_name, table_name), m in tables.items()
+                               if mode == 'table' or schema_name not in model.schemas
+                               or table_name not in model.schemas[schema_name].tables],
+                              replace=create_replace, really=really)
+
+    for m_mode in ['annotations', 'acls', 'comment'] if mode == 'all' else [mode]:
+        if m_mode in ['annotations', 'acls']:
+            for m in catalogs:
+                updater.update_catalog(m_mode, m.annotations, m.acls, replace=replace)
+        if m_mode in ['annotations', 'acls', 'comment']:
+            for m in schemas:
+                updater.update_schema(m_mode, m.schema_def, replace=replace, really=really)
+        if m_mode in ['annotations', 'acls', 'comment', 'keys', 'fkeys', 'columns']:
+            for (schema_name, table_name), m in tables.items():
+                updater.update_table(m_mode, schema_name, _table_def(m), replace=replace, really=really)
+
+    updater.apply()
+    return updater
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply many catalog configuration files in a single pass')
+    parser.add_argument('--host', required=True, help='Catalog host name')
+    parser.add_argument('--catalog', default=1, help='ID of desired catalog')
+    parser.add_argument('--replace', action='store_true',
+                        help='Replace existing values with new ones.  Otherwise, attempt to merge in values provided.')
+    parser.add_argument('--really', action='store_true',
+                        help='Don\'t ask for confirmation before dropping a schema or table with --replace.')
+    parser.add_argument('mode', choices=bulk_modes,
+                        help='Model elements to be updated.  all creates any missing schemas and tables, and then '
+                             'updates annotations, acls and comments.')
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help='Configuration files produced by deriva-catalog-dump, or directories containing them')
+    args = parser.parse_args()
+
+    catalog = ErmrestCatalog('https', args.host, catalog_id=args.catalog, credentials=get_credential(args.host))
+    update_catalog_configs(catalog, args.mode, args.paths, replace=args.replace, really=args.really)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,27 @@
 import os
+import re
+import copy
 import sys
+import json
+import glob
 import random
 import datetime
 import string
 import importlib
+import importlib.util
+import hashlib
+import itertools
+import logging
+from urllib.parse import urlparse
 
 from deriva.core.ermrest_catalog import ErmrestCatalog
 import deriva.core.ermrest_model as em
 from deriva.core.deriva_server import DerivaServer
 
+logger = logging.getLogger(__name__)
+
+_module_ids = itertools.count()
+
 
 def load_module_from_path(file):
     """
@@ -30,23 +43,104 @@ def load_module_from_path(file):
             except ValueError:
                 pass
 
-    moddir, file = os.path.split(os.path.abspath(file))
+    path = os.path.abspath(file)
+    moddir, file = os.path.split(path)
     modname = os.path.splitext(file)[0]
     importlib.invalidate_caches()
-    # If we have already loaded this module reload it otherwise import.
-    with AddPath(moddir):
-        try:
-            mod = importlib.reload(sys.modules[modname])
-        except KeyError:
-            mod = importlib.import_module(modname)
+    # Always load the module from this path, as configuration files in different directories can have the same name,
+    # and schema files such as Schema.schema.py cannot be imported by name. The module is given a name of its own, so
+    # that a table called time or json doesn't hide the standard library module of the same name.  It is only in
+    # sys.modules while it runs, which things such as dataclasses need, so loading many files doesn't leak modules.
+    modname = '_deriva_config_{}_{}'.format(next(_module_ids), re.sub(r'\W', '_', modname))
+    spec = importlib.util.spec_from_file_location(modname, path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[modname] = mod
+    try:
+        with AddPath(moddir):
+            spec.loader.exec_module(mod)
+    finally:
+        sys.modules.pop(modname, None)
     return mod
 
 
+def catalog_snaptime(catalog):
+    """
+    Get the identifier of the current snapshot of a catalog.  This is a cheap request that can be used to tell if the
+    catalog has changed.
+
+    :param catalog: ErmrestCatalog
+    :return: snapshot id, or None if the catalog does not provide one.
+    """
+    try:
+        return catalog.get('/').json()['snaptime']
+    except Exception:
+        return None
+
+
+def client_identity(catalog):
+    """
+    Get the identity of the client that a catalog binding is authenticated as.
+
+    :param catalog: ErmrestCatalog
+    :return: client id, or 'anonymous' if there is no authenticated session.
+    """
+    try:
+        return catalog.get_authn_session().json()['client']['id']
+    except Exception:
+        return 'anonymous'
+
+
+def get_catalog_model(catalog, cache_dir=None, snaptime=None):
+    """
+    Get the model for a catalog.  If cache_dir is provided, the model document is cached in that directory keyed by
+    host, catalog id, client identity and snapshot id, so that the full model only has to be downloaded when the
+    catalog has changed since the last call.  The model returned by the server depends on the ACLs of the client, so
+    each client identity gets its own cache entry.
+
+    :param catalog: ErmrestCatalog
+    :param cache_dir: Directory in which to keep cached model documents. If None, don't use a cache.
+    :param snaptime: Current snapshot of the catalog if already known.
+    :return: ermrest_model Model for the catalog.
+    """
+    if cache_dir is None:
+        return catalog.getCatalogModel()
+
+    if snaptime is None:
+        snaptime = catalog_snaptime(catalog)
+    if snaptime is None:
+        return catalog.getCatalogModel()
+
+    client = hashlib.sha256(client_identity(catalog).encode('utf-8')).hexdigest()[:16]
+    prefix = re.sub(r'[^\w.-]', '_', '{}_{}_{}'.format(urlparse(catalog.get_server_uri()).hostname,
+                                                      catalog.catalog_id, client))
+    filename = os.path.join(cache_dir, '{}@{}.json'.format(prefix, re.sub(r'[^\w.-]', '_', snaptime)))
+
+    try:
+        with open(filename) as f:
+            model_doc = json.load(f)
+        logger.debug('Using cached model %s', filename)
+    except (OSError, ValueError):
+        model_doc = catalog.get('/schema').json()
+        os.makedirs(cache_dir, exist_ok=True)
+        # Only keep the latest snapshot for a catalog.
+        for old in glob.glob(os.path.join(glob.escape(cache_dir), glob.escape(prefix) + '@*.json')):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        # Write to a temporary file first so that concurrent readers never see a partial document.
+        tmpfile = '{}.{}.tmp'.format(filename, os.getpid())
+        with open(tmpfile, 'w') as f:
+            json.dump(model_doc, f)
+        os.replace(tmpfile, filename)
+    return em.Model(catalog, model_doc)
+
+
 class LoopbackModel(em.Model):
-    def __init__(self, arg):
-        super().__init__(arg)
+    def __init__(self, arg, catalog=None):
+        super().__init__(catalog, arg)
 
-    def apply(self,_):
+    def apply(self, existing=None):
         pass
 
 
@@ -72,6 +166,7 @@ class LoopbackCatalog:
         self._model = model
         if self._model is None:
             self._model = LoopbackModel({})
+        self._model._catalog = self
 
     def get_server_uri(self):
         return 'http://{}/ermrest/{}'.format(self._server, self._catalog_id)
@@ -91,7 +186,7 @@ class LoopbackCatalog:
             return LoopbackCatalog.LoopbackResult(uri, json=self._model.schemas)
 
     def put(self, uri, json=None, data=None):
-        pass
+        return LoopbackCatalog.LoopbackResult(uri, json=copy.deepcopy(json))
 
     def delete(self, uri):
         pass
@@ -0,0 +1,80 @@
+"""
+Compare the rate at which rows from a CSV file are converted to python values in DerivaCSV.upload_to_deriva, using the
+original per-cell type tests and the converter table from _row_converter.
+
+    python -m extra_tests.deriva.utils.catalog.manage.benchmark_row_conversion [row_count]
+"""
+import random
+import string
+import sys
+import time
+
+from deriva.utils.catalog.manage.deriva_csv import _row_converter
+
+
+def reference_convert(field_types, row_number_as_key, upload_id, row_number, row):
+    # The conversion that was done inline in upload_to_deriva.
+    if row_number_as_key:
+        row = [upload_id, row_number - 1] + row
+    for idx, (v, t) in enumerate(zip(row, field_types)):
+        if t in ['boolean', 'integer', 'number', 'date'] and v == '':
+            row[idx] = None
+        else:
+            if t == 'boolean':
+                row[idx] = True if row[idx] == 'true' else False
+            if t == 'integer':
+                row[idx] = int(v)
+            if t == 'number':
+                row[idx] = float(v)
+            if 'date' in t and v == '':
+                row[idx] = None
+    return row
+
+
+def generate_rows(field_types, row_count, missing_value=.2):
+    def value(t):
+        if random.random() < missing_value:
+            return ''
+        if t == 'boolean':
+            return random.choice(['true', 'false'])
+        if t == 'integer':
+            return str(random.randrange(-1000, 1000))
+        if t == 'number':
+            return str(random.uniform(-1000, 1000))
+        if t == 'datetime':
+            return '2020-01-{:02d}'.format(random.randrange(1, 29))
+        return ''.join(random.sample(string.ascii_letters, 5))
+
+    return [[value(t) for t in field_types] for _ in range(row_count)]
+
+
+def rate(convert, rows):
+    rows = [list(r) for r in rows]
+    start = time.perf_counter()
+    for row_number, row in enumerate(rows, start=2):
+        convert(row_number, row)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main(row_count=200000):
+    random.seed(0)
+    column_types = ['integer', 'boolean', 'number', 'datetime', 'string'] * 4
+    rows = generate_rows(column_types, row_count)
+
+    for row_number_as_key in [False, True]:
+        field_types = (['integer', 'integer'] if row_number_as_key else []) + column_types
+        converter = _row_converter(field_types, row_number_as_key=row_number_as_key, upload_id=1)
+
+        def reference(row_number, row):
+            return reference_convert(field_types, row_number_as_key, 1, row_number, row)
+
+        for row_number, row in enumerate(rows[:1000], start=2):
+            assert reference(row_number, list(row)) == converter(row_number, list(row))
+
+        before, after = rate(reference, rows), rate(converter, rows)
+        print('row_number_as_key={}: {:,.0f} rows/sec before, {:,.0f} rows/sec after ({:.1f}x)'.format(
+            row_number_as_key, before, after, after / before))
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(i) for i in sys.argv[1:]]))
@@ -44,6 +44,7 @@ setup(
     entry_points={
         'console_scripts': [
             'deriva-catalog-dump = deriva.utils.catalog.manage.dump_catalog:main',
+            'deriva-catalog-update = deriva.utils.catalog.manage.update_catalog:main',
             'deriva-catalog-config = deriva.utils.catalog.components.deriva_catalog:main',
             'deriva-csv = deriva.utils.catalog.manage.deriva_csv:main [csv]'
         ],
@@ -58,7 +59,12 @@ setup(
     extras_require={
         'csv': ['goodtables',
                 'python-dateutil',
-                'simpleeval']
+                'simpleeval'],
+        'parquet': ['goodtables',
+                    'python-dateutil',
+                    'simpleeval',
+                    'pyarrow'],
+        'zstd': ['zstandard']
     },
     license='Apache 2.0',
     classifiers=[
@@ -0,0 +1,129 @@
+from unittest import TestCase
+from types import SimpleNamespace
+import logging
+
+import deriva.core.ermrest_model as em
+from deriva.utils.catalog.components.deriva_model import *
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+logger = logging.getLogger(__name__)
+
+schema_name = 'TestSchema'
+
+# Minimal in-memory stand-ins for the datapath objects used to copy rows.
+
+
+class PathColumn:
+    def __init__(self, name):
+        self.name = name
+
+    @property
+    def desc(self):
+        return self, 'desc'
+
+    def __gt__(self, value):
+        return lambda row: row[self.name] > value
+
+
+class PathQuery:
+    def __init__(self, table, rows):
+        self.table = table
+        self.rows = rows
+
+    def sort(self, column):
+        column, order = (column, 'asc') if isinstance(column, PathColumn) else column
+        rows = sorted(self.rows, key=lambda r: r[column.name], reverse=order == 'desc')
+        return PathQuery(self.table, rows)
+
+    def fetch(self, limit=None):
+        self.table.fetches.append(limit)
+        return [dict(r) for r in self.rows[:limit]]
+
+
+class PathTable:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.inserts = []
+        self.fetches = []
+        self.predicate = None
+
+    def __getattr__(self, name):
+        return PathColumn(name)
+
+    def filter(self, predicate):
+        path = PathTable(self.rows)
+        path.fetches = self.fetches
+        path.predicate = predicate
+        return path
+
+    def attributes(self, *columns, **renamed):
+        rows = [r for r in self.rows if self.predicate is None or self.predicate(r)]
+        if renamed:
+            rows = [{k: r[c.name] for k, c in renamed.items()} for r in rows]
+        else:
+            rows = [{c.name: r[c.name] for c in columns} for r in rows]
+        return PathQuery(self, rows)
+
+    def insert(self, rows, **kwargs):
+        self.inserts.append((len(rows), kwargs))
+        self.rows.extend(rows)
+
+
+class PathBuilder:
+    def __init__(self, tables):
+        self.schemas = {schema_name: SimpleNamespace(tables=tables)}
+
+
+class ColumnMap(dict):
+    def get_columns(self):
+        return {'Title': SimpleNamespace(fill=None), 'Extra': SimpleNamespace(fill='filled')}
+
+
+class CopyErmrestCatalog(StubErmrestCatalog):
+    def __init__(self, tables, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tables = tables
+
+    def getPathBuilder(self):
+        return PathBuilder(self.tables)
+
+
+class TestCopyRows(TestCase):
+    def setUp(self):
+        # RIDs are out of order in the source table, so that the copy has to sort them.
+        self.source = PathTable([{'RID': 'R{:03d}'.format((i * 7) % 25), 'ID': (i * 7) % 25, 'Name': 'n', 'Parent': 0}
+                                 for i in range(25)])
+        self.target = PathTable()
+        model_doc = stub_model_doc(schema_name)
+        model_doc['schemas'][schema_name]['tables']['Table1']['column_definitions'].insert(
+            0, em.Column.define('RID', em.builtin_types['ermrest_rid'], nullok=False))
+        ermrest_catalog = CopyErmrestCatalog({'Table1': self.source, 'Copy': self.target}, model_doc)
+        self.catalog = DerivaCatalog('host.local', ermrest_catalog=ermrest_catalog)
+        self.table = self.catalog[schema_name]['Table1']
+        self.column_map = ColumnMap(Name=SimpleNamespace(name='Title'))
+
+    def test_pages(self):
+        count = self.table._copy_rows(self.target, self.column_map, page_size=10)
+        self.assertEqual(count, 25)
+        self.assertEqual([n for n, _ in self.target.inserts], [10, 10, 5])
+        self.assertEqual(self.source.fetches, [10, 10, 10])
+        self.assertEqual([r['ID'] for r in self.target.rows], list(range(25)))
+        self.assertEqual(self.target.rows[0], {'RID': 'R000', 'ID': 0, 'Title': 'n', 'Parent': 0, 'Extra': 'filled'})
+
+    def test_exact_pages(self):
+        count = self.table._copy_rows(self.target, self.column_map, page_size=5)
+        self.assertEqual(count, 25)
+        # The last page is full, so one more read is needed to find the end of the table.
+        self.assertEqual(self.source.fetches, [5] * 6)
+
+    def test_resume(self):
+        self.target.rows = [{'RID': 'R{:03d}'.format(i), 'ID': i} for i in range(12)]
+        count = self.table._copy_rows(self.target, self.column_map, clone=True, resume=True, page_size=10)
+        self.assertEqual(count, 13)
+        self.assertEqual(self.target.inserts, [(10, {'nondefaults': {'RID', 'RCT', 'RCB'}}),
+                                               (3, {'nondefaults': {'RID', 'RCT', 'RCB'}})])
+        self.assertEqual([r['ID'] for r in self.target.rows], list(range(25)))
+
+    def test_resume_needs_clone(self):
+        with self.assertRaises(DerivaTableError):
+            self.table.copy_table(schema_name, 'Copy', resume=True)
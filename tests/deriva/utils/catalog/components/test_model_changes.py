@@ -0,0 +1,181 @@
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+
+from deriva.utils.catalog.components.deriva_model import *
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+logger = logging.getLogger(__name__)
+
+schema_name = 'TestSchema'
+
+
+class TestModelChanges(TestCase):
+    def setUp(self):
+        self.ermrest_catalog = StubErmrestCatalog(stub_model_doc(schema_name))
+        self.catalog = DerivaCatalog('host.local', ermrest_catalog=self.ermrest_catalog)
+        self.table = self.catalog[schema_name]['Table1']
+
+    def test_only_changed_elements_are_sent(self):
+        with DerivaModel(self.catalog):
+            self.table.annotations[chaise_tags.display] = {'name': 'Renamed'}
+            self.catalog[schema_name]['Table2'].comment = 'A comment'
+        self.assertEqual(
+            sorted(self.ermrest_catalog.puts),
+            [('/schema/TestSchema/table/Table1', {'annotations': {chaise_tags.display: {'name': 'Renamed'}}}),
+             ('/schema/TestSchema/table/Table2', {'comment': 'A comment'})]
+        )
+        self.assertEqual(self.catalog.nesting, 0)
+
+    def test_unchanged_value_is_not_sent(self):
+        with DerivaModel(self.catalog):
+            self.table.annotations[chaise_tags.display] = {'name': 'Table1'}
+        self.ermrest_catalog.puts.clear()
+        with DerivaModel(self.catalog):
+            self.table.annotations[chaise_tags.display] = {'name': 'Table1'}
+        self.assertEqual(self.ermrest_catalog.puts, [])
+
+    def test_reads_are_not_tracked(self):
+        with DerivaModel(self.catalog):
+            self.table.annotations[chaise_tags.display] = {'name': 'Table1'}
+            self.table.acls['select'] = ['*']
+        self.ermrest_catalog.puts.clear()
+        with DerivaModel(self.catalog):
+            self.assertEqual(self.table.annotations[chaise_tags.display], {'name': 'Table1'})
+            self.assertEqual(self.table.acls['select'], ['*'])
+            self.assertEqual(self.catalog._changes, {})
+        self.assertEqual(self.ermrest_catalog.puts, [])
+
+    def test_acls(self):
+        with DerivaModel(self.catalog):
+            self.table.acls['select'] = ['*']
+        self.assertEqual(self.ermrest_catalog.puts, [('/schema/TestSchema/table/Table1', {'acls': {'select': ['*']}})])
+        self.ermrest_catalog.puts.clear()
+        with DerivaModel(self.catalog):
+            del self.table.acls['select']
+        self.assertEqual(self.ermrest_catalog.puts, [('/schema/TestSchema/table/Table1', {'acls': {}})])
+
+    def test_in_place_visible_source_update(self):
+        with DerivaModel(self.catalog):
+            self.table.annotations[chaise_tags.visible_columns] = {'compact': ['ID']}
+        self.ermrest_catalog.puts.clear()
+        with DerivaModel(self.catalog):
+            self.table.visible_columns['detailed'] = ['ID', 'Name']
+        self.assertEqual(
+            self.ermrest_catalog.puts,
+            [('/schema/TestSchema/table/Table1',
+              {'annotations': {chaise_tags.visible_columns: {'compact': ['ID'], 'detailed': ['ID', 'Name']}}})]
+        )
+
+    def test_direct_model_changes_need_full_apply(self):
+        self.catalog.model_instance.schemas[schema_name].tables['Table2'].comment = 'Changed directly'
+        self.catalog.apply()
+        self.assertEqual(self.ermrest_catalog.puts, [])
+        self.catalog.apply(full=True)
+        self.assertIn(('/schema/TestSchema/table/Table2', {'comment': 'Changed directly'}), self.ermrest_catalog.puts)
+
+
+class SlowErmrestCatalog(StubErmrestCatalog):
+    def put(self, uri, json=None, data=None, **kwargs):
+        time.sleep(0.01)
+        return super().put(uri, json=json, data=data, **kwargs)
+
+
+class TestConcurrentModelAccess(TestCase):
+    def test_threads_share_catalog(self):
+        table_count = 8
+        ermrest_catalog = SlowErmrestCatalog(stub_model_doc(schema_name, table_count))
+        catalog = DerivaCatalog('host.local', ermrest_catalog=ermrest_catalog, max_apply_workers=4)
+        table_names = ['Table{}'.format(i) for i in range(table_count)]
+
+        def update(table_name):
+            seen = []
+            for i in range(5):
+                table = catalog[schema_name][table_name]
+                with DerivaModel(catalog):
+                    table.annotations[chaise_tags.display] = {'name': '{} {}'.format(table_name, i)}
+                    table.comment = 'Version {}'.format(i)
+                for name in table_names:
+                    other = catalog[schema_name][name]
+                    seen.append((other, other.columns['ID'], other.columns['Name']))
+            return seen
+
+        with ThreadPoolExecutor(max_workers=table_count) as executor:
+            results = list(executor.map(update, table_names))
+
+        self.assertEqual(catalog.nesting, 0)
+        self.assertEqual(catalog._changes, {})
+        # Every thread got the same wrapper objects.
+        for table, id_column, name_column in [i for r in results for i in r]:
+            self.assertIs(table, catalog[schema_name][table.name])
+            self.assertIs(id_column, table.columns['ID'])
+            self.assertIs(name_column, table.columns['Name'])
+        # The last update of each table was sent to the server.
+        final = {}
+        for uri, body in ermrest_catalog.puts:
+            final.setdefault(uri, {}).update(body)
+        for name in table_names:
+            self.assertEqual(final['/schema/TestSchema/table/{}'.format(name)],
+                             {'annotations': {chaise_tags.display: {'name': '{} 4'.format(name)}},
+                              'comment': 'Version 4'})
+
+
+class CountingErmrestCatalog(StubErmrestCatalog):
+    """
+    Records how many updates are in flight at the same time, and returns a server side value for comments.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.counter_lock = threading.Lock()
+
+    def put(self, uri, json=None, data=None, **kwargs):
+        with self.counter_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        result = super().put(uri, json=json, data=data, **kwargs)
+        if 'comment' in result.json():
+            result.json()['comment'] += ' (saved)'
+        with self.counter_lock:
+            self.in_flight -= 1
+        return result
+
+
+class TestConcurrentApply(TestCase):
+    def update(self, max_apply_workers):
+        table_count = 6
+        ermrest_catalog = CountingErmrestCatalog(stub_model_doc(schema_name, table_count))
+        catalog = DerivaCatalog('host.local', ermrest_catalog=ermrest_catalog, max_apply_workers=max_apply_workers)
+        with DerivaModel(catalog):
+            catalog.annotations[chaise_tags.catalog_config] = {'name': 'Test'}
+            catalog[schema_name].comment = 'Schema'
+            for i in range(table_count):
+                table = catalog[schema_name]['Table{}'.format(i)]
+                table.columns['Name'].comment = 'Column'
+                table.comment = 'Table'
+        return catalog, ermrest_catalog
+
+    def test_levels_are_applied_in_order(self):
+        catalog, ermrest_catalog = self.update(4)
+        uris = [uri for uri, _ in ermrest_catalog.puts]
+        self.assertEqual(len(uris), 14)
+        self.assertEqual(uris[:2], ['/annotation', '/schema/TestSchema'])
+        self.assertTrue(all('/column/' not in uri for uri in uris[2:8]))
+        self.assertTrue(all('/column/' in uri for uri in uris[8:]))
+        self.assertTrue(1 < ermrest_catalog.max_in_flight <= 4)
+
+        # Values returned by the server end up in the model.
+        table = catalog[schema_name]['Table3']
+        self.assertEqual(table.comment, 'Table (saved)')
+        self.assertEqual(table.columns['Name'].comment, 'Column (saved)')
+        self.assertEqual(catalog[schema_name].comment, 'Schema (saved)')
+
+    def test_serial(self):
+        catalog, ermrest_catalog = self.update(1)
+        self.assertEqual(len(ermrest_catalog.puts), 14)
+        self.assertEqual(ermrest_catalog.max_in_flight, 1)
+        self.assertEqual(catalog[schema_name]['Table3'].comment, 'Table (saved)')
@@ -0,0 +1,89 @@
+from unittest import TestCase
+import logging
+
+from deriva.utils.catalog.components.deriva_model import *
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+logger = logging.getLogger(__name__)
+
+schema_name = 'TestSchema'
+
+
+class TestLazyModelMap(TestCase):
+    def setUp(self):
+        self.catalog = DerivaCatalog('host.local', ermrest_catalog=StubErmrestCatalog(stub_model_doc(schema_name)))
+        self.model = self.catalog.model_instance
+
+    def test_nothing_is_mapped_up_front(self):
+        self.assertEqual(len(self.catalog.model_map), 0)
+        self.assertEqual(list(self.catalog.schemas), list(self.model.schemas))
+        self.assertIn(schema_name, self.catalog)
+        self.assertEqual(len(self.catalog.model_map), 0)
+
+    def test_elements_are_mapped_when_used(self):
+        schema = self.catalog[schema_name]
+        self.assertEqual(list(self.catalog.model_map), [self.model.schemas[schema_name]])
+        self.assertEqual(list(schema.tables), ['Table0', 'Table1', 'Table2'])
+
+        table = schema['Table1']
+        ermrest_table = self.model.schemas[schema_name].tables['Table1']
+        self.assertIsInstance(table, DerivaTable)
+        self.assertIs(table.table, ermrest_table)
+        self.assertIn(ermrest_table, self.catalog.model_map)
+        self.assertNotIn(self.model.schemas[schema_name].tables['Table2'], self.catalog.model_map)
+
+        fkey = table.foreign_keys[0]
+        self.assertIsInstance(fkey, DerivaForeignKey)
+        self.assertIs(self.catalog.model_map[ermrest_table.foreign_keys[0]], fkey)
+
+    def test_wrappers_are_reused(self):
+        table = self.catalog[schema_name]['Table1']
+        self.assertIs(self.catalog[schema_name]['Table1'], table)
+        self.assertIs(self.catalog.schema(schema_name), self.catalog[schema_name])
+        self.assertIs(table.columns['Name'], table.columns['Name'])
+        self.assertIs(table.schema, self.catalog[schema_name])
+
+    def test_unknown_element(self):
+        with self.assertRaises(KeyError):
+            self.catalog.model_map['Table1']
+        with self.assertRaises(KeyError):
+            self.catalog['NoSchema']
+
+
+class TestCachedViews(TestCase):
+    def setUp(self):
+        self.catalog = DerivaCatalog('host.local', ermrest_catalog=StubErmrestCatalog(stub_model_doc(schema_name)))
+        self.table = self.catalog[schema_name]['Table1']
+
+    def test_views_are_cached(self):
+        views = self.table._model_views()
+        self.assertEqual([c.name for c in self.table.columns], ['ID', 'Name', 'Parent'])
+        self.assertEqual([k.name for k in self.table.keys], [k.key.name for k in views['keys']])
+        self.assertEqual(len(self.table.foreign_keys), 1)
+        self.assertIs(self.table._model_views(), views)
+
+    def test_views_are_copies(self):
+        columns = self.table.columns
+        columns.pop()
+        self.assertEqual(len(self.table.columns), 3)
+        self.assertIsNot(self.table.columns, self.table.columns)
+
+    def test_views_follow_model_generation(self):
+        views = self.table._model_views()
+        referenced_by = self.catalog[schema_name]['Table0'].referenced_by
+        self.assertEqual(sorted(fk.table.name for fk in referenced_by), ['Table1', 'Table2'])
+
+        # Drop the foreign key in the model, as a wrapper method would, and note the change.
+        ermrest_table = self.table.table
+        fkey = ermrest_table.foreign_keys[0]
+        ermrest_table.foreign_keys.remove(fkey)
+        fkey.pk_table.referenced_by.remove(fkey)
+        self.assertEqual(len(self.table.foreign_keys), 1)
+        self.catalog._model_changed()
+
+        self.assertIsNot(self.table._model_views(), views)
+        self.assertEqual(len(self.table.foreign_keys), 0)
+        # The table the foreign key pointed at sees the change as well.
+        self.assertEqual([fk.table.name for fk in self.catalog[schema_name]['Table0'].referenced_by], ['Table2'])
+        # Unchanged elements keep their wrappers.
+        self.assertIs(self.table._model_views()['columns'][0], views['columns'][0])
@@ -0,0 +1,81 @@
+from unittest import TestCase
+import logging
+import tempfile
+import shutil
+
+import deriva.core.ermrest_model as em
+from deriva.utils.catalog.components.deriva_model import *
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+logger = logging.getLogger(__name__)
+
+schema_name = 'TestSchema'
+
+
+class TestModelRefresh(TestCase):
+    def setUp(self):
+        self.ermrest_catalog = StubErmrestCatalog(stub_model_doc(schema_name))
+        self.catalog = DerivaCatalog('host.local', ermrest_catalog=self.ermrest_catalog)
+
+    def create_table(self, table_name):
+        self.catalog.model_instance.schemas[schema_name].create_table(
+            em.Table.define(table_name, [em.Column.define('Value', em.builtin_types['text'])], provide_system=False)
+        )
+
+    def test_unchanged_catalog_is_not_fetched(self):
+        self.assertEqual(self.ermrest_catalog.gets.count('/schema'), 1)
+        self.catalog.refresh(incremental=True)
+        self.assertEqual(self.ermrest_catalog.gets.count('/schema'), 1)
+
+    def test_changed_catalog_is_fetched(self):
+        table = self.catalog[schema_name]['Table1']
+        self.create_table('NewTable')
+        self.catalog.refresh(incremental=True)
+        self.assertEqual(self.ermrest_catalog.gets.count('/schema'), 2)
+        self.assertIn('NewTable', self.catalog[schema_name].tables)
+        # Tables that didn't change keep their wrappers.
+        self.assertIs(self.catalog[schema_name]['Table1'], table)
+        self.assertIs(table.table, self.catalog.model_instance.schemas[schema_name].tables['Table1'])
+
+        self.catalog.refresh(incremental=True)
+        self.assertEqual(self.ermrest_catalog.gets.count('/schema'), 2)
+
+    def test_changed_table_is_remapped(self):
+        changed, unchanged = self.catalog[schema_name]['Table1'], self.catalog[schema_name]['Table2']
+        changed_column, unchanged_column = changed.columns['Name'], unchanged.columns['Name']
+
+        # Another client adds a column to Table1.
+        table_doc = self.ermrest_catalog.model_doc['schemas'][schema_name]['tables']['Table1']
+        table_doc['column_definitions'].append(em.Column.define('Value', em.builtin_types['text']))
+        self.ermrest_catalog.snaptime = '2QX-0000-0001'
+        self.catalog.refresh(incremental=True)
+
+        model = self.catalog.model_instance.schemas[schema_name]
+        self.assertIs(self.catalog[schema_name]['Table1'], changed)
+        self.assertIs(changed.table, model.tables['Table1'])
+        self.assertEqual([c.name for c in changed.columns], ['ID', 'Name', 'Parent', 'Value'])
+        # Columns of the changed table get new wrappers, and the old ones are no longer in the map.
+        self.assertIsNot(changed.columns['Name'], changed_column)
+        self.assertIs(changed.columns['Name'].column, model.tables['Table1'].column_definitions['Name'])
+        self.assertNotIn(changed_column.column, self.catalog.model_map)
+
+        # Columns of tables that didn't change keep their wrappers, bound to the new model.
+        self.assertIs(unchanged.columns['Name'], unchanged_column)
+        self.assertIs(unchanged_column.column, model.tables['Table2'].column_definitions['Name'])
+
+
+class TestModelCache(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.ermrest_catalog = StubErmrestCatalog(stub_model_doc(schema_name))
+
+    def test_model_is_cached_by_snapshot(self):
+        DerivaCatalog('host.local', ermrest_catalog=self.ermrest_catalog, model_cache=self.cache_dir)
+        catalog = DerivaCatalog('host.local', ermrest_catalog=self.ermrest_catalog, model_cache=self.cache_dir)
+        self.assertEqual(self.ermrest_catalog.gets.count('/schema'), 1)
+        self.assertEqual(list(catalog[schema_name].tables), ['Table0', 'Table1', 'Table2'])
+
+        self.ermrest_catalog.snaptime = '2QX-0000-0001'
+        DerivaCatalog('host.local', ermrest_catalog=self.ermrest_catalog, model_cache=self.cache_dir)
+        self.assertEqual(self.ermrest_catalog.gets.count('/schema'), 2)
@@ -0,0 +1,107 @@
+from unittest import TestCase
+import logging
+
+from deriva.utils.catalog.components.deriva_model import *
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+logger = logging.getLogger(__name__)
+
+schema_name = 'TestSchema'
+
+
+class TestSourceSpec(TestCase):
+    def setUp(self):
+        self.catalog = DerivaCatalog('host.local', ermrest_catalog=StubErmrestCatalog(stub_model_doc(schema_name)))
+        self.table = self.catalog[schema_name]['Table1']
+        self.parent = self.catalog[schema_name]['Table0']
+
+    def test_lookup(self):
+        self.assertIs(self.table._lookup('columns', 'Name'), self.table.columns['Name'])
+        fkey = self.table.foreign_keys[0]
+        self.assertIs(self.table._lookup('foreign_keys', 'Table1_Parent_fkey'), fkey)
+        self.assertIs(self.table._lookup('foreign_keys', [schema_name, 'Table1_Parent_fkey']), fkey)
+        self.assertIs(self.table._lookup('foreign_keys', (schema_name, 'Table1_Parent_fkey')), fkey)
+        self.assertIs(self.table._lookup('keys', [schema_name, 'Table1_ID_key']), self.table.keys[0])
+        self.assertEqual(sorted(fk.table.name for fk in [self.parent._lookup('referenced_by', 'Table1_Parent_fkey'),
+                                                         self.parent._lookup('referenced_by', 'Table2_Parent_fkey')]),
+                         ['Table1', 'Table2'])
+
+    def test_lookup_missing(self):
+        self.assertIsNone(self.table._lookup('columns', 'Nope'))
+        self.assertIsNone(self.table._lookup('foreign_keys', ['Other', 'Table1_Parent_fkey']))
+        self.assertIsNone(self.table._lookup('keys', 'Table1_Parent_fkey'))
+        self.assertIsNone(self.table._lookup('columns', {'source': 'Name'}))
+
+    def test_normalize(self):
+        def normalize(table, spec, src_tag=chaise_tags.visible_columns):
+            return DerivaSourceSpec(table, spec, validate=False, src_tag=src_tag).spec
+
+        outbound = {'source': [{'outbound': (schema_name, 'Table1_Parent_fkey')}, 'RID']}
+        self.assertEqual(normalize(self.table, 'Name'), {'source': 'Name'})
+        self.assertEqual(normalize(self.table, 'Table1_Parent_fkey'), outbound)
+        self.assertEqual(normalize(self.table, [schema_name, 'Table1_Parent_fkey']), outbound)
+        self.assertEqual(normalize(self.table, [schema_name, 'Table1_ID_key']), {'source': 'ID'})
+        self.assertEqual(normalize(self.parent, 'Table2_Parent_fkey', chaise_tags.visible_foreign_keys),
+                         {'source': [{'inbound': (schema_name, 'Table2_Parent_fkey')}, 'RID']})
+        self.assertEqual(normalize(self.table, {'source': 'Name', 'markdown_name': 'N'}),
+                         {'source': 'Name', 'markdown_name': 'N'})
+
+    def test_invalid(self):
+        with self.assertRaises(DerivaSourceError):
+            DerivaSourceSpec(self.table, 'Nope')
+        with self.assertRaises(DerivaSourceError):
+            DerivaSourceSpec(self.table, {'source': 'Nope'})
+
+
+class TestSourceSpecCache(TestCase):
+    def setUp(self):
+        self.catalog = DerivaCatalog('host.local', ermrest_catalog=StubErmrestCatalog(stub_model_doc(schema_name)))
+        self.table = self.catalog[schema_name]['Table1']
+        self.calls = 0
+        initialize = DerivaSourceSpec._initialize
+
+        def counted(spec, *args):
+            self.calls += 1
+            return initialize(spec, *args)
+
+        DerivaSourceSpec._initialize = counted
+        self.addCleanup(setattr, DerivaSourceSpec, '_initialize', initialize)
+
+    def test_specs_are_memoized(self):
+        first = DerivaSourceSpec(self.table, 'Table1_Parent_fkey', validate=False)
+        second = DerivaSourceSpec(self.table, 'Table1_Parent_fkey', validate=False)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(first.spec, second.spec)
+        self.assertEqual(second.column_name, 'Parent')
+        # Each spec has its own copy.
+        first.spec['markdown_name'] = 'Parent'
+        self.assertNotIn('markdown_name', second.spec)
+        self.assertNotIn('markdown_name', DerivaSourceSpec(self.table, 'Table1_Parent_fkey', validate=False).spec)
+
+        # The tag, validate flag and table are all part of the key.
+        DerivaSourceSpec(self.table, 'Table1_Parent_fkey', validate=False, src_tag=chaise_tags.visible_foreign_keys)
+        DerivaSourceSpec(self.table, 'Name')
+        DerivaSourceSpec(self.table, 'Name', validate=False)
+        DerivaSourceSpec(self.catalog[schema_name]['Table2'], 'Name', validate=False)
+        self.assertEqual(self.calls, 5)
+
+    def test_errors_are_memoized(self):
+        for i in range(2):
+            with self.assertRaises(DerivaSourceError):
+                DerivaSourceSpec(self.table, {'source': 'Nope'})
+        self.assertEqual(self.calls, 1)
+
+    def test_unhashable_specs_are_not_cached(self):
+        spec = {'source': 'Name', 'display': {'markdown_pattern': '{{{Name}}}'}, 'comment': bytearray(b'x')}
+        DerivaSourceSpec(self.table, spec, validate=False)
+        DerivaSourceSpec(self.table, spec, validate=False)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.catalog.source_spec_cache, {})
+
+    def test_cache_is_cleared_when_model_changes(self):
+        DerivaSourceSpec(self.table, 'Name', validate=False)
+        self.assertEqual(len(self.catalog.source_spec_cache), 1)
+        self.catalog._model_changed()
+        self.assertEqual(self.catalog.source_spec_cache, {})
+        DerivaSourceSpec(self.table, 'Name', validate=False)
+        self.assertEqual(self.calls, 2)
@@ -1,6 +1,9 @@
+import os
+import tempfile
 from unittest import TestCase
 
-from deriva.utils.catalog.manage.update_catalog import CatalogUpdater
+from deriva.utils.catalog.manage.update_catalog import CatalogUpdater, update_catalog_configs
+from deriva.utils.catalog.manage.dump_catalog import DerivaCatalogToString
 from deriva.utils.catalog.manage.utils import LoopbackCatalog, TempErmrestCatalog
 from deriva.core import get_credential
 import deriva.core.ermrest_model as em
@@ -131,3 +134,35 @@ class TestCatalogUpdater(TestCase):
             self.assertEqual(c.getCatalogModel().schemas[schema_name].tables[table_name].name, table_name)
         finally:
             delete_catalog(catalog.ermrest_catalog)
+
+    def test_update_catalog_configs(self):
+        catalog = create_catalog(self.server)
+        test_catalog = create_catalog(self.server)
+        try:
+            catalog.create_schema('TestSchema')
+            generate_test_tables(catalog, 'TestSchema')
+
+            # Dump out the schema and tables and then load them all into a new catalog in one pass.
+            stringer = DerivaCatalogToString(catalog.ermrest_catalog)
+            tdir = tempfile.mkdtemp()
+            with open('{}/TestSchema.schema.py'.format(tdir), mode='w') as f:
+                print(stringer.schema_to_str('TestSchema'), file=f)
+            os.makedirs('{}/TestSchema'.format(tdir))
+            for table_name in catalog.ermrest_catalog.getCatalogModel().schemas['TestSchema'].tables:
+                with open('{}/TestSchema/{}.py'.format(tdir, table_name), mode='w') as f:
+                    print(stringer.table_to_str('TestSchema', table_name), file=f)
+
+            update_catalog_configs(test_catalog.ermrest_catalog, 'all', [tdir])
+
+            model = catalog.ermrest_catalog.getCatalogModel()
+            test_model = test_catalog.ermrest_catalog.getCatalogModel()
+            self.assertEqual(set(model.schemas['TestSchema'].tables), set(test_model.schemas['TestSchema'].tables))
+            for table_name, table in model.schemas['TestSchema'].tables.items():
+                test_table = test_model.schemas['TestSchema'].tables[table_name]
+                self.assertEqual(table.annotations, test_table.annotations)
+                self.assertEqual(table.comment, test_table.comment)
+                self.assertEqual({fk.name[1] for fk in table.foreign_keys},
+                                 {fk.name[1] for fk in test_table.foreign_keys})
+        finally:
+            delete_catalog(catalog.ermrest_catalog)
+            delete_catalog(test_catalog.ermrest_catalog)
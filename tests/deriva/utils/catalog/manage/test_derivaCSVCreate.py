@@ -0,0 +1,42 @@
+from unittest import TestCase
+import csv
+import logging
+import os
+import shutil
+import tempfile
+
+from deriva.utils.catalog.components.deriva_model import DerivaCatalog
+from deriva.utils.catalog.manage.deriva_csv import DerivaCSV
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+logger = logging.getLogger(__name__)
+
+schema_name = 'TestSchema'
+
+
+class TestCreateTable(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.csvfile = os.path.join(self.tmpdir, 'Sample.csv')
+        with open(self.csvfile, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['ID', 'Name', 'Score'])
+            for i in range(10):
+                writer.writerow([i, 'Name {}'.format(i), i / 2])
+
+    def test_create(self):
+        ermrest_catalog = StubErmrestCatalog(stub_model_doc(schema_name))
+        catalog = DerivaCatalog('host.local', ermrest_catalog=ermrest_catalog)
+        table = DerivaCSV(self.csvfile, schema_name, key_columns='ID')
+        derivafile = os.path.join(self.tmpdir, 'Sample.py')
+
+        table.create_validate_upload_csv(catalog, create=True, derivafile=derivafile)
+
+        self.assertTrue(os.path.exists(derivafile))
+        self.assertEqual([uri for uri, _ in ermrest_catalog.posts], ['/schema/TestSchema/table'])
+        # The catalog picked up the new table.
+        columns = catalog[schema_name]['Sample'].columns
+        self.assertEqual([c.name for c in columns if c.name not in ['RID', 'RCT', 'RMT', 'RCB', 'RMB']],
+                         ['ID', 'Name', 'Score'])
+        self.assertEqual([c.type.typename for c in columns][-3:], ['int4', 'text', 'float8'])
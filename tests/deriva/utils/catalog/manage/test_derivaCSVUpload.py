@@ -0,0 +1,212 @@
+from unittest import TestCase
+import csv
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from requests import HTTPError
+from tableschema import Schema
+
+from deriva.utils.catalog.manage.deriva_csv import DerivaCSV, DerivaCSVError, DerivaCSVValidator, DerivaUploadError
+
+# An in-memory stand-in for the datapath of a table, so that uploads can be run without a server.
+
+
+class DatapathColumn:
+    def __init__(self, name):
+        self.name = name
+
+    @property
+    def desc(self):
+        return self.name, 'desc'
+
+
+class DatapathTable:
+    def __init__(self, key):
+        self.key = key
+        self.uri = 'https://host.local/ermrest/catalog/1/entity/Schema:Table'
+        self.rows = []
+        self.inserts = []
+        self.on_conflict_skip = []
+        self.fail_on = set()   # Keys whose chunk fails the first time it is sent.
+        self.lock = threading.Lock()
+
+    @property
+    def column_definitions(self):
+        return {self.key: DatapathColumn(self.key)}
+
+    def entities(self):
+        return self
+
+    def fetch(self, limit=None, sort=None):
+        with self.lock:
+            rows = sorted(self.rows, key=lambda r: r[self.key], reverse=True)
+        return rows[:limit]
+
+    def insert(self, chunk, add_system_defaults=True, on_conflict_skip=False):
+        keys = {r[self.key] for r in chunk}
+        if keys & self.fail_on:
+            self.fail_on -= keys
+            # Give later chunks a chance to commit first if they are being sent at the same time.
+            time.sleep(0.1)
+            raise HTTPError('Insert failed')
+        with self.lock:
+            self.inserts.append(sorted(keys))
+            self.on_conflict_skip.append(on_conflict_skip)
+            self.rows.extend(chunk)
+
+
+class Catalog:
+    ermrest_catalog = None
+
+    def __init__(self, datapath):
+        self.datapath = datapath
+
+    def __getitem__(self, name):
+        return self
+
+
+class UploadTable(DerivaCSV):
+    def table_schema_from_catalog(self, catalog, *args, **kwargs):
+        return Schema({'fields': [{'name': 'Id', 'type': 'integer'}, {'name': 'Name', 'type': 'string'}],
+                       'primaryKey': ['Id']})
+
+
+class TestKeyedUpload(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.row_count = 100
+        self.source = os.path.join(self.tmpdir, 'Table.csv')
+        with open(self.source, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'name'])
+            # Out of key order, so that the upload has to sort the rows.
+            writer.writerows([(i * 37) % self.row_count, 'name {}'.format(i)] for i in range(self.row_count))
+
+    def test_upload_in_key_order(self):
+        datapath = DatapathTable('Id')
+        table = UploadTable(self.source, 'Schema', key_columns='id')
+        # Sort in runs of a chunk, which is smaller than the file, so that rows go through temporary files.
+        row_count, _ = table.upload_to_deriva(Catalog(datapath), chunk_size=10, sort_run_size=8)
+        self.assertEqual(row_count, self.row_count)
+        self.assertEqual(datapath.inserts, [list(range(i, i + 10)) for i in range(0, self.row_count, 10)])
+        self.assertEqual(datapath.rows[0], {'Id': 0, 'Name': 'name 0'})
+
+    def test_resume_after_largest_key(self):
+        datapath = DatapathTable('Id')
+        datapath.rows = [{'Id': i, 'Name': 'name {}'.format(i)} for i in range(35)]
+        table = UploadTable(self.source, 'Schema', key_columns='id')
+        table.upload_to_deriva(Catalog(datapath), chunk_size=10)
+        self.assertEqual(datapath.inserts[0], list(range(35, 45)))
+        self.assertEqual(sorted(r['Id'] for r in datapath.rows), list(range(self.row_count)))
+
+    def test_restart_after_out_of_order_failure(self):
+        datapath = DatapathTable('Id')
+        catalog = Catalog(datapath)
+        table = UploadTable(self.source, 'Schema', key_columns='id')
+
+        # The second chunk fails after the chunks sent with it could have been committed.
+        datapath.fail_on = {15}
+        with self.assertRaises(DerivaUploadError):
+            table.upload_to_deriva(catalog, chunk_size=10, parallel=4)
+        # Chunks were sent one at a time, so nothing after the failed chunk is in the catalog.
+        self.assertEqual(datapath.inserts, [list(range(10))])
+
+        table.upload_to_deriva(catalog, chunk_size=10, parallel=4)
+        self.assertEqual(sorted(r['Id'] for r in datapath.rows), list(range(self.row_count)))
+
+
+class TestCheckpointUpload(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.row_count = 95
+        self.source = os.path.join(self.tmpdir, 'Table.csv')
+        with open(self.source, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'name'])
+            # Values with line breaks, so that records and lines don't match up.
+            writer.writerows([i, 'name\n{}'.format(i) if i % 3 == 0 else 'name {}'.format(i)]
+                             for i in range(self.row_count))
+        self.checkpoint = os.path.join(self.tmpdir, 'Table.checkpoint.json')
+
+    def test_resume(self):
+        datapath = DatapathTable('Id')
+        catalog = Catalog(datapath)
+        table = UploadTable(self.source, 'Schema', key_columns='id')
+
+        datapath.fail_on = {25}
+        with self.assertRaises(DerivaUploadError):
+            table.upload_to_deriva(catalog, chunk_size=10, checkpoint=self.checkpoint)
+        self.assertTrue(os.path.exists(self.checkpoint))
+        self.assertEqual(datapath.inserts, [list(range(0, 10)), list(range(10, 20))])
+
+        # The rerun starts at the chunk that failed, in file order, skipping rows that may already be there.
+        row_count, _ = table.upload_to_deriva(catalog, chunk_size=10, checkpoint=self.checkpoint)
+        self.assertEqual(row_count, self.row_count - 20)
+        self.assertEqual(datapath.inserts[2], list(range(20, 30)))
+        self.assertEqual(datapath.inserts[-1], list(range(90, 95)))
+        self.assertEqual(datapath.on_conflict_skip, [False] * 2 + [True] * 8)
+        self.assertEqual([r['Id'] for r in datapath.rows], list(range(self.row_count)))
+        self.assertEqual(datapath.rows[30]['Name'], 'name\n30')
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_parallel(self):
+        datapath = DatapathTable('Id')
+        table = UploadTable(self.source, 'Schema', key_columns='id')
+        row_count, _ = table.upload_to_deriva(Catalog(datapath), chunk_size=10, parallel=3,
+                                              checkpoint=self.checkpoint)
+        self.assertEqual(row_count, self.row_count)
+        self.assertEqual(sorted(r['Id'] for r in datapath.rows), list(range(self.row_count)))
+
+
+class TestValidatedUpload(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.source = os.path.join(self.tmpdir, 'Table.csv')
+        self.checkpoint = os.path.join(self.tmpdir, 'Table.checkpoint.json')
+
+    def write(self, ids):
+        with open(self.source, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'name'])
+            writer.writerows([i, 'name {}'.format(i)] for i in ids)
+
+    def upload(self, datapath, **kwargs):
+        table = UploadTable(self.source, 'Schema', key_columns='id')
+        validator = DerivaCSVValidator(table.table_schema_from_catalog(None))
+        return table, table.upload_to_deriva(Catalog(datapath), chunk_size=10, checkpoint=self.checkpoint,
+                                             pipeline=True, validator=validator, **kwargs)
+
+    def test_valid(self):
+        self.write(range(45))
+        datapath = DatapathTable('Id')
+        _, (row_count, _) = self.upload(datapath, parallel=2)
+        self.assertEqual(row_count, 45)
+        self.assertEqual(sorted(r['Id'] for r in datapath.rows), list(range(45)))
+
+    def test_invalid_row(self):
+        # The 26th row is on line 27 of the file.
+        self.write([i if i != 25 else 'x' for i in range(45)])
+        datapath = DatapathTable('Id')
+        with self.assertRaises(DerivaCSVError):
+            self.upload(datapath)
+        # The chunk with the bad row, and the ones after it, were not sent.
+        self.assertEqual(datapath.inserts, [list(range(0, 10)), list(range(10, 20))])
+
+    def test_report(self):
+        self.write([0, 1, 'x', 3])
+        datapath = DatapathTable('Id')
+        table = UploadTable(self.source, 'Schema', key_columns='id')
+        validator = DerivaCSVValidator(table.table_schema_from_catalog(None))
+        with self.assertRaises(DerivaCSVError):
+            table.upload_to_deriva(Catalog(datapath), checkpoint=self.checkpoint, pipeline=True, validator=validator)
+        self.assertEqual(datapath.inserts, [])
+        report = table.validation_report
+        self.assertFalse(report['valid'])
+        self.assertEqual([(e['code'], e['row-number']) for e in report['tables'][0]['errors']],
+                         [('type-or-format-error', 4)])
@@ -0,0 +1,104 @@
+from unittest import TestCase
+import csv
+import os
+import shutil
+import tempfile
+
+from tableschema import Schema
+
+from deriva.utils.catalog.components.deriva_model import DerivaCatalog
+from deriva.utils.catalog.manage.deriva_csv import DerivaCSV, DerivaCSVValidator
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+
+class TestValidator(TestCase):
+    def setUp(self):
+        self.schema = Schema({'fields': [{'name': 'Id', 'type': 'integer', 'constraints': {'required': True}},
+                                         {'name': 'Name', 'type': 'string', 'constraints': {'unique': True}},
+                                         {'name': 'Tags', 'type': 'array'}],
+                              'primaryKey': ['Id'],
+                              'missingValues': ['']})
+
+    def codes(self, validator):
+        return [(e['code'], e.get('row-number'), e.get('column-number')) for e in validator.errors]
+
+    def test_valid(self):
+        validator = DerivaCSVValidator(self.schema)
+        self.assertTrue(validator.check_headers(['Id', 'Name', 'Tags']))
+        self.assertTrue(validator.check_row(2, ['1', 'a', '[]']))
+        self.assertTrue(validator.check_row(3, ['2', '', '']))
+        report = validator.report(source='data.csv')
+        self.assertTrue(report['valid'])
+        self.assertEqual(report['tables'][0]['row-count'], 3)
+
+    def test_errors(self):
+        validator = DerivaCSVValidator(self.schema)
+        self.assertFalse(validator.check_headers(['Id', 'Title', 'Tags']))
+        validator.check_row(2, ['1', 'a', ''])
+        validator.check_row(3, ['x', 'b', ''])
+        validator.check_row(4, ['', 'c', ''])
+        validator.check_row(5, ['1', 'a', ''])
+        validator.check_row(6, ['2', 'd'])
+        validator.check_row(7, ['3', 'e', '', 'extra'])
+        self.assertEqual(self.codes(validator), [('non-matching-header', None, 2),
+                                                 ('type-or-format-error', 3, 1),
+                                                 ('required-constraint', 4, 1),
+                                                 ('unique-constraint', 5, 2),
+                                                 ('unique-constraint', 5, 1),
+                                                 ('missing-value', 6, 3),
+                                                 ('extra-value', 7, 4)])
+        self.assertFalse(validator.report()['valid'])
+
+    def test_fail_fast(self):
+        validator = DerivaCSVValidator(self.schema, fail_fast=True)
+        validator.check_row(2, ['x', 'a', ''])
+        self.assertTrue(validator.done)
+        validator.check_row(3, ['y', 'b', ''])
+        self.assertEqual(len(validator.errors), 1)
+        self.assertEqual(len(validator.report()['warnings']), 1)
+
+    def test_typed_values(self):
+        # Rows from typed sources have python values rather than strings.
+        validator = DerivaCSVValidator(self.schema)
+        self.assertTrue(validator.check_row(2, [1, 'a', ['x', 'y']]))
+        self.assertTrue(validator.check_row(3, [2, None, None]))
+        self.assertFalse(validator.check_row(4, [None, 'b', []]))
+        self.assertEqual(self.codes(validator), [('required-constraint', 4, 1)])
+
+
+class TestValidateTable(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.catalog = DerivaCatalog('host.local', ermrest_catalog=StubErmrestCatalog(stub_model_doc('TestSchema')))
+
+    def table(self, rows):
+        source = os.path.join(self.tmpdir, 'Table0.csv')
+        with open(source, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['ID', 'Name'])
+            writer.writerows(rows)
+        return DerivaCSV(source, 'TestSchema', key_columns='ID')
+
+    def errors(self, report):
+        return [(e['code'], e['row-number']) for e in report['tables'][0]['errors']]
+
+    def test_engines_agree(self):
+        table = self.table([[1, 'a'], ['x', 'b'], [3, 'c'], [1, 'd']])
+        valid, report = table.validate(self.catalog, engine='stream')
+        self.assertFalse(valid)
+        self.assertEqual(self.errors(report), [('type-or-format-error', 3), ('unique-constraint', 5)])
+
+        valid, report = table.validate(self.catalog)
+        self.assertFalse(valid)
+        self.assertEqual(self.errors(report), [('type-or-format-error', 3), ('unique-constraint', 5)])
+
+    def test_fail_fast(self):
+        table = self.table([[1, 'a'], ['x', 'b'], ['y', 'c']])
+        valid, report = table.validate(self.catalog, engine='stream', fail_fast=True)
+        self.assertFalse(valid)
+        self.assertEqual(self.errors(report), [('type-or-format-error', 3)])
+
+    def test_valid(self):
+        valid, report = self.table([[i, 'n{}'.format(i)] for i in range(20)]).validate(self.catalog, engine='stream')
+        self.assertTrue(valid)
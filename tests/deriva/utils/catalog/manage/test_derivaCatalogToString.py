@@ -112,3 +112,24 @@ class TestDerivaCatalogToString(TestCase):
     #        m.main(test_catalog, 'columns', replace=True, really=True)
         finally:
             delete_catalog(catalog.ermrest_catalog)
+
+    def test_table_to_str_formatter(self):
+        catalog = create_catalog(self.server)
+        try:
+            catalog.create_schema('TestSchema')
+            generate_test_tables(catalog, 'TestSchema')
+
+            tdir = tempfile.mkdtemp()
+            table_defs = {}
+            for formatter in ['yapf', 'pretty', 'none']:
+                stringer = DerivaCatalogToString(catalog.ermrest_catalog, formatter=formatter)
+                table_string = stringer.table_to_str('TestSchema', 'Table1')
+                modfile = '{}/TestTable_{}.py'.format(tdir, formatter)
+                with open(modfile, mode='w') as f:
+                    print(table_string, file=f)
+                m = load_module_from_path(modfile)
+                table_defs[formatter] = (m.table_def, m.column_annotations, m.column_comment)
+            self.assertEqual(table_defs['yapf'], table_defs['pretty'])
+            self.assertEqual(table_defs['yapf'], table_defs['none'])
+        finally:
+            delete_catalog(catalog.ermrest_catalog)
@@ -0,0 +1,139 @@
+import copy
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase, skipIf
+
+from requests import HTTPError
+from tableschema import Schema
+
+from deriva.utils.catalog.manage.deriva_csv import DerivaCSVValidator, DerivaCSVError, DerivaParquet, \
+    DerivaUploadError, _arrow_field_type
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+class TargetTable:
+    def __init__(self):
+        self.rows = []
+        self.on_conflict_skip = []
+        self.fail_on = set()  # Ids whose chunk fails the first time it is sent.
+        self.lock = threading.Lock()
+
+    def insert(self, chunk, add_system_defaults=True, on_conflict_skip=False):
+        ids = {r['Id'] for r in chunk}
+        if ids & self.fail_on:
+            self.fail_on -= ids
+            raise HTTPError('Insert failed')
+        with self.lock:
+            self.on_conflict_skip.append(on_conflict_skip)
+            self.rows.extend(chunk)
+
+
+class Catalog:
+    ermrest_catalog = None
+
+    def __init__(self):
+        self.datapath = TargetTable()
+
+    def __getitem__(self, name):
+        return self
+
+
+class UploadTable(DerivaParquet):
+    def table_schema_from_catalog(self, catalog, *args, **kwargs):
+        fields = [dict(f, name=self.map_name(f['name'])) for f in self.schema.descriptor['fields']]
+        return Schema({'fields': fields, 'primaryKey': ['Id']})
+
+
+@skipIf(pa is None, 'pyarrow is not installed')
+class TestDerivaParquet(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.row_count = 25
+        n = self.row_count
+        table = pa.table({
+            'id': pa.array(range(n), pa.int64()),
+            'small': pa.array(range(n), pa.int16()),
+            'val': pa.array([i * 0.5 if i % 10 else None for i in range(n)], pa.float32()),
+            'day': pa.array([datetime.date(2020, 1, 1 + i) for i in range(n)]),
+            'ts': pa.array([datetime.datetime(2020, 1, 1, 10, i) for i in range(n)], pa.timestamp('us', tz='UTC')),
+            'tags': pa.array([['a', 'b'] if i % 2 else [] for i in range(n)]),
+            'cat': pa.array(['x', 'y'] * (n // 2) + ['x'] * (n % 2)).dictionary_encode()})
+        self.source = os.path.join(self.tmpdir, 'data.parquet')
+        pq.write_table(table, self.source, row_group_size=10)
+
+    def table(self, **kwargs):
+        return DerivaParquet(self.source, 'Schema', key_columns='id', **kwargs)
+
+    def test_schema(self):
+        table = self.table()
+        self.assertEqual(table.table_name, 'Data')
+        fields = {f['name']: (f['type'], f['derivaType']) for f in table.schema.descriptor['fields']}
+        self.assertEqual(fields, {'id': ('integer', 'int8'),
+                                  'small': ('integer', 'int2'),
+                                  'val': ('number', 'float4'),
+                                  'day': ('date', 'date'),
+                                  'ts': ('datetime', 'timestamptz'),
+                                  'tags': ('array', 'text[]'),
+                                  'cat': ('string', 'text')})
+        table.infer()
+        self.assertEqual(table.row_count, self.row_count)
+
+    def test_rows(self):
+        rows = list(self.table()._rows(batch_size=7))
+        self.assertEqual(len(rows), self.row_count)
+        row_number, row = rows[1]
+        self.assertEqual(row_number, 3)
+        self.assertEqual(row[:4], [1, 1, 0.5, '2020-01-02'])
+        self.assertTrue(row[4].startswith('2020-01-01 10:01:00'))
+        self.assertEqual(row[5:], [['a', 'b'], 'y'])
+        json.dumps(rows)
+
+    def test_validate(self):
+        table = self.table()
+        validator = DerivaCSVValidator(table._file_schema(Schema(copy.deepcopy(table.schema.descriptor))))
+        for row_number, row in table._rows():
+            validator.check_row(row_number, row)
+        self.assertEqual(validator.errors, [])
+
+    def test_upload(self):
+        catalog = Catalog()
+        table = UploadTable(self.source, 'Schema', key_columns='id')
+        checkpoint = os.path.join(self.tmpdir, 'upload.checkpoint.json')
+        validator = DerivaCSVValidator(table._file_schema(table.table_schema_from_catalog(catalog)))
+        row_count, _ = table.upload_to_deriva(catalog, chunk_size=10, parallel=2, checkpoint=checkpoint,
+                                              validator=validator)
+        self.assertEqual(row_count, self.row_count)
+        self.assertEqual(sorted(r['Id'] for r in catalog.datapath.rows), list(range(self.row_count)))
+        self.assertEqual(validator.errors, [])
+        self.assertFalse(os.path.exists(checkpoint))
+        # Conflicting rows are only skipped when resuming.
+        self.assertEqual(catalog.datapath.on_conflict_skip, [False] * 3)
+
+    def test_resume(self):
+        catalog = Catalog()
+        catalog.datapath.fail_on = {15}
+        table = UploadTable(self.source, 'Schema', key_columns='id')
+        checkpoint = os.path.join(self.tmpdir, 'upload.checkpoint.json')
+        with self.assertRaises(DerivaUploadError):
+            table.upload_to_deriva(catalog, chunk_size=10, checkpoint=checkpoint)
+        self.assertTrue(os.path.exists(checkpoint))
+
+        row_count, _ = table.upload_to_deriva(catalog, chunk_size=10, checkpoint=checkpoint)
+        self.assertEqual(row_count, self.row_count - 10)
+        self.assertEqual(sorted(r['Id'] for r in catalog.datapath.rows), list(range(self.row_count)))
+        self.assertEqual(catalog.datapath.on_conflict_skip, [False, True, True])
+
+    def test_unsigned_types(self):
+        self.assertEqual(_arrow_field_type(pa.uint32()), ('integer', 'default', 'int8'))
+        with self.assertRaises(DerivaCSVError):
+            _arrow_field_type(pa.uint64())
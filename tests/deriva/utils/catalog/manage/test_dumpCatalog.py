@@ -0,0 +1,75 @@
+from unittest import TestCase
+import filecmp
+import os
+import shutil
+import tempfile
+
+from deriva.utils.catalog.manage.dump_catalog import DerivaDumpCatalogCLI
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+schema_name = 'TestSchema'
+
+
+class DumpTestCase(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.ermrest_catalog = StubErmrestCatalog(stub_model_doc(schema_name, table_count=4))
+
+    def dump(self, dirname, jobs=1, formatter='yapf', force=False):
+        cli = DerivaDumpCatalogCLI('Dump catalog', '')
+        cli.dumpdir = os.path.join(self.tmpdir, dirname)
+        cli.host = 'host.local'
+        cli.catalog = self.ermrest_catalog
+        cli.model = self.ermrest_catalog.getCatalogModel()
+        cli.schemas = [schema_name]
+        cli.jobs, cli.formatter, cli.force = jobs, formatter, force
+        os.makedirs(cli.dumpdir, exist_ok=True)
+
+        written = []
+
+        def write_file(filename, s):
+            written.append(os.path.relpath(filename, cli.dumpdir))
+            DerivaDumpCatalogCLI._write_file(filename, s)
+
+        cli._write_file = write_file
+        cli._dump_catalog()
+        return sorted(written)
+
+
+class TestDumpJobs(DumpTestCase):
+    def test_jobs_match_serial(self):
+        files = ['TestSchema.schema.py', 'TestSchema/Table0.py', 'TestSchema/Table1.py', 'TestSchema/Table2.py',
+                 'TestSchema/Table3.py', 'host.local_1.py']
+        self.assertEqual(self.dump('serial'), files)
+        self.assertEqual(self.dump('parallel', jobs=3), files)
+        serial, parallel = os.path.join(self.tmpdir, 'serial'), os.path.join(self.tmpdir, 'parallel')
+        match, mismatch, errors = filecmp.cmpfiles(serial, parallel, files, shallow=False)
+        self.assertEqual((mismatch, errors), ([], []))
+
+
+class TestDumpManifest(DumpTestCase):
+    def test_unchanged_files_are_not_rewritten(self):
+        self.assertEqual(len(self.dump('dump')), 6)
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir, 'dump', DerivaDumpCatalogCLI.manifest_file)))
+        self.assertEqual(self.dump('dump'), [])
+
+    def test_changed_table(self):
+        self.dump('dump')
+        self.ermrest_catalog.model_doc['schemas'][schema_name]['tables']['Table2']['comment'] = 'Changed'
+        self.assertEqual(self.dump('dump'), ['TestSchema/Table2.py'])
+        with open(os.path.join(self.tmpdir, 'dump', 'TestSchema', 'Table2.py')) as f:
+            self.assertIn('Changed', f.read())
+
+    def test_changed_on_disk(self):
+        self.dump('dump')
+        os.remove(os.path.join(self.tmpdir, 'dump', 'TestSchema', 'Table1.py'))
+        with open(os.path.join(self.tmpdir, 'dump', 'TestSchema.schema.py'), 'a') as f:
+            f.write('# Edited\n')
+        self.assertEqual(self.dump('dump'), ['TestSchema.schema.py', 'TestSchema/Table1.py'])
+
+    def test_formatter_and_force(self):
+        self.dump('dump')
+        self.assertEqual(len(self.dump('dump', formatter='pretty')), 6)
+        self.assertEqual(self.dump('dump', formatter='pretty'), [])
+        self.assertEqual(len(self.dump('dump', formatter='pretty', force=True)), 6)
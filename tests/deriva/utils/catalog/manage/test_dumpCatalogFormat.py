@@ -0,0 +1,34 @@
+from unittest import TestCase
+import ast
+
+from deriva.utils.catalog.manage.dump_catalog import DerivaCatalogToString, formatters
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+schema_name = 'TestSchema'
+comment = 'It\'s a "quoted" comment with a \\ backslash'
+
+
+class TestDumpFormat(TestCase):
+    def setUp(self):
+        model_doc = stub_model_doc(schema_name)
+        schema = model_doc['schemas'][schema_name]
+        schema['comment'] = comment
+        table = schema['tables']['Table1']
+        table['comment'] = comment
+        table['column_definitions'][1]['comment'] = comment
+        table['keys'][0]['comment'] = comment
+        table['foreign_keys'][0].update({'comment': comment, 'on_delete': 'CASCADE'})
+        self.ermrest_catalog = StubErmrestCatalog(model_doc)
+
+    def test_quoted_comments(self):
+        for formatter in formatters:
+            with self.subTest(formatter=formatter):
+                stringer = DerivaCatalogToString(self.ermrest_catalog, groups={}, formatter=formatter)
+                ast.parse(stringer.catalog_to_str())
+                for code in [stringer.schema_to_str(schema_name), stringer.table_to_str(schema_name, 'Table1')]:
+                    tree = ast.parse(code)
+                    strings = [n.value for n in ast.walk(tree) if isinstance(n, ast.Constant)]
+                    self.assertIn(comment, strings)
+                # The table, a column, the key and the foreign key each have the comment.
+                self.assertEqual(strings.count(comment), 4)
+                self.assertIn('CASCADE', strings)
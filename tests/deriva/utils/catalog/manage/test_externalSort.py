@@ -0,0 +1,23 @@
+from unittest import TestCase
+
+from deriva.utils.catalog.manage.deriva_csv import _external_sort
+
+
+class TestExternalSort(TestCase):
+    def setUp(self):
+        self.rows = [{'Id': (i * 7919) % 1000, 'Name': 'n{}'.format(i)} for i in range(1000)]
+
+    def key(self, row):
+        return [row['Id']]
+
+    def test_in_memory(self):
+        self.assertEqual(list(_external_sort(self.rows, self.key, run_size=2000)),
+                         sorted(self.rows, key=self.key))
+
+    def test_runs(self):
+        # Uneven runs, so the last one is short.
+        self.assertEqual(list(_external_sort(self.rows, self.key, run_size=64)),
+                         sorted(self.rows, key=self.key))
+
+    def test_empty(self):
+        self.assertEqual(list(_external_sort([], self.key, run_size=10)), [])
@@ -0,0 +1,76 @@
+from unittest import TestCase
+import csv
+import datetime
+import itertools
+import os
+import shutil
+import tempfile
+
+import tabulator
+
+from deriva.utils.catalog.manage.deriva_csv import DerivaCSV, _infer_shard, _csv_shards, _csv_records, _merge_types, \
+    _infer_block, _chunks
+
+
+class TestInferShards(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def write(self, name, rows, header, **fmtparams):
+        filename = os.path.join(self.tmpdir, name)
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f, **fmtparams)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return filename
+
+    def test_shards(self):
+        rows = [[i, 'line\n{}'.format(i) if i % 5 == 0 else 'n{}'.format(i), i * 0.5 if i % 3 else i,
+                 '2020-01-{:02d}'.format(1 + i % 28)] for i in range(500)]
+        source = self.write('data.csv', rows, ('id', 'name', 'val', 'day'))
+        dialect = {'delimiter': ',', 'quoteChar': '"'}
+
+        shards = _csv_shards(source, 4)
+        self.assertEqual(shards[0][0], 0)
+        self.assertEqual(shards[-1][1], os.path.getsize(source))
+
+        types, row_count = [], 0
+        for start, end in shards:
+            shard_types, shard_rows = _infer_shard(source, start, end, 'utf-8', dialect, 50)
+            types = _merge_types(types, shard_types)
+            row_count += shard_rows
+        self.assertEqual(row_count, len(rows))
+
+        expected = []
+        for block in _chunks([[str(v) for v in row] for row in rows], 50):
+            _infer_block(block, expected)
+        self.assertEqual(types, expected)
+        self.assertEqual(types, [int, str, float, datetime.datetime])
+
+    def test_same_as_serial(self):
+        # Quoted values with the delimiter and Windows line breaks in them, in a file that isn't comma separated.
+        rows = [[i, 'a; "quoted"\r\nvalue {}'.format(i) if i % 4 == 0 else 'n{}'.format(i),
+                 '' if i % 7 == 0 else i * 0.25, 'true' if i % 2 else 'false'] for i in range(300)]
+        source = self.write('data.csv', rows, ('id', 'name', 'val', 'flag'), delimiter=';')
+
+        serial = DerivaCSV(source, 'Schema')
+        serial.infer(block_size=20)
+        sharded = DerivaCSV(source, 'Schema')
+        sharded.infer(block_size=20, workers=3)
+        self.assertEqual(sharded.row_count, serial.row_count)
+        self.assertEqual(sharded.schema.descriptor['fields'], serial.schema.descriptor['fields'])
+        self.assertEqual([f['type'] for f in serial.schema.descriptor['fields']],
+                         ['integer', 'string', 'number', 'boolean'])
+
+        # The workers see the same values as the serial path.
+        with tabulator.Stream(source) as stream:
+            encoding, dialect = stream.encoding, stream.dialect
+        self.assertEqual(dialect['delimiter'], ';')
+        values = []
+        for start, end in _csv_shards(source, 3, quotechar=dialect['quoteChar']):
+            records = _csv_records(source, start, 1, encoding, dialect)
+            if start == 0:
+                next(records)
+            values.extend(row for _, offset, _, row in itertools.takewhile(lambda r: r[1] < end, records))
+        self.assertEqual(values, [list(row) for row in serial.iter(cast=False)])
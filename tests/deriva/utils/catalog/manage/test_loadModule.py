@@ -0,0 +1,41 @@
+from unittest import TestCase
+import os
+import shutil
+import sys
+import tempfile
+
+from deriva.utils.catalog.manage.utils import load_module_from_path
+
+
+class TestLoadModule(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def write(self, dirname, filename, text):
+        os.makedirs(os.path.join(self.tmpdir, dirname), exist_ok=True)
+        path = os.path.join(self.tmpdir, dirname, filename)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_load(self):
+        # A table named after a standard library module, using a dataclass, which needs the module in sys.modules.
+        code = 'import dataclasses\n\n@dataclasses.dataclass\nclass Table:\n    name: str = {!r}\n'
+        first = self.write('a', 'time.py', code.format('a'))
+        second = self.write('b', 'time.py', code.format('b'))
+        modules = set(sys.modules)
+
+        self.assertEqual(load_module_from_path(first).Table().name, 'a')
+        self.assertEqual(load_module_from_path(second).Table().name, 'b')
+        self.assertEqual(set(sys.modules), modules)
+        import time
+        self.assertTrue(hasattr(time, 'perf_counter'))
+
+    def test_error(self):
+        path = self.write('a', 'Schema.schema.py', 'raise ValueError("bad config")\n')
+        modules = set(sys.modules)
+        with self.assertRaises(ValueError):
+            load_module_from_path(path)
+        self.assertEqual(set(sys.modules), modules)
+        self.assertNotIn(os.path.join(self.tmpdir, 'a'), sys.path)
@@ -0,0 +1,51 @@
+from unittest import TestCase
+import random
+
+from deriva.utils.catalog.manage.deriva_csv import _row_converter
+from extra_tests.deriva.utils.catalog.manage.benchmark_row_conversion import reference_convert, generate_rows
+
+
+class TestRowConverter(TestCase):
+    def assertConverts(self, field_types, rows, row_number_as_key=False):
+        convert = _row_converter(field_types, row_number_as_key=row_number_as_key, upload_id=7)
+        for row_number, row in enumerate(rows, start=2):
+            expected = reference_convert(field_types, row_number_as_key, 7, row_number, list(row))
+            self.assertEqual(convert(row_number, list(row)), expected, row)
+
+    def test_nulls(self):
+        field_types = ['boolean', 'integer', 'number', 'date', 'datetime', 'string', 'array']
+        self.assertConverts(field_types, [[''] * len(field_types)])
+        convert = _row_converter(field_types)
+        self.assertEqual(convert(2, [''] * len(field_types)), [None] * 5 + ['', ''])
+
+    def test_booleans(self):
+        # Only 'true' is true, as in the original conversion.
+        rows = [[v] for v in ['true', 'false', 'True', '1', 'f', '']]
+        self.assertConverts(['boolean'], rows)
+        self.assertEqual([_row_converter(['boolean'])(2, row)[0] for row in rows],
+                         [True, False, False, False, False, None])
+
+    def test_numbers(self):
+        self.assertConverts(['integer', 'number'], [['1', '1.5'], ['-20', '1e3'], ['0', '-0.0']])
+        self.assertEqual(_row_converter(['integer', 'number'])(2, ['3', '2.5']), [3, 2.5])
+
+    def test_dates(self):
+        rows = [['2020-01-02', '2020-01-02T10:00:00', '10:00'], ['', '', '']]
+        self.assertConverts(['date', 'datetime', 'time'], rows)
+        self.assertEqual(_row_converter(['date', 'datetime', 'time'])(2, rows[0]), rows[0])
+
+    def test_arrays(self):
+        self.assertConverts(['array', 'integer'], [['["a", "b"]', '1'], ['{1,2}', ''], ['', '2']])
+
+    def test_row_number_as_key(self):
+        field_types = ['integer', 'integer', 'boolean', 'string']
+        self.assertConverts(field_types, [['true', 'a'], ['', 'b']], row_number_as_key=True)
+        self.assertEqual(_row_converter(field_types, row_number_as_key=True, upload_id=7)(5, ['true', 'a']),
+                         [7, 4, True, 'a'])
+
+    def test_generated_rows(self):
+        random.seed(1)
+        column_types = ['integer', 'boolean', 'number', 'datetime', 'string', 'date']
+        rows = generate_rows(column_types, 500)
+        self.assertConverts(column_types, rows)
+        self.assertConverts(['integer', 'integer'] + column_types, rows, row_number_as_key=True)
@@ -0,0 +1,64 @@
+from unittest import TestCase, skipIf
+import gzip
+import io
+import os
+import shutil
+import tempfile
+
+from deriva.utils.catalog.manage.deriva_csv import DerivaCSV, DerivaCSVError, _ShardReader
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class TestShardReader(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.header = b'id,name\n'
+        with open(self.path('a.csv'), 'wb') as f:
+            f.write(self.header + b'1,a\n2,b')  # No line break at the end.
+        with gzip.open(self.path('b.csv.gz'), 'wb') as f:
+            f.write(self.header + b'3,c\n')
+
+    def path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def read(self, paths):
+        with io.BufferedReader(_ShardReader(paths)) as f:
+            return f.read()
+
+    def test_read(self):
+        self.assertEqual(self.read([self.path('a.csv'), self.path('b.csv.gz')]), self.header + b'1,a\n2,b\n3,c\n')
+
+    @skipIf(zstandard is None, 'zstandard is not installed')
+    def test_zstd(self):
+        with open(self.path('c.csv.zst'), 'wb') as f:
+            f.write(zstandard.ZstdCompressor().compress(self.header + b'4,d\n'))
+        self.assertEqual(self.read([self.path('b.csv.gz'), self.path('c.csv.zst')]), self.header + b'3,c\n4,d\n')
+
+    def test_rewind(self):
+        reader = io.BufferedReader(_ShardReader([self.path('a.csv'), self.path('b.csv.gz')]))
+        first = reader.read(5)
+        reader.seek(0)
+        self.assertEqual(reader.read(5), first)
+        with self.assertRaises(io.UnsupportedOperation):
+            reader.raw.seek(3)
+        reader.close()
+
+    def test_table(self):
+        table = DerivaCSV(self.tmpdir, 'Schema', key_columns='id')
+        self.assertEqual(table.headers, ['id', 'name'])
+        self.assertEqual([list(r) for r in table.iter(cast=False)], [['1', 'a'], ['2', 'b'], ['3', 'c']])
+
+        table = DerivaCSV(os.path.join(self.tmpdir, '*.csv*'), 'Schema', table_name='Data')
+        self.assertEqual(table.table_name, 'Data')
+        self.assertEqual(len(list(table.iter(cast=False))), 3)
+
+    def test_header_mismatch(self):
+        with gzip.open(self.path('c.csv.gz'), 'wb') as f:
+            f.write(b'id,title\n4,d\n')
+        with self.assertRaises(DerivaCSVError):
+            DerivaCSV(self.tmpdir, 'Schema')
@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from deriva.core import tag as chaise_tags
+from deriva.utils.catalog.manage.dump_catalog import DerivaCatalogToString
+from tests.deriva.utils.catalog.test_utils import StubErmrestCatalog, stub_model_doc
+
+groups = {
+    'admin': 'https://auth.local/groups/admin',
+    'admin-extra': 'https://auth.local/groups/admin-extra',
+    'curator': 'https://auth.local/groups/curator',
+}
+
+
+class TestSubstituteVariables(TestCase):
+    def setUp(self):
+        self.stringer = DerivaCatalogToString(StubErmrestCatalog(stub_model_doc()), groups=groups)
+
+    def test_tags(self):
+        code = 'annotations = {{{!r}: {{}}, "{}": []}}'.format(chaise_tags.display, chaise_tags.visible_columns)
+        self.assertEqual(self.stringer.substitute_variables(code),
+                         'annotations = {chaise_tags.display: {}, chaise_tags.visible_columns: []}')
+        self.assertEqual(self.stringer._referenced_groups, {})
+
+    def test_groups(self):
+        code = "acls = {{'select': [{!r}, \"{}\"]}}".format(groups['curator'], groups['admin'])
+        self.assertEqual(self.stringer.substitute_variables(code),
+                         "acls = {'select': [groups['curator'], groups['admin']]}")
+        # Referenced groups are kept in the order that the groups are known in.
+        self.assertEqual(list(self.stringer._referenced_groups), ['admin', 'curator'])
+
+    def test_longest_match(self):
+        # One group's value is a prefix of another's.
+        code = '[{!r}, {!r}]'.format(groups['admin-extra'], groups['admin'])
+        self.assertEqual(self.stringer.substitute_variables(code), "[groups['admin-extra'], groups['admin']]")
+
+    def test_only_whole_quoted_values(self):
+        code = '["{0} and more", \'{0}", "prefix {0}"]'.format(groups['admin'])
+        self.assertEqual(self.stringer.substitute_variables(code), code)
+        self.assertEqual(self.stringer._referenced_groups, {})
+
+    def test_no_groups(self):
+        stringer = DerivaCatalogToString(StubErmrestCatalog(stub_model_doc()), groups={})
+        self.assertEqual(stringer.substitute_variables("'admin'"), "'admin'")
+        self.assertEqual(stringer.substitute_variables(repr(chaise_tags.display)), 'chaise_tags.display')
@@ -0,0 +1,78 @@
+from unittest import TestCase
+import csv
+import os
+import shutil
+import tempfile
+
+from deriva.utils.catalog.manage.deriva_csv import DerivaUploadCheckpoint, DerivaCSVError
+
+
+class TestUploadCheckpoint(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.source = os.path.join(self.tmpdir, 'data.csv')
+        with open(self.source, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'name', 'val'])
+            writer.writerows([i, 'n{}'.format(i), i * 0.5] for i in range(100))
+        self.filename = os.path.join(self.tmpdir, 'data.checkpoint.json')
+
+    def test_resume(self):
+        checkpoint = DerivaUploadCheckpoint(self.filename, 10, upload_id=1, source=self.source)
+        self.assertFalse(checkpoint.resumed)
+        self.assertEqual(checkpoint.resume_point(), (1, None, None))
+        for n in range(1, 4):
+            self.assertTrue(checkpoint.record(n, [n] * 10, row=10 * n - 8, offset=100 * n, end=100 * (n + 1)))
+        checkpoint.save()
+        checkpoint.commit(1)
+        checkpoint.commit(3)
+
+        checkpoint = DerivaUploadCheckpoint(self.filename, 10, source=self.source)
+        self.assertTrue(checkpoint.resumed)
+        self.assertEqual(checkpoint.upload_id, 1)
+        self.assertEqual(checkpoint.committed, {1, 3})
+        # Restart at the first chunk that was not committed, even though a later one was.
+        self.assertEqual(checkpoint.resume_point(), (2, 12, 200))
+        self.assertFalse(checkpoint.record(3, [3] * 10))
+        self.assertTrue(checkpoint.record(2, [2] * 10))
+
+        checkpoint.commit(2)
+        self.assertEqual(checkpoint.resume_point(), (4, 32, 400))
+
+    def test_resume_without_offsets(self):
+        checkpoint = DerivaUploadCheckpoint(self.filename, 10, source=self.source)
+        checkpoint.record(1, [1])
+        checkpoint.commit(1)
+        # The position isn't known, so the source has to be read again from the start.
+        self.assertEqual(checkpoint.resume_point(), (1, None, None))
+
+    def test_changed_chunk(self):
+        checkpoint = DerivaUploadCheckpoint(self.filename, 10, source=self.source)
+        checkpoint.record(1, [{'Id': 1}])
+        with self.assertRaises(DerivaCSVError):
+            checkpoint.record(1, [{'Id': 2}])
+
+    def test_mismatch(self):
+        DerivaUploadCheckpoint(self.filename, 10, upload_id=1, source=self.source).save()
+        with self.assertRaises(DerivaCSVError):
+            DerivaUploadCheckpoint(self.filename, 20, source=self.source)
+        with self.assertRaises(DerivaCSVError):
+            DerivaUploadCheckpoint(self.filename, 10, upload_id=2, source=self.source)
+        with self.assertRaises(DerivaCSVError):
+            DerivaUploadCheckpoint(self.filename, 10, source=os.path.join(self.tmpdir, 'other.csv'))
+
+    def test_changed_source(self):
+        DerivaUploadCheckpoint(self.filename, 10, source=self.source).save()
+        with open(self.source, 'a') as f:
+            f.write('100,n100,50.0\n')
+        with self.assertRaises(DerivaCSVError):
+            DerivaUploadCheckpoint(self.filename, 10, source=self.source)
+
+    def test_finish(self):
+        checkpoint = DerivaUploadCheckpoint(self.filename, 10, source=self.source)
+        checkpoint.save()
+        self.assertTrue(os.path.exists(self.filename))
+        checkpoint.finish()
+        self.assertFalse(os.path.exists(self.filename))
+        checkpoint.finish()
@@ -5,8 +5,12 @@ import string
 import time
 import logging
 import sys
+import copy
+import re
+from urllib.parse import unquote
 
 from deriva.core import DerivaServer, get_credential
+import deriva.core.ermrest_model as em
 from deriva.utils.catalog.components.deriva_model import DerivaModel, DerivaCatalog, DerivaColumn, DerivaKey, DerivaForeignKey
 
 logger = logging.getLogger(__name__)
@@ -172,3 +176,97 @@ def delete_catalog(ermrest_catalog):
     except Exception as e:
         logger.warning("Unable to delete catalog: %s" % e)
         raise
+
+
+class StubResult:
+    def __init__(self, value):
+        self._value = value
+
+    def json(self):
+        return self._value
+
+    def raise_for_status(self):
+        pass
+
+
+class StubErmrestCatalog:
+    """
+    Minimal in-memory stand-in for an ErmrestCatalog, so that model handling can be tested without a server.  The
+    model document is served for /schema, and model updates are recorded in puts rather than being applied.  Tables
+    that are created are added to the model document, and move the catalog to a new snapshot.
+    """
+
+    def __init__(self, model_doc, snaptime='2QX-0000-0000'):
+        self.model_doc = model_doc
+        self.snaptime = snaptime
+        self.puts = []
+        self.gets = []
+        self.posts = []
+        self._snapshots = 0
+
+    def get_server_uri(self):
+        return 'https://host.local/ermrest/catalog/1'
+
+    @property
+    def catalog_id(self):
+        return 1
+
+    def get_authn_session(self):
+        raise ValueError('No session')
+
+    def getCatalogModel(self):
+        self.gets.append('/schema')
+        return em.Model(self, copy.deepcopy(self.model_doc))
+
+    def get(self, uri, **kwargs):
+        self.gets.append(uri)
+        if uri == '/':
+            return StubResult({'snaptime': self.snaptime})
+        if uri == '/schema':
+            return StubResult(copy.deepcopy(self.model_doc))
+        raise ValueError('Unexpected request {}'.format(uri))
+
+    def put(self, uri, json=None, data=None, **kwargs):
+        self.puts.append((uri, json))
+        return StubResult(copy.deepcopy(json))
+
+    def post(self, uri, json=None, data=None, **kwargs):
+        self.posts.append((uri, json))
+        match = re.fullmatch(r'/schema/([^/]+)/table', uri)
+        if not match:
+            raise ValueError('Unexpected request {}'.format(uri))
+        schema_name = unquote(match.group(1))
+        table_doc = copy.deepcopy(json)
+        table_doc['schema_name'] = schema_name
+        self.model_doc['schemas'][schema_name]['tables'][table_doc['table_name']] = table_doc
+        self._snapshots += 1
+        self.snaptime = '{}-{}'.format(self.snaptime.split('-')[0], self._snapshots)
+        return StubResult(copy.deepcopy(table_doc))
+
+
+def stub_model_doc(schema_name='TestSchema', table_count=3):
+    """
+    Model document with a schema of tables Table0, Table1, ... each with an ID key and, after the first, a Parent
+    foreign key to Table0.
+    """
+    tables = {}
+    for i in range(table_count):
+        table_name = 'Table{}'.format(i)
+        columns = [em.Column.define('ID', em.builtin_types['int4']),
+                   em.Column.define('Name', em.builtin_types['text'])]
+        fkeys = []
+        if i > 0:
+            columns.append(em.Column.define('Parent', em.builtin_types['int4']))
+            fkeys.append(em.ForeignKey.define(['Parent'], schema_name, 'Table0', ['ID'],
+                                              constraint_names=[[schema_name, '{}_Parent_fkey'.format(table_name)]]))
+        table = em.Table.define(table_name, columns,
+                                key_defs=[em.Key.define(['ID'],
+                                                        constraint_names=[[schema_name, '{}_ID_key'.format(table_name)]])],
+                                fkey_defs=fkeys, provide_system=False)
+        table.update({'schema_name': schema_name, 'kind': 'table'})
+        for column in table['column_definitions']:
+            column.setdefault('annotations', {})
+        tables[table_name] = table
+    schema = em.Schema.define(schema_name)
+    schema['tables'] = tables
+    return {'schemas': {schema_name: schema}, 'acls': {}, 'annotations': {}}